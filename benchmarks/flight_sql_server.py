@@ -0,0 +1,338 @@
+# This module holds a small in-process Flight SQL stand-in server (backed by DuckDB) for the benchmarks.
+import itertools
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import duckdb
+import pyarrow as pa
+import pyarrow.flight as flight
+
+# Parameters arrive as (unaligned) Flight buffers, which DuckDB scans just fine
+os.environ.setdefault("ACERO_ALIGNMENT_HANDLING", "ignore")
+
+_TYPE_PREFIX = "type.googleapis.com/arrow.flight.protocol.sql."
+_INSERT_VALUES = re.compile(r"^\s*INSERT\s+INTO\s+(.+?)\s*(\([^)]*\))?\s*VALUES\s*\(\s*\?(\s*,\s*\?)*\s*\)\s*$",
+                            re.IGNORECASE | re.DOTALL)
+
+
+# --- minimal protobuf wire format helpers (just enough for the Flight SQL command messages) ---
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    value &= (1 << 64) - 1
+    while True:
+        bits = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(bits | 0x80)
+        else:
+            out.append(bits)
+            return bytes(out)
+
+
+def _read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def encode_fields(fields: List[Tuple[int, object]]) -> bytes:
+    out = bytearray()
+    for number, value in fields:
+        if value is None:
+            continue
+        if isinstance(value, bool) or isinstance(value, int):
+            out += _varint(number << 3 | 0) + _varint(int(value))
+        else:
+            if isinstance(value, str):
+                value = value.encode()
+            out += _varint(number << 3 | 2) + _varint(len(value)) + value
+    return bytes(out)
+
+
+def decode_fields(buf: bytes) -> Dict[int, list]:
+    fields: Dict[int, list] = {}
+    pos = 0
+    while pos < len(buf):
+        key, pos = _read_varint(buf, pos)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = _read_varint(buf, pos)
+        elif wire_type == 2:
+            length, pos = _read_varint(buf, pos)
+            value = bytes(buf[pos:pos + length])
+            pos += length
+        elif wire_type == 1:
+            value, pos = buf[pos:pos + 8], pos + 8
+        elif wire_type == 5:
+            value, pos = buf[pos:pos + 4], pos + 4
+        else:
+            raise ValueError(f"Unsupported wire type: {wire_type}")
+        fields.setdefault(number, []).append(value)
+    return fields
+
+
+def pack_any(message: str, fields: List[Tuple[int, object]]) -> bytes:
+    return encode_fields([(1, _TYPE_PREFIX + message), (2, encode_fields(fields))])
+
+
+def unpack_any(buf: bytes) -> Tuple[str, Dict[int, list]]:
+    outer = decode_fields(buf)
+    type_url = outer.get(1, [b""])[0].decode()
+    return type_url.rsplit(".", 1)[-1], decode_fields(outer.get(2, [b""])[0])
+
+
+def _first(fields: Dict[int, list], number: int, default=None):
+    return fields.get(number, [default])[0]
+
+
+class _Statement:
+    def __init__(self, query: str) -> None:
+        self.query = query
+        self.parameters: Optional[pa.Table] = None
+        self.results: Dict[int, pa.Table] = {}
+
+
+class StandInFlightSqlServer(flight.FlightServerBase):
+    """Serve Flight SQL requests out of an in-memory DuckDB database.
+
+    Only the subset of Flight SQL that the ADBC driver uses is implemented:
+    ad-hoc and prepared queries/updates, parameter binding, catalog metadata
+    and multi-endpoint (partitioned) results.
+
+    Results are split into ``partitions`` endpoints and streamed in batches of
+    ``batch_size`` rows.  :meth:`fail_next_requests` makes the next requests fail
+    with a transient (UNAVAILABLE) error, to exercise client retries.  With
+    ``interrupt_cancelled``, a query whose call the client cancels is interrupted,
+    as a real server would free its resources.  ``query_latency`` adds that many
+    seconds to every query, standing in for a cluster's own query time.
+    """
+
+    def __init__(self,
+                 location: str = "grpc://127.0.0.1:0",
+                 partitions: int = 1,
+                 batch_size: int = 65_536,
+                 interrupt_cancelled: bool = False,
+                 query_latency: float = 0.0,
+                 **kwargs) -> None:
+        super().__init__(location, **kwargs)
+        self.partitions = partitions
+        self.batch_size = batch_size
+        self.interrupt_cancelled = interrupt_cancelled
+        self.query_latency = query_latency
+        self.db = duckdb.connect(":memory:")
+        self.db.execute("CREATE SCHEMA IF NOT EXISTS session")
+        self.db.execute("USE session")
+        self.catalog_name = self.db.execute("SELECT current_database()").fetchone()[0]
+        self._statements: Dict[bytes, _Statement] = {}
+        self._results: Dict[bytes, List[pa.Table]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._failures_to_inject = 0
+        self.calls: Dict[str, int] = {}
+
+    def fail_next_requests(self, count: int) -> None:
+        with self._lock:
+            self._failures_to_inject = count
+
+    def _maybe_fail(self) -> None:
+        with self._lock:
+            if self._failures_to_inject <= 0:
+                return
+            self._failures_to_inject -= 1
+        raise flight.FlightUnavailableError("Injected transient failure")
+
+    # --- bookkeeping ---
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _new_handle(self) -> bytes:
+        return str(next(self._ids)).encode()
+
+    def _cursor(self) -> duckdb.DuckDBPyConnection:
+        cur = self.db.cursor()
+        cur.execute("USE session")
+        return cur
+
+    def _interrupt_when_cancelled(self, context, cur: duckdb.DuckDBPyConnection, done: threading.Event) -> None:
+        while not done.wait(0.01):
+            if context.is_cancelled():
+                self._count("Cancelled")
+                cur.interrupt()
+                return
+
+    def _run_query(self, query: str, parameters: Optional[pa.Table] = None, context=None) -> pa.Table:
+        cur = self._cursor()
+        done = threading.Event()
+        watcher = None
+        if self.interrupt_cancelled and context is not None:
+            watcher = threading.Thread(target=self._interrupt_when_cancelled, args=(context, cur, done), daemon=True)
+            watcher.start()
+        try:
+            if self.query_latency:
+                time.sleep(self.query_latency)
+            if parameters is None or parameters.num_rows == 0:
+                return cur.execute(query).to_arrow_table()
+            tables = [cur.execute(query, list(row.values())).to_arrow_table()
+                      for row in parameters.to_pylist()]
+            return pa.concat_tables(tables)
+        except duckdb.Error as e:
+            raise flight.FlightServerError(str(e)) from None
+        finally:
+            # The call's context is only valid until it returns - so the watcher must be done with it by then
+            done.set()
+            if watcher is not None:
+                watcher.join()
+            cur.close()
+
+    def _run_update(self, query: str, parameters: Optional[pa.Table] = None) -> int:
+        cur = self._cursor()
+        try:
+            if parameters is None or parameters.num_rows == 0:
+                cur.execute(query)
+                rows = [] if cur.description is None else cur.fetchall()
+                return rows[0][0] if rows and isinstance(rows[0][0], int) else -1
+            insert = _INSERT_VALUES.match(query)
+            if insert:
+                # Bulk INSERT ... VALUES (?, ...) - load the bound Arrow data column-wise
+                cur.register("__parameters", parameters)
+                cur.execute(f"INSERT INTO {insert.group(1)} {insert.group(2) or ''} SELECT * FROM __parameters")
+            else:
+                cur.executemany(query, [list(row.values()) for row in parameters.to_pylist()])
+            return parameters.num_rows
+        except duckdb.Error as e:
+            raise flight.FlightServerError(str(e)) from None
+        finally:
+            cur.close()
+
+    def _flight_info(self, descriptor: flight.FlightDescriptor, table: pa.Table) -> flight.FlightInfo:
+        handle = self._new_handle()
+        chunks = max(1, self.partitions)
+        step = -(-table.num_rows // chunks) if table.num_rows else 0
+        parts = [table.slice(i * step, step) for i in range(chunks)] if step else [table]
+        with self._lock:
+            self._results[handle] = parts
+        endpoints = [
+            flight.FlightEndpoint(pack_any("TicketStatementQuery", [(1, handle + b":" + str(i).encode())]), [])
+            for i in range(len(parts))
+        ]
+        return flight.FlightInfo(table.schema, descriptor, endpoints, table.num_rows, table.nbytes)
+
+    # --- Flight RPCs ---
+    def get_flight_info(self, context, descriptor):
+        name, fields = unpack_any(descriptor.command)
+        self._count(name)
+        self._maybe_fail()
+        if name == "CommandStatementQuery":
+            table = self._run_query(_first(fields, 1, b"").decode(), context=context)
+        elif name == "CommandPreparedStatementQuery":
+            stmt = self._statements[_first(fields, 1)]
+            table = self._run_query(stmt.query, stmt.parameters, context=context)
+        elif name == "CommandGetCatalogs":
+            table = pa.table([pa.array([self.catalog_name], pa.utf8())],
+                             schema=pa.schema([pa.field("catalog_name", pa.utf8(), False)]))
+        elif name == "CommandGetDbSchemas":
+            table = self._get_db_schemas(fields)
+        elif name == "CommandGetTables":
+            table = self._get_tables(fields)
+        elif name == "CommandGetTableTypes":
+            table = pa.table([pa.array(["BASE TABLE", "VIEW"], pa.utf8())],
+                             schema=pa.schema([pa.field("table_type", pa.utf8(), False)]))
+        else:
+            raise flight.FlightServerError(f"Unsupported command: {name}")
+        return self._flight_info(descriptor, table)
+
+    def do_get(self, context, ticket):
+        self._count("DoGet")
+        _, fields = unpack_any(ticket.ticket)
+        handle, _, index = _first(fields, 1).rpartition(b":")
+        with self._lock:
+            parts = self._results[handle]
+            table = parts[int(index)]
+            parts[int(index)] = None
+            if all(part is None for part in parts):
+                del self._results[handle]
+        return flight.GeneratorStream(table.schema, iter(table.to_batches(max_chunksize=self.batch_size)))
+
+    def do_put(self, context, descriptor, reader, writer):
+        name, fields = unpack_any(descriptor.command)
+        self._count(name)
+        parameters = reader.read_all()
+        if name == "CommandPreparedStatementQuery":
+            handle = _first(fields, 1)
+            self._statements[handle].parameters = parameters
+            writer.write(pa.py_buffer(encode_fields([(1, handle)])))
+        elif name == "CommandPreparedStatementUpdate":
+            stmt = self._statements[_first(fields, 1)]
+            count = self._run_update(stmt.query, parameters if parameters.num_columns else None)
+            writer.write(pa.py_buffer(encode_fields([(1, count)])))
+        elif name == "CommandStatementUpdate":
+            count = self._run_update(_first(fields, 1, b"").decode())
+            writer.write(pa.py_buffer(encode_fields([(1, count)])))
+        else:
+            raise flight.FlightServerError(f"Unsupported command: {name}")
+
+    def list_actions(self, context):
+        return [("CreatePreparedStatement", ""), ("ClosePreparedStatement", "")]
+
+    def do_action(self, context, action):
+        self._count(action.type)
+        if action.type == "CreatePreparedStatement":
+            _, fields = unpack_any(action.body.to_pybytes())
+            handle = self._new_handle()
+            with self._lock:
+                self._statements[handle] = _Statement(_first(fields, 1, b"").decode())
+            return [pack_any("ActionCreatePreparedStatementResult", [(1, handle)])]
+        elif action.type == "ClosePreparedStatement":
+            _, fields = unpack_any(action.body.to_pybytes())
+            with self._lock:
+                self._statements.pop(_first(fields, 1), None)
+            return []
+        raise flight.FlightServerError(f"Unsupported action: {action.type}")
+
+    # --- catalog helpers ---
+    def _get_db_schemas(self, fields) -> pa.Table:
+        pattern = _first(fields, 2, b"%").decode()
+        rows = self._cursor().execute(
+            "SELECT catalog_name, schema_name FROM information_schema.schemata "
+            "WHERE schema_name LIKE ? ORDER BY 1, 2", [pattern]).fetchall()
+        return pa.table([pa.array([r[0] for r in rows], pa.utf8()), pa.array([r[1] for r in rows], pa.utf8())],
+                        schema=pa.schema([pa.field("catalog_name", pa.utf8()),
+                                          pa.field("db_schema_name", pa.utf8(), False)]))
+
+    def _get_tables(self, fields) -> pa.Table:
+        schema_pattern = _first(fields, 2, b"%").decode()
+        table_pattern = _first(fields, 3, b"%").decode()
+        table_types = [t.decode() for t in fields.get(4, [])]
+        include_schema = bool(_first(fields, 5, 0))
+        cur = self._cursor()
+        rows = cur.execute(
+            "SELECT table_catalog, table_schema, table_name, table_type FROM information_schema.tables "
+            "WHERE table_schema LIKE ? AND table_name LIKE ? ORDER BY 1, 2, 3",
+            [schema_pattern, table_pattern]).fetchall()
+        if table_types:
+            rows = [r for r in rows if r[3] in table_types]
+        fields = [pa.field("catalog_name", pa.utf8()), pa.field("db_schema_name", pa.utf8()),
+                  pa.field("table_name", pa.utf8(), False), pa.field("table_type", pa.utf8(), False)]
+        columns = [pa.array([r[i] for r in rows], pa.utf8()) for i in range(4)]
+        if include_schema:
+            schemas = [cur.execute(f'SELECT * FROM "{r[1]}"."{r[2]}" LIMIT 0').to_arrow_table()
+                       .schema.serialize().to_pybytes() for r in rows]
+            fields.append(pa.field("table_schema", pa.binary(), False))
+            columns.append(pa.array(schemas, pa.binary()))
+        return pa.table(columns, schema=pa.schema(fields))
+
+
+def serve(**kwargs) -> StandInFlightSqlServer:
+    """Start a stand-in server on an ephemeral port; it serves from a background thread."""
+    server = StandInFlightSqlServer(**kwargs)
+    threading.Thread(target=server.serve, daemon=True).start()
+    return server
@@ -0,0 +1,368 @@
+# This module runs the dialect benchmarks against the in-process Flight SQL stand-in server.
+"""Measure the Theseus dialect's own costs - no Theseus cluster needed.
+
+Usage::
+
+    pip install -e .[benchmark]
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json --tolerance 0.25
+
+Results are written as JSON.  With ``--baseline`` each metric is compared to the baseline run, and the exit
+status is 1 if any metric regressed by more than ``--tolerance`` (a fraction of the baseline value).  The exit
+status is 1 as well if importing the dialect exceeds its time/memory budget (``--import-time-budget`` /
+``--import-memory-budget``), or loads the driver stack eagerly.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from typing import Callable, Dict, List
+
+import pyarrow as pa
+import sqlalchemy
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, create_engine, text
+from sqlalchemy.dialects import registry
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from flight_sql_server import StandInFlightSqlServer, serve
+
+registry.register("theseus", "sqlalchemy_theseus_dialect", "TheseusDialect")
+# The Flight SQL driver warns on every connect that it can't turn autocommit off
+warnings.filterwarnings("ignore", message="Cannot disable autocommit")
+
+import sqlalchemy_theseus_dialect  # noqa: E402
+from sqlalchemy_theseus_dialect import TheseusWarning, execute_concurrently, ingest  # noqa: E402
+
+warnings.simplefilter("ignore", TheseusWarning)
+
+# Metrics ending in one of these are better when higher - every other metric (seconds) is better when lower
+_HIGHER_IS_BETTER = ("_per_second",)
+
+# Modules which importing the dialect must not load - they are only needed once an engine connects
+_DRIVER_MODULES = ("pyarrow", "numpy", "adbc_driver_manager", "adbc_driver_flightsql", "tenacity")
+
+# Run in a fresh interpreter: how long importing the dialect takes (on top of SQLAlchemy), and what it loads.  Memory
+# is traced (Python allocations) in a separate run, as tracing slows the import down.
+_IMPORT_PROBE = f"""
+import json, sys, time, tracemalloc
+import sqlalchemy
+trace_memory = sys.argv[1] == "memory"
+if trace_memory:
+    tracemalloc.start()
+start = time.perf_counter()
+import sqlalchemy_theseus_dialect
+seconds = time.perf_counter() - start
+print(json.dumps(dict(seconds=seconds,
+                      memory_bytes=tracemalloc.get_traced_memory()[0] if trace_memory else None,
+                      driver_modules=[name for name in {_DRIVER_MODULES!r} if name in sys.modules])))
+"""
+
+
+def _engine(server: StandInFlightSqlServer, **query: str) -> Engine:
+    query_string = "&".join(f"{key}={value}" for key, value in
+                            {"useEncryption": "False", "disableCertificateVerification": "False", **query}.items())
+    return create_engine(f"theseus://127.0.0.1:{server.port}/?{query_string}")
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> float:
+    """The median wall-clock time of ``repeat`` calls of ``fn`` (after one warm-up call)."""
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def bench_import(server: StandInFlightSqlServer, args) -> Dict[str, float]:
+    def probe(mode: str) -> dict:
+        output = subprocess.run([sys.executable, "-c", _IMPORT_PROBE, mode], check=True, capture_output=True, text=True)
+        return json.loads(output.stdout)
+
+    timed = [probe("time") for _ in range(args.repeat)]
+    traced = probe("memory")
+    return dict(import_seconds=statistics.median(result["seconds"] for result in timed),
+                import_memory_mb=traced["memory_bytes"] / 1e6,
+                import_driver_modules=max(len(result["driver_modules"]) for result in timed + [traced]),
+                )
+
+
+def bench_connect(server: StandInFlightSqlServer, args) -> Dict[str, float]:
+    fresh_engine = create_engine(_engine(server).url, poolclass=NullPool)
+    pooled_engine = _engine(server)
+
+    def connect(engine: Engine) -> None:
+        with engine.connect():
+            pass
+
+    return dict(new_connection_seconds=_timed(lambda: connect(fresh_engine), args.repeat * 5),
+                pool_checkout_seconds=_timed(lambda: connect(pooled_engine), args.repeat * 50),
+                )
+
+
+def bench_reflection(server: StandInFlightSqlServer, args) -> Dict[str, float]:
+    results = {}
+    engine = _engine(server, catalogCacheTtl="0")
+    snapshot_directory = tempfile.TemporaryDirectory()
+    # Reflection served from an up-to-date schema snapshot (still checked against the server every time)
+    snapshot_engine = _engine(server, catalogCacheTtl="0", schemaSnapshot=f"{snapshot_directory.name}/schema.json")
+    created = 0
+    for table_count in args.reflection_tables:
+        for i in range(created, table_count):
+            server.db.execute(f"CREATE TABLE session.reflect_{i} (id INTEGER, name VARCHAR, amount DECIMAL(18, 2))")
+        created = max(created, table_count)
+
+        def reflect(reflected_engine: Engine = engine) -> None:
+            MetaData().reflect(bind=reflected_engine, schema="session")
+
+        results[f"reflect_{table_count}_tables_seconds"] = _timed(reflect, args.repeat)
+        results[f"reflect_{table_count}_tables_snapshot_seconds"] = _timed(lambda: reflect(snapshot_engine),
+                                                                           args.repeat)
+    snapshot_directory.cleanup()
+    for i in range(created):
+        server.db.execute(f"DROP TABLE session.reflect_{i}")
+    return results
+
+
+def _fetch_metrics(prefix: str, seconds: float, table: pa.Table) -> Dict[str, float]:
+    return {f"{prefix}_seconds": seconds,
+            f"{prefix}_rows_per_second": table.num_rows / seconds,
+            f"{prefix}_mb_per_second": table.nbytes / seconds / 1e6,
+            }
+
+
+def bench_fetch(server: StandInFlightSqlServer, args) -> Dict[str, float]:
+    engine = _engine(server)
+    query = text("SELECT * FROM session.bench")
+    with engine.connect() as conn:
+        reference = conn.execute(query).arrow()
+
+        results = {}
+        results.update(_fetch_metrics("fetch_rows", _timed(lambda: conn.execute(query).all(), args.repeat),
+                                      reference))
+        results.update(_fetch_metrics("fetch_arrow", _timed(lambda: conn.execute(query).arrow(), args.repeat),
+                                      reference))
+        streaming = conn.execution_options(stream_results=True)
+        results.update(_fetch_metrics("fetch_streaming",
+                                      _timed(lambda: sum(1 for _ in streaming.execute(query)), args.repeat),
+                                      reference))
+    return results
+
+
+def bench_parallel_fetch(server: StandInFlightSqlServer, args) -> Dict[str, float]:
+    engine = _engine(server)
+    query = text("SELECT * FROM session.bench")
+    server.partitions = args.partitions
+    try:
+        with engine.connect() as conn:
+            reference = conn.execute(query).arrow()
+            parallel = conn.execution_options(parallel_fetch=args.partitions)
+            return _fetch_metrics("parallel_fetch_arrow",
+                                  _timed(lambda: parallel.execute(query).arrow(), args.repeat),
+                                  reference)
+    finally:
+        server.partitions = 1
+
+
+def _load_table() -> Table:
+    return Table("bench_load", MetaData(),
+                 Column("id", Integer), Column("name", String), Column("val", Float),
+                 schema="session")
+
+
+def bench_load(server: StandInFlightSqlServer, args) -> Dict[str, float]:
+    engine = _engine(server)
+    table = _load_table()
+    rows = [dict(id=i, name=f"name_{i}", val=i * 0.5) for i in range(args.load_rows)]
+    data = pa.Table.from_pylist(rows)
+
+    def executemany() -> None:
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM session.bench_load"))
+            conn.execute(table.insert(), rows)
+
+    def ingest_fallback() -> None:
+        # The Flight SQL driver pinned here rejects ADBC bulk ingestion - so this measures ingest()'s fallback:
+        # DDL, then the whole Arrow stream bound to one prepared INSERT
+        ingest(engine, "bench_load", data, mode="replace", schema="session")
+
+    with engine.begin() as conn:
+        table.create(conn, checkfirst=True)
+    executemany_seconds = _timed(executemany, args.repeat)
+    ingest_fallback_seconds = _timed(ingest_fallback, args.repeat)
+    with engine.begin() as conn:
+        table.drop(conn, checkfirst=True)
+    return dict(executemany_seconds=executemany_seconds,
+                executemany_rows_per_second=len(rows) / executemany_seconds,
+                ingest_fallback_seconds=ingest_fallback_seconds,
+                ingest_fallback_rows_per_second=len(rows) / ingest_fallback_seconds,
+                )
+
+
+def bench_retry(server: StandInFlightSqlServer, args) -> Dict[str, float]:
+    engine = _engine(server, retryInitialWait="0.001", retryMaxWait="0.001", retryJitter="0",
+                     circuitBreakerThreshold="0")
+    query = text("SELECT 1")
+    with engine.connect() as conn:
+        def plain() -> None:
+            conn.execute(query).all()
+
+        def retried() -> None:
+            server.fail_next_requests(1)
+            conn.execute(query).all()
+
+        plain_seconds = _timed(plain, args.repeat * 20)
+        retried_seconds = _timed(retried, args.repeat * 20)
+    return dict(query_seconds=plain_seconds,
+                retried_query_seconds=retried_seconds,
+                retry_overhead_seconds=max(0.0, retried_seconds - plain_seconds),
+                )
+
+
+def bench_concurrent(server: StandInFlightSqlServer, args) -> Dict[str, float]:
+    engine = create_engine(_engine(server).url, pool_size=args.concurrent_queries)
+    queries = [(text("SELECT count(*) FROM session.bench WHERE id % 7 = :m"), {"m": i % 7})
+               for i in range(args.concurrent_queries)]
+
+    def one_by_one() -> None:
+        with engine.connect() as conn:
+            for statement, parameters in queries:
+                conn.execute(statement, parameters).all()
+
+    def concurrently() -> None:
+        for outcome in execute_concurrently(engine, queries):
+            outcome.unwrap()
+
+    server.query_latency = args.query_latency
+    try:
+        return dict(sequential_queries_seconds=_timed(one_by_one, args.repeat),
+                    concurrent_queries_seconds=_timed(concurrently, args.repeat),
+                    )
+    finally:
+        server.query_latency = 0.0
+
+
+BENCHMARKS = {
+    "import": bench_import,
+    "connect": bench_connect,
+    "reflection": bench_reflection,
+    "fetch": bench_fetch,
+    "parallel_fetch": bench_parallel_fetch,
+    "load": bench_load,
+    "retry": bench_retry,
+    "concurrent": bench_concurrent,
+}
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float
+            ) -> List[str]:
+    """List the metrics which are more than ``tolerance`` worse than in the baseline."""
+    regressions = []
+    for benchmark, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(benchmark, {}).get(metric)
+            if not expected:
+                continue
+            if metric.endswith(_HIGHER_IS_BETTER):
+                change = (expected - value) / expected
+            else:
+                change = (value - expected) / expected
+            if change > tolerance:
+                regressions.append(f"{benchmark}.{metric}: {value:.6g} vs. baseline {expected:.6g} "
+                                   f"({change:+.0%} worse)")
+    return regressions
+
+
+def over_budget(results: Dict[str, Dict[str, float]], args) -> List[str]:
+    """List the ways importing the dialect exceeded its budget."""
+    metrics = results.get("import")
+    if metrics is None:
+        return []
+    violations = []
+    if metrics["import_seconds"] > args.import_time_budget:
+        violations.append(f"import took {metrics['import_seconds']:.3f}s (budget: {args.import_time_budget}s)")
+    if metrics["import_memory_mb"] > args.import_memory_budget:
+        violations.append(f"import used {metrics['import_memory_mb']:.1f} MB (budget: {args.import_memory_budget} MB)")
+    if metrics["import_driver_modules"]:
+        violations.append(f"import loaded {metrics['import_driver_modules']} of the driver modules "
+                          f"{', '.join(_DRIVER_MODULES)}")
+    return violations
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows in the fetch benchmark table")
+    parser.add_argument("--load-rows", type=int, default=100_000, help="rows loaded by the load benchmarks")
+    parser.add_argument("--reflection-tables", type=int, nargs="+", default=[10, 100],
+                        help="table counts to time reflection at")
+    parser.add_argument("--partitions", type=int, default=4, help="result partitions for the parallel fetch")
+    parser.add_argument("--concurrent-queries", type=int, default=20,
+                        help="queries per batch in the concurrent benchmark")
+    parser.add_argument("--query-latency", type=float, default=0.05,
+                        help="seconds the server adds to each query in the concurrent benchmark")
+    parser.add_argument("--batch-size", type=int, default=65_536, help="rows per record batch sent by the server")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions (the median is reported)")
+    parser.add_argument("--output", help="write the results (JSON) to this file, rather than to stdout")
+    parser.add_argument("--baseline", help="compare against the results (JSON) of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed regression against the baseline, as a fraction (default: 0.25)")
+    parser.add_argument("--import-time-budget", type=float, default=0.1,
+                        help="seconds importing the dialect may take, on top of SQLAlchemy (default: 0.1)")
+    parser.add_argument("--import-memory-budget", type=float, default=10.0,
+                        help="memory (MB) importing the dialect may add, on top of SQLAlchemy (default: 10)")
+    args = parser.parse_args(argv)
+
+    server = serve(batch_size=args.batch_size)
+    server.db.execute(f"CREATE TABLE session.bench AS "
+                      f"SELECT range::BIGINT AS id, 'name_' || range AS name, random() AS val, "
+                      f"DATE '2020-01-01' + (range % 1000)::INTEGER AS day "
+                      f"FROM range({args.rows})")
+    try:
+        results = {}
+        for name in args.only or BENCHMARKS:
+            print(f"Running benchmark: {name}", file=sys.stderr)
+            results[name] = BENCHMARKS[name](server, args)
+    finally:
+        server.shutdown()
+
+    report = dict(environment=dict(python=platform.python_version(),
+                                   platform=platform.platform(),
+                                   sqlalchemy=sqlalchemy.__version__,
+                                   pyarrow=pa.__version__,
+                                   dialect=sqlalchemy_theseus_dialect.__version__,
+                                   ),
+                  parameters=dict(rows=args.rows, load_rows=args.load_rows, partitions=args.partitions,
+                                  batch_size=args.batch_size, concurrent_queries=args.concurrent_queries,
+                                  query_latency=args.query_latency, repeat=args.repeat),
+                  results=results,
+                  )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    failed = False
+    for violation in over_budget(results, args):
+        print(f"OVER BUDGET {violation}", file=sys.stderr)
+        failed = True
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
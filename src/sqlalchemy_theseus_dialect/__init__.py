@@ -1,132 +1,148 @@
-import re
+import importlib
 import threading
+import time
 import warnings
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, Union
+import weakref
+from typing import TYPE_CHECKING, Any, Collection, Dict, Iterable, List, Optional, Tuple, Type
 
-from adbc_driver_flightsql import dbapi as flight_sql, DatabaseOptions, ConnectionOptions
-from sqlalchemy import pool
+from sqlalchemy import event, exc, pool
 from sqlalchemy import types as sqltypes
+from sqlalchemy.engine import reflection
 from sqlalchemy.engine.default import DefaultDialect
 from sqlalchemy.engine.url import URL
-from tenacity import retry, stop_after_attempt, wait_exponential
+from sqlalchemy.sql.compiler import InsertmanyvaluesSentinelOpts
 
 from .sqlalchemy_interfaces import ReflectedColumn, ReflectedPrimaryKeyConstraint, ReflectedForeignKeyConstraint, \
-    ReflectedCheckConstraint
+    ReflectedCheckConstraint, ObjectKind, ObjectScope
+from .catalog_cache import CatalogCache, DEFAULT_CATALOG_CACHE_TTL
+from .compiler import TheseusCompiler
+from .endpoints import Endpoint, LoadBalancer, LoadBalancingPolicy, RoundRobinPolicy, \
+    LeastOutstandingQueriesPolicy, RandomPolicy, parse_endpoints
+from .execution_context import TheseusExecutionContext
+from .expression import TheseusSelect, select, approx_count_distinct, approx_percentile, sample_rows
+from .instrumentation import Instrumentation, MetricsSink, PrometheusMetricsSink, QueryTimings
+from .multi_query import QueryOutcome, execute_concurrently
+from .result import TheseusCursorResult
+from .result_cache import ResultCache, DEFAULT_RESULT_CACHE_TTL, DEFAULT_RESULT_CACHE_DISK_SIZE
+from .schema_snapshot import RawColumn, SchemaSnapshot, SnapshotTable
+from .transport import ConnectionKeepalive, TransportOptions
+from .types import reflected_type
 
 __version__ = "0.0.12"
 
+# Importing the dialect (e.g. as a ``sqlalchemy.dialects`` entry point) must stay cheap - so everything which needs
+# the ADBC driver stack (pyarrow, the Flight SQL driver, tenacity) is only imported once it is first used:
+# on import_dbapi()/connect(), or on first access of one of these names
+_LAZY_ATTRIBUTES = {
+    "CursorWrapper": ".cursor",
+    "StreamingCursorWrapper": ".cursor",
+    "ConnectionWrapper": ".cursor",
+    "DEFAULT_STREAM_PREFETCH_BATCHES": ".cursor",
+    "SharedDatabase": ".database",
+    "read_sql": ".dataframes",
+    "to_sql": ".dataframes",
+    "ingest": ".ingest",
+    "pandas_to_sql": ".ingest",
+    "DEFAULT_INGEST_BATCH_SIZE": ".ingest",
+    "PartitionedResult": ".partitions",
+    "Retrier": ".retry",
+    "RetryPolicy": ".retry",
+    "CircuitBreaker": ".retry",
+    "CircuitOpenError": ".retry",
+    "PreparedStatementCache": ".statement_cache",
+    "DEFAULT_PREPARED_STATEMENT_CACHE_SIZE": ".statement_cache",
+    "StatementTimeoutError": ".timeouts",
+}
 
 if TYPE_CHECKING:
     from sqlalchemy.base import Connection
     from sqlalchemy.engine.interfaces import _IndexDict
 
+    from .cursor import ConnectionWrapper
+    from .database import SharedDatabase
+    from .retry import Retrier
 
-class TheseusWarning(Warning):
-    pass
-
-
-class CursorWrapper(flight_sql.Cursor):
-    def __init__(self, *args, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
-
-    @retry(stop=stop_after_attempt(10), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def execute(self, operation: Union[bytes, str], parameters=None) -> None:
-        super().execute(operation=operation, parameters=parameters)
-
-    @retry(stop=stop_after_attempt(10), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def executemany(self, operation: Union[bytes, str], seq_of_parameters) -> None:
-        super().executemany(operation=operation, seq_of_parameters=seq_of_parameters)
 
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-class ConnectionWrapper:
-    __c: "Connection"
-    notices: List[str]
-    autocommit = None
-    closed = False
-
-    def __init__(self, c: flight_sql.Connection) -> None:
-        self.__c = c
-        self.notices = list()
-
-    def cursor(self) -> CursorWrapper:
-        return CursorWrapper(conn=self.__c)
-
-    def fetchmany(self, size: Optional[int] = None) -> List:
-        return self.__c.fetchmany(size)
-
-    @property
-    def c(self) -> "Connection":
-        warnings.warn(
-            "Directly accessing the internal connection object is deprecated (please go via the __getattr__ impl)",
-            DeprecationWarning,
-        )
-        return self.__c
-
-    def __getattr__(self, name: str) -> Any:
-        return getattr(self.__c, name)
 
-    @property
-    def connection(self) -> "Connection":
-        return self
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
 
-    def close(self) -> None:
-        self.__c.adbc_cancel()
-        self.__c.close()
 
-    @property
-    def rowcount(self) -> int:
-        return self.cursor().rowcount
+class TheseusWarning(Warning):
+    pass
 
-    def executemany(
-            self,
-            statement: str,
-            parameters: Optional[List[Dict]] = None,
-            context: Optional[Any] = None,
-    ) -> None:
-        self.cursor().executemany(statement, parameters)
 
-    def execute(
-            self,
-            statement: str,
-            parameters: Optional[Tuple] = None,
-            context: Optional[Any] = None,
-    ) -> None:
-        try:
-            if statement.lower() == "commit":  # this is largely for ipython-sql
-                self.__c.commit()
-            elif statement.lower() == "register":
-                assert parameters and len(parameters) == 2, parameters
-                view_name, df = parameters
-                self.__c.register(view_name, df)
-            else:
-                with self.cursor() as cur:
-                    cur.execute(statement, parameters)
-        except RuntimeError as e:
-            if e.args[0].startswith("Not implemented Error"):
-                raise NotImplementedError(*e.args) from e
-            elif (
-                    e.args[0]
-                    == "TransactionContext Error: cannot commit - no transaction is active"
-            ):
-                return
-            else:
-                raise e
+def _quote_string_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
 
 
 class TheseusDialect(DefaultDialect):
     name = "tester"
     driver = "flight_sql_adbc"
     _has_events = False
-    supports_statement_cache = False
+    supports_statement_cache = True
     supports_comments = False
     supports_sane_rowcount = False
-    supports_server_side_cursors = False
+    supports_server_side_cursors = True
     postfetch_lastrowid = False
+    # Arrow hands back decimals and booleans as such - so SQLAlchemy needn't convert them again
+    supports_native_decimal = True
+    supports_native_boolean = True
+    # insert().values([...]) renders one multi-row VALUES clause - and so does SQLAlchemy's "insertmanyvalues"
+    # batching of INSERT..RETURNING (with RETURNING enabled: see insertReturning).  Plain executemany() parameter
+    # sets are bound as Arrow batches instead (see the cursor)
+    supports_multivalues_insert = True
+    use_insertmanyvalues = True
+    # ... whose batches of RETURNING rows are matched up with their parameter sets by the (ascending) generated keys
+    insertmanyvalues_implicit_sentinel = (InsertmanyvaluesSentinelOpts.ANY_AUTOINCREMENT
+                                          | InsertmanyvaluesSentinelOpts.USE_INSERT_FROM_SELECT)
+    execution_ctx_cls = TheseusExecutionContext
+    statement_compiler = TheseusCompiler
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
+        self.catalog_cache = CatalogCache()
+        self.schema_snapshot = SchemaSnapshot()
+        self._retrier: Optional["Retrier"] = None
+        self.result_cache = ResultCache()
+        self.pool_prewarm = 0
+        self.cancel_on_checkin = True
+        self.instrumentation = Instrumentation()
+        # Set up (by create_connect_args) when the URL names several gateway endpoints
+        self.load_balancer: Optional[LoadBalancer] = None
+        self.transport = TransportOptions()
+        # Set up (by engine_created) when the URL asks for a keepalive of idle connections
+        self.keepalive: Optional[ConnectionKeepalive] = None
+        # One ADBC database per server/credentials - every pooled connection is opened from it
+        self._databases: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], "SharedDatabase"] = {}
+        self._databases_lock = threading.Lock()
+        weakref.finalize(self, TheseusDialect._close_databases, self._databases)
+
+    @property
+    def retrier(self) -> "Retrier":
+        # Created on first use - the retry machinery needs the driver stack
+        if self._retrier is None:
+            from .retry import Retrier
+            self._retrier = Retrier()
+        return self._retrier
+
+    @retrier.setter
+    def retrier(self, retrier: "Retrier") -> None:
+        self._retrier = retrier
 
     def create_connect_args(self, url):
+        from .cursor import DEFAULT_STREAM_PREFETCH_BATCHES
+        from .retry import Retrier
+        from .statement_cache import DEFAULT_PREPARED_STATEMENT_CACHE_SIZE
+
         opts = url.translate_connect_args()
         username = opts.get('username', None)
         password = opts.get('password', None)
@@ -136,37 +152,84 @@ class TheseusDialect(DefaultDialect):
 
         # Get Query parameters
         query_dict = dict(url.query)
-        use_encryption = query_dict.pop('useEncryption', None)
-        disable_certificate_verification = query_dict.pop('disableCertificateVerification', None)
+        # Further gateway endpoints (``host=host:port`` - repeated, or comma-separated) to balance connections over
+        extra_hosts = query_dict.pop('host', ())
+        endpoints = parse_endpoints(([f"{host}:{port}" if port else host] if host else [])
+                                    + ([extra_hosts] if isinstance(extra_hosts, str) else list(extra_hosts)),
+                                    default_port=port)
+        self.load_balancer = LoadBalancer.from_url_query(endpoints, query_dict)
+        if endpoints:
+            host, port = endpoints[0]
+        # The gRPC/Flight transport settings - driver options, rather than RPC call headers
+        self.transport = TransportOptions.from_url_query(query_dict)
+        prepared_statement_cache_size = int(query_dict.pop('preparedStatementCacheSize',
+                                                           DEFAULT_PREPARED_STATEMENT_CACHE_SIZE))
+        stream_prefetch_batches = int(query_dict.pop('streamPrefetchBatches', DEFAULT_STREAM_PREFETCH_BATCHES))
+        # The default timeout (in seconds) of every statement - overridden by a ``timeout`` execution option
+        statement_timeout = query_dict.pop('statementTimeout', None)
+        # Results fetched whole as Arrow (arrow(), DataFrames, async engines) spill to disk past this many bytes
+        result_spill_threshold = int(query_dict.pop('resultSpillThreshold', 0))
+        result_spill_directory = query_dict.pop('resultSpillDirectory', None)
+        # The catalog cache is per engine (i.e. per dialect instance), so it is configured here rather than per connection
+        self.catalog_cache.ttl = float(query_dict.pop('catalogCacheTtl', DEFAULT_CATALOG_CACHE_TTL))
+        # Reflected schemas are kept in (and, on later startups, read back from) this local file
+        self.schema_snapshot = SchemaSnapshot(query_dict.pop('schemaSnapshot', None),
+                                              server=f"{host}:{port}/{database or ''}")
+        self.retrier = Retrier.from_url_query(query_dict)
+        self.pool_prewarm = int(query_dict.pop('poolPrewarm', 0))
+        self.cancel_on_checkin = query_dict.pop('cancelOnCheckin', 'True').lower() == 'true'
+        # INSERT..RETURNING - e.g. for the ORM to fetch server-generated primary keys of a whole batch of objects
+        self.insert_returning = query_dict.pop('insertReturning', str(self.insert_returning)).lower() == 'true'
+        self.insertmanyvalues_page_size = int(query_dict.pop('insertmanyvaluesPageSize',
+                                                             self.insertmanyvalues_page_size))
+        self.instrumentation.enabled = query_dict.pop('queryTimings', 'False').lower() == 'true'
+        self.result_cache = ResultCache(max_bytes=int(query_dict.pop('resultCacheSize', 0)),
+                                        ttl=float(query_dict.pop('resultCacheTtl', DEFAULT_RESULT_CACHE_TTL)),
+                                        directory=query_dict.pop('resultCacheDirectory', None),
+                                        max_disk_bytes=int(query_dict.pop('resultCacheDiskSize',
+                                                                          DEFAULT_RESULT_CACHE_DISK_SIZE))
+                                        )
         args = dict()
         kwargs = dict(host=host,
                       port=port,
                       database=database,
                       username=username,
                       password=password,
-                      use_encryption=use_encryption,
-                      disable_certificate_verification=disable_certificate_verification,
+                      transport=self.transport,
+                      prepared_statement_cache_size=prepared_statement_cache_size,
+                      stream_prefetch_batches=stream_prefetch_batches,
+                      statement_timeout=statement_timeout,
+                      result_spill_threshold=result_spill_threshold,
+                      result_spill_directory=result_spill_directory,
                       **query_dict
                       )
 
         # Assuming the connection arguments for your custom DB
         return (args, kwargs)
 
-    def connect(self, *args, **kwargs) -> "Connection":
-        protocol: str = "grpc"
-        use_encryption: bool = kwargs.pop("use_encryption", "False").lower() == "true"
-        if use_encryption:
-            protocol += "+tls"
+    def connect(self, *args, **kwargs) -> "ConnectionWrapper":
+        from adbc_driver_flightsql import ConnectionOptions
+        from .cursor import ConnectionWrapper, DEFAULT_STREAM_PREFETCH_BATCHES
+        from .statement_cache import DEFAULT_PREPARED_STATEMENT_CACHE_SIZE
+        from .timeouts import timeout_from
 
-        disable_certificate_verification: bool = kwargs.pop("disable_certificate_verification", "False").lower() == "true"
+        transport: TransportOptions = kwargs.pop("transport", None) or TransportOptions()
+        protocol = transport.protocol
 
-        uri = f"{protocol}://{kwargs.pop('host')}:{kwargs.pop('port')}"
+        host = kwargs.pop('host')
+        port = kwargs.pop('port')
 
         database = kwargs.pop('database', None)
         username = kwargs.pop('username')
         password = kwargs.pop('password')
+        prepared_statement_cache_size = kwargs.pop('prepared_statement_cache_size',
+                                                   DEFAULT_PREPARED_STATEMENT_CACHE_SIZE)
+        stream_prefetch_batches = kwargs.pop('stream_prefetch_batches', DEFAULT_STREAM_PREFETCH_BATCHES)
+        statement_timeout = timeout_from(kwargs.pop('statement_timeout', None))
+        spill_threshold = kwargs.pop('result_spill_threshold', 0)
+        spill_directory = kwargs.pop('result_spill_directory', None)
 
-        db_kwargs = {DatabaseOptions.TLS_SKIP_VERIFY.value: str(disable_certificate_verification).lower()}
+        db_kwargs = transport.database_options()
 
         if database is not None:
             db_kwargs["database"] = database
@@ -180,25 +243,172 @@ class TheseusDialect(DefaultDialect):
         for key, value in kwargs.items():
             conn_kwargs[f"{ConnectionOptions.RPC_CALL_HEADER_PREFIX.value}{key}"] = value
 
-        conn = flight_sql.connect(uri=uri,
-                                  db_kwargs=db_kwargs,
-                                  conn_kwargs=conn_kwargs
-                                  )
+        if self.load_balancer is None:
+            endpoint = None
+            conn = self._open_connection(f"{protocol}://{host}:{port}", db_kwargs, conn_kwargs)
+        else:
+            from .retry import is_transient_error
+
+            endpoint, conn = self.load_balancer.connect(
+                lambda endpoint: self._open_connection(f"{protocol}://{endpoint.address}", db_kwargs, conn_kwargs,
+                                                       verify=True),
+                is_transient_error
+            )
 
         # Add a notices attribute for the PostgreSQL / DuckDB dialect...
         setattr(conn, "notices", ["n/a"])
 
-        return ConnectionWrapper(conn)
+        return ConnectionWrapper(conn,
+                                 prepared_statement_cache_size=prepared_statement_cache_size,
+                                 stream_prefetch_batches=stream_prefetch_batches,
+                                 retrier=self.retrier,
+                                 result_cache=self.result_cache,
+                                 endpoint=endpoint,
+                                 statement_timeout=statement_timeout,
+                                 spill_threshold=spill_threshold,
+                                 spill_directory=spill_directory
+                                 )
+
+    def _open_connection(self, uri: str, db_kwargs: Dict[str, str], conn_kwargs: Dict[str, str],
+                         verify: bool = False) -> Any:
+        started = time.perf_counter()
+        conn = self._get_database(uri, db_kwargs).connect(conn_kwargs)
+        if verify:
+            # Opening an ADBC connection doesn't contact the server - so make a round trip, to fail over now if
+            # it is unreachable, rather than on the connection's first statement
+            from adbc_driver_flightsql import dbapi as flight_sql
+            from .retry import is_transient_error
+
+            try:
+                conn.adbc_get_info()
+            except flight_sql.Error as e:
+                # Any other error is the server answering (if only that it doesn't support the call)
+                if is_transient_error(e):
+                    conn.close()
+                    raise
+        if self.instrumentation.enabled:
+            self.instrumentation.report_connect(time.perf_counter() - started)
+        return conn
+
+    def _get_database(self, uri: str, db_kwargs: Dict[str, str]) -> "SharedDatabase":
+        from .database import SharedDatabase
+
+        key = (uri, tuple(sorted(db_kwargs.items())))
+        with self._databases_lock:
+            database = self._databases.get(key)
+            if database is None:
+                database = self._databases[key] = SharedDatabase(uri, db_kwargs)
+            return database
+
+    @staticmethod
+    def _close_databases(databases: Dict[Any, "SharedDatabase"]) -> None:
+        for database in databases.values():
+            database.close()
+        databases.clear()
 
     def on_connect(self) -> None:
         pass
 
+    @classmethod
+    def engine_created(cls, engine) -> None:
+        if engine.dialect.cancel_on_checkin:
+            engine.dialect._cancel_abandoned_statements(engine)
+        if engine.dialect.load_balancer is not None:
+            engine.dialect._track_endpoints(engine)
+        if engine.dialect.transport.keepalive_interval:
+            engine.dialect._keep_connections_alive(engine)
+        engine.dialect._prewarm_pool(engine)
+
+    def _cancel_abandoned_statements(self, engine) -> None:
+        # A connection can go back to the pool with a result still being streamed (e.g. an abandoned request) -
+        # cancel it on the server then, rather than letting it run on for nobody
+        @event.listens_for(engine.pool, "checkin")
+        def checkin(dbapi_connection, connection_record) -> None:
+            if dbapi_connection is not None:
+                dbapi_connection.cancel_open_cursors()
+
+    def _track_endpoints(self, engine) -> None:
+        # Per-endpoint pool accounting - and pooled connections to an endpoint ejected since they were opened are
+        # swapped for new connections (to an available endpoint) on checkout, rather than each failing a request
+        @event.listens_for(engine.pool, "checkout")
+        def checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+            if dbapi_connection.endpoint_ejected:
+                raise exc.DisconnectionError(f"The connection's endpoint was ejected: {dbapi_connection.endpoint}")
+            dbapi_connection.set_checked_out(True)
+
+        @event.listens_for(engine.pool, "checkin")
+        def checkin(dbapi_connection, connection_record) -> None:
+            # (an invalidated connection is gone already - it was released when it was closed)
+            if dbapi_connection is not None:
+                dbapi_connection.set_checked_out(False)
+
+        # A connection whose gateway failed is discarded on its own - the other endpoints' connections are fine
+        @event.listens_for(engine, "handle_error")
+        def handle_error(context) -> None:
+            if context.is_disconnect:
+                context.invalidate_pool_on_disconnect = False
+
+    def _keep_connections_alive(self, engine) -> None:
+        # Idle pooled connections are pinged in the background - and one which failed its ping is swapped for a new
+        # connection on checkout (a DisconnectionError makes the pool discard it, and try again)
+        keepalive = self.keepalive = ConnectionKeepalive(self.transport.keepalive_interval)
+
+        @event.listens_for(engine.pool, "checkout")
+        def checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+            if not keepalive.checked_out(dbapi_connection):
+                raise exc.DisconnectionError("The connection failed its keepalive ping")
+
+        @event.listens_for(engine.pool, "checkin")
+        def checkin(dbapi_connection, connection_record) -> None:
+            if dbapi_connection is not None:
+                keepalive.checked_in(dbapi_connection)
+
+        @event.listens_for(engine.pool, "close")
+        def close(dbapi_connection, connection_record) -> None:
+            keepalive.closed(dbapi_connection)
+
+    @property
+    def keepalive_stats(self) -> Dict[str, int]:
+        """Counters of the keepalive pings of this engine's idle connections (empty without a keepalive)."""
+        return self.keepalive.stats() if self.keepalive is not None else {}
+
+    def is_disconnect(self, e: Exception, connection: Any, cursor: Any) -> bool:
+        # With several endpoints, a connection that fails with a transport error is dropped - so the next one
+        # goes to a healthy endpoint
+        if self.load_balancer is None:
+            return False
+        from .retry import is_transient_error
+
+        return is_transient_error(e)
+
+    def _prewarm_pool(self, engine) -> None:
+        # Open (and return to the pool) the requested number of connections up front, so the first queries
+        # don't pay for connection setup.  A QueuePool only keeps ``size()`` idle connections.
+        count = self.pool_prewarm
+        pool_size = getattr(engine.pool, "size", None)
+        if callable(pool_size):
+            count = min(count, pool_size())
+        if count <= 0:
+            return
+
+        connections = []
+        try:
+            for _ in range(count):
+                connections.append(engine.pool.connect())
+        except Exception as e:
+            warnings.warn(f"Could only pre-warm {len(connections)} of {count} pooled connections: {e}",
+                          TheseusWarning)
+        finally:
+            for connection in connections:
+                connection.close()
+
     @classmethod
     def get_pool_class(cls, url: URL) -> Type[pool.Pool]:
         return pool.QueuePool
 
     @classmethod
     def import_dbapi(cls):
+        from adbc_driver_flightsql import dbapi as flight_sql
         return flight_sql
 
     @classmethod
@@ -229,17 +439,135 @@ class TheseusDialect(DefaultDialect):
             TheseusWarning,
         )
 
+    @property
+    def retry_stats(self) -> Dict[str, int]:
+        """Counters of statement attempts, retries and circuit breaker activity for this engine."""
+        return self.retrier.stats.as_dict()
+
+    def invalidate_catalog_cache(self, schema: Optional[str] = None) -> None:
+        """Drop cached schema/table lookups (for one schema, or all of them) - e.g. after out-of-band DDL."""
+        self.catalog_cache.invalidate(schema=schema)
+
+    @property
+    def schema_snapshot_stats(self) -> Dict[str, int]:
+        """Counters of the tables served from this engine's schema snapshot, and of those refreshed from the
+        server."""
+        return self.schema_snapshot.stats()
+
+    @property
+    def result_cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters and the memory/disk footprint of this engine's result cache."""
+        return self.result_cache.stats()
+
+    def invalidate_result_cache(self) -> None:
+        """Drop every cached query result - e.g. after the underlying tables changed out-of-band."""
+        self.result_cache.invalidate()
+
+    @property
+    def endpoint_stats(self) -> List[Dict[str, Any]]:
+        """The state, and the connection/query counters, of each gateway endpoint of a load-balanced engine (an
+        empty list for an engine with a single endpoint)."""
+        return self.load_balancer.stats() if self.load_balancer is not None else []
+
+    def add_metrics_sink(self, sink: MetricsSink) -> MetricsSink:
+        """Report the timings of every statement (and connect) of this engine to ``sink`` - e.g. a
+        :class:`PrometheusMetricsSink`.  This enables the engine's query timings."""
+        return self.instrumentation.add_sink(sink)
+
     def get_schema_names(
             self,
             connection: "Connection",
             **kw: Any,
     ) -> Any:
-        schema_list = []
-        object_hierarchy = connection.connection.adbc_get_objects().read_all().to_pylist()
-        for catalog_obj in object_hierarchy:
-            schema_list = [schema_obj.get("db_schema_name") for schema_obj in catalog_obj.get("catalog_db_schemas")]
+        def load_schema_names() -> List[str]:
+            schema_list = []
+            object_hierarchy = connection.connection.adbc_get_objects(depth="db_schemas").read_all().to_pylist()
+            for catalog_obj in object_hierarchy:
+                schema_list.extend(schema_obj.get("db_schema_name")
+                                   for schema_obj in catalog_obj.get("catalog_db_schemas") or []
+                                   )
+            return list(dict.fromkeys(schema_list))
+
+        return list(self.catalog_cache.get_or_load(("schemas",), load_schema_names))
+
+    def _get_schema_objects(
+            self,
+            connection: "Connection",
+            schema: Optional[str] = None,
+            table_name: Optional[str] = None,
+            info_cache: Optional[Dict[Any, Any]] = None,
+    ) -> Dict[str, str]:
+        """Return a mapping of table name to table type, for the tables and views in a schema.
+
+        Only the tables of the one schema are fetched (no columns).  If ``table_name`` is given and the
+        catalog cache is disabled, the lookup is narrowed down to that table on the server as well.
+        """
+        schema = schema if schema is not None else "session"
+        if self.schema_snapshot.enabled:
+            return {name: table.table_type
+                    for name, table in self._get_snapshot_tables(connection, schema, info_cache=info_cache).items()}
+
+        def load_schema_objects(table_name_filter: Optional[str] = None) -> Dict[str, str]:
+            schema_objects = dict()
+            object_hierarchy = connection.connection.adbc_get_objects(depth="tables",
+                                                                      db_schema_filter=schema,
+                                                                      table_name_filter=table_name_filter
+                                                                      ).read_all().to_pylist()
+            for catalog_obj in object_hierarchy:
+                for schema_obj in catalog_obj.get("catalog_db_schemas") or []:
+                    # The filters are LIKE patterns - so make sure we only keep exact matches
+                    if schema_obj.get("db_schema_name") == schema:
+                        for table in schema_obj.get("db_schema_tables") or []:
+                            schema_objects[table.get("table_name")] = table.get("table_type")
+            return schema_objects
+
+        if table_name is not None and not self.catalog_cache.enabled:
+            return {name: table_type for name, table_type in load_schema_objects(table_name).items()
+                    if name == table_name}
+
+        return self.catalog_cache.get_or_load(("tables", schema), load_schema_objects)
+
+    def _get_schema_fingerprints(self, connection: "Connection", schema: str) -> List[Tuple[str, str, str]]:
+        # Each table's (and view's) type, and a hash of its columns - computed on the server, so only that is sent
+        s = f"""
+            SELECT t.table_name
+                 , t.table_type
+                 , md5(coalesce(string_agg(c.column_name || ' ' || c.data_type || ' ' || c.is_nullable
+                                               || ' ' || coalesce(c.column_default, ''),
+                                           ', ' ORDER BY c.ordinal_position), ''))
+              FROM information_schema.tables AS t
+              LEFT OUTER JOIN information_schema.columns AS c
+                ON c.table_catalog = t.table_catalog
+               AND c.table_schema = t.table_schema
+               AND c.table_name = t.table_name
+             WHERE t.table_schema = {_quote_string_literal(schema)}
+            GROUP BY t.table_name
+                   , t.table_type
+            """
+        with connection.connection.cursor() as cur:
+            cur.execute(operation=s)
+            return cur.fetchall()
+
+    @reflection.cache
+    def _get_snapshot_tables(self, connection: "Connection", schema: str, **kw: Any) -> Dict[str, SnapshotTable]:
+        """Return the tables and views of a schema, with their columns - from the schema snapshot, once it has been
+        checked against the server (and the tables which changed refreshed).
+
+        The check is made once per reflection pass (an inspector's ``info_cache``), whatever the catalog cache's TTL.
+        """
+        def load_snapshot_tables() -> Dict[str, SnapshotTable]:
+            tables = self.schema_snapshot.refresh(schema,
+                                                  self._get_schema_fingerprints(connection, schema),
+                                                  lambda table_names: self._get_raw_columns(connection, schema,
+                                                                                            table_names))
+            try:
+                self.schema_snapshot.save()
+            except OSError as e:
+                warnings.warn(f"Could not save the schema snapshot to {self.schema_snapshot.path}: {e}",
+                              TheseusWarning)
+            return tables
 
-        return schema_list
+        return self.catalog_cache.get_or_load(("snapshot", schema), load_snapshot_tables)
 
     def get_table_names(
             self,
@@ -248,14 +576,9 @@ class TheseusDialect(DefaultDialect):
             include: Optional[Any] = None,
             **kw: Any,
     ) -> Any:
-        table_list = []
-        object_hierarchy = connection.connection.adbc_get_objects().read_all().to_pylist()
-        for catalog_obj in object_hierarchy:
-            for schema_obj in catalog_obj.get("catalog_db_schemas"):
-                if schema_obj.get("db_schema_name") == (schema if schema is not None else "session"):
-                    table_list = [table.get("table_name") for table in schema_obj.get("db_schema_tables")]
-
-        return table_list
+        return [table_name for table_name, table_type
+                in self._get_schema_objects(connection, schema, info_cache=kw.get("info_cache")).items()
+                if table_type != "VIEW"]
 
     def get_columns(
             self,
@@ -264,62 +587,116 @@ class TheseusDialect(DefaultDialect):
             schema: Optional[str] = None,
             **kw: Any,
     ) -> List[ReflectedColumn]:
+        schema = schema if schema is not None else "session"
+        if self.schema_snapshot.enabled:
+            table = self._get_snapshot_tables(connection, schema, info_cache=kw.get("info_cache")).get(table_name)
+            rs = table.columns if table is not None else []
+        else:
+            rs = self._get_raw_columns(connection, schema, [table_name]).get(table_name, [])
+
+        return [self._reflected_column(*row) for row in rs]
+
+    def _get_raw_columns(self, connection: "Connection", schema: str, table_names: Optional[List[str]]
+                         ) -> Dict[str, List[RawColumn]]:
+        """Return the columns (as the catalog reports them) of the given tables of a schema - or of every table in
+        it - with a single information_schema query."""
+        table_filter = ""
+        if table_names is not None:
+            if not table_names:
+                return {}
+            table_filter = f"AND table_name IN ({', '.join(_quote_string_literal(name) for name in table_names)})"
+
         s = f"""
-            SELECT column_name
+            SELECT table_name
+                 , column_name
                  , data_type
                  , is_nullable
                  , column_default
               FROM information_schema.columns
-             WHERE table_schema = '{schema if schema is not None else "session"}'
-               AND table_name = '{table_name}'
-            ORDER BY ordinal_position ASC
+             WHERE table_schema = {_quote_string_literal(schema)}
+               {table_filter}
+            ORDER BY table_name ASC
+                   , ordinal_position ASC
             """
         with connection.connection.cursor() as cur:
             cur.execute(operation=s)
             rs = cur.fetchall()
 
-        columns = []
-        for column_name, data_type, is_nullable, column_default in rs:
-            columns.append(ReflectedColumn(name=column_name,
-                                           type=self._get_column_type(data_type=data_type),
-                                           nullable=(is_nullable == "YES"),
-                                           default=column_default
-                                           )
-                           )
-
+        columns: Dict[str, List[RawColumn]] = {}
+        for table_name, *column in rs:
+            columns.setdefault(table_name, []).append(tuple(column))
         return columns
 
-    @staticmethod
-    def _get_column_type(data_type: str):
-        # Map database-specific data types to SQLAlchemy types
-        if data_type == 'VARCHAR':
-            return sqltypes.String
-        elif data_type == 'INTEGER':
-            return sqltypes.Integer
-        elif data_type == 'DATE':
-            return sqltypes.Date
-        elif data_type == 'DATETIME':
-            return sqltypes.DateTime
-        elif data_type == "TIMESTAMP":
-            return sqltypes.TIMESTAMP
-        elif data_type == "TIME":
-            return sqltypes.TIME
-        elif data_type == "BIGINT":
-            return sqltypes.BigInteger
-        elif data_type == "TINYINT":
-            return sqltypes.SmallInteger
-        elif re.match(pattern="^DECIMAL", string=data_type):
-            return sqltypes.Numeric
-        elif data_type == "DOUBLE":
-            return sqltypes.Float
-        elif data_type == "BOOLEAN":
-            return sqltypes.Boolean
+    def _reflected_column(self, column_name: str, data_type: str, is_nullable: str, column_default: Optional[str]
+                          ) -> ReflectedColumn:
+        return ReflectedColumn(name=column_name,
+                               type=self._get_column_type(data_type=data_type),
+                               nullable=(is_nullable == "YES"),
+                               default=column_default
+                               )
+
+    def _get_multi_table_names(
+            self,
+            connection: "Connection",
+            schema: Optional[str],
+            filter_names: Optional[Collection[str]],
+            kind: ObjectKind,
+            scope: ObjectScope,
+            **kw: Any,
+    ) -> List[str]:
+        # Theseus has no temporary tables - everything lives in the default scope
+        if ObjectScope.DEFAULT not in scope:
+            return []
+
+        table_names = []
+        if ObjectKind.TABLE in kind:
+            table_names.extend(self.get_table_names(connection, schema=schema, **kw))
+        if ObjectKind.VIEW in kind:
+            table_names.extend(self.get_view_names(connection, schema=schema, **kw))
+
+        if filter_names is not None:
+            filter_names = set(filter_names)
+            table_names = [table_name for table_name in table_names if table_name in filter_names]
+        return list(dict.fromkeys(table_names))
+
+    def get_multi_columns(
+            self,
+            connection: "Connection",
+            schema: Optional[str] = None,
+            filter_names: Optional[Collection[str]] = None,
+            kind: ObjectKind = ObjectKind.TABLE,
+            scope: ObjectScope = ObjectScope.DEFAULT,
+            **kw: Any,
+    ) -> Iterable[Tuple[Tuple[Optional[str], str], List[ReflectedColumn]]]:
+        if ObjectScope.DEFAULT not in scope:
+            return []
+
+        # Reflect the columns of every requested table with a single information_schema query (or from the schema
+        # snapshot).  When the caller names the tables (as MetaData.reflect does) they already are of the requested
+        # kind.
+        if filter_names is not None:
+            table_names = list(filter_names)
+        elif kind == ObjectKind.ANY:
+            table_names = None
         else:
-            # Try a catch-all for any other data types
-            try:
-                return getattr(sqltypes, data_type)
-            except AttributeError:
-                raise ValueError(f"Unsupported column type: {data_type}")
+            table_names = self._get_multi_table_names(connection, schema, filter_names, kind, scope, **kw)
+
+        schema_name = schema if schema is not None else "session"
+        if self.schema_snapshot.enabled:
+            tables = self._get_snapshot_tables(connection, schema_name, info_cache=kw.get("info_cache"))
+            if table_names is not None:
+                tables = {table_name: tables[table_name] for table_name in set(table_names) if table_name in tables}
+            raw_columns = {table_name: table.columns for table_name, table in tables.items()}
+        else:
+            raw_columns = self._get_raw_columns(connection, schema_name, table_names)
+
+        return [((schema, table_name), [self._reflected_column(*column) for column in columns])
+                for table_name, columns in sorted(raw_columns.items())]
+
+    @staticmethod
+    def _get_column_type(data_type: str) -> sqltypes.TypeEngine:
+        # Map database-specific data types to SQLAlchemy types (parsed once per distinct data type)
+        return reflected_type(data_type)
 
     def get_view_names(
             self,
@@ -328,18 +705,9 @@ class TheseusDialect(DefaultDialect):
             include: Optional[Any] = None,
             **kw: Any,
     ) -> Any:
-        s = f"""
-             SELECT table_name
-               FROM information_schema.tables
-              WHERE table_type = 'VIEW'
-                AND table_schema = '{schema if schema is not None else "session"}' 
-              ORDER BY 1
-              """
-        with connection.connection.cursor() as cur:
-            cur.execute(operation=s)
-            rs = cur.fetchall()
-
-        return [row[0] for row in rs]
+        return sorted(table_name for table_name, table_type
+                      in self._get_schema_objects(connection, schema, info_cache=kw.get("info_cache")).items()
+                      if table_type == "VIEW")
 
     def has_table(
         self,
@@ -348,17 +716,8 @@ class TheseusDialect(DefaultDialect):
         schema: Optional[str] = None,
         **kw: Any,
     ) -> bool:
-        s = f"""
-            SELECT 1
-              FROM information_schema.tables
-             WHERE table_schema = '{schema if schema is not None else "session"}'
-               AND table_name = '{table_name}'
-            """
-        with connection.connection.cursor() as cur:
-            cur.execute(operation=s)
-            row = cur.fetchone()
-
-        return row is not None
+        return table_name in self._get_schema_objects(connection, schema, table_name=table_name,
+                                                      info_cache=kw.get("info_cache"))
 
     def get_pk_constraint(
             self,
@@ -411,3 +770,32 @@ class TheseusDialect(DefaultDialect):
             TheseusWarning,
         )
         return []
+
+    def _get_multi_unsupported(self, object_description: str) -> list:
+        # Theseus has no constraints/indices to reflect - warn once per reflection, rather than once per table
+        warnings.warn(
+            f"Theseus Flight SQL ADBC SQLAlchemy driver doesn't support reflection on {object_description}",
+            TheseusWarning,
+        )
+        return []
+
+    def get_multi_pk_constraint(self, connection: "Connection", **kw: Any) -> list:
+        return self._get_multi_unsupported("Primary Key Constraints")
+
+    def get_multi_foreign_keys(self, connection: "Connection", **kw: Any) -> list:
+        return self._get_multi_unsupported("Foreign Key Constraints")
+
+    def get_multi_check_constraints(self, connection: "Connection", **kw: Any) -> list:
+        return self._get_multi_unsupported("Check Constraints")
+
+    def get_multi_indexes(self, connection: "Connection", **kw: Any) -> list:
+        return self._get_multi_unsupported("indices")
+
+    def get_multi_unique_constraints(self, connection: "Connection", **kw: Any) -> list:
+        return []
+
+    def get_multi_table_comment(self, connection: "Connection", **kw: Any) -> list:
+        return []
+
+    def get_multi_table_options(self, connection: "Connection", **kw: Any) -> list:
+        return []
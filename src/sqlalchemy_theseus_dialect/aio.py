@@ -0,0 +1,371 @@
+# This module holds the asyncio variant of the Theseus dialect (``theseus+async://``).
+import asyncio
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, List, Mapping, Optional, Sequence, TypeVar
+
+import pyarrow as pa
+from sqlalchemy import pool
+from sqlalchemy.engine import AdaptedConnection
+from sqlalchemy.engine.url import URL
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.util.concurrency import await_only, greenlet_spawn, in_greenlet
+
+from . import TheseusDialect
+from .cursor import ConnectionWrapper, CursorWrapper, StreamingCursorWrapper
+from .instrumentation import QueryTimings
+from .rows import arrow_rows
+
+T = TypeVar("T")
+
+
+class AsyncConnectionWrapper(AdaptedConnection):
+    """Adapts a :class:`ConnectionWrapper` for asyncio.
+
+    Every (blocking) ADBC call is run on the engine's thread pool, and awaited from SQLAlchemy's greenlet - so the
+    event loop keeps running while the server works.  If the awaiting coroutine is cancelled while a cursor's call
+    is in progress, the cursor's statement is cancelled on the server too (its execution, or the fetch of its
+    result) - and the call is let to unwind before the coroutine's cancellation goes on.
+
+    Outside of a greenlet (e.g. pool pre-warming at engine creation) calls simply run in the calling thread.
+    """
+
+    def __init__(self, connection: ConnectionWrapper, executor: ThreadPoolExecutor) -> None:
+        self._connection = connection
+        self._executor = executor
+
+    async def run_in_executor(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self._run(None, functools.partial(fn, *args, **kwargs))
+
+    def await_(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return self._await(None, functools.partial(fn, *args, **kwargs))
+
+    async def _run(self, cursor: Optional[CursorWrapper], call: Callable[[], T]) -> T:
+        future = self._executor.submit(call)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if not future.done():
+                # The driver only interrupts a running statement through the statement itself - a connection-level
+                # cancel leaves it to run to completion
+                try:
+                    if cursor is not None:
+                        cursor.cancel()
+                    else:
+                        self._connection.adbc_cancel()
+                except Exception:
+                    # The call may have just finished (or failed) - it's waited for all the same
+                    pass
+                # Let the interrupted call unwind before the connection is used (or returned to the pool) again -
+                # its (cancellation) error is the coroutine's to drop
+                unwound = asyncio.wrap_future(future)
+                await asyncio.wait([unwound])
+                if not unwound.cancelled():
+                    unwound.exception()
+            raise
+
+    def _await(self, cursor: Optional[CursorWrapper], call: Callable[[], T]) -> T:
+        if not in_greenlet():
+            return call()
+        return await_only(self._run(cursor, call))
+
+    def cursor(self, server_side: bool = False, prefetch_batches: Optional[int] = None) -> "AsyncCursorWrapper":
+        cursor = self._connection.cursor(server_side=server_side, prefetch_batches=prefetch_batches)
+        if server_side:
+            return AsyncStreamingCursorWrapper(self, cursor)
+        return AsyncCursorWrapper(self, cursor)
+
+    def commit(self) -> None:
+        self.await_(self._connection.commit)
+
+    def rollback(self) -> None:
+        self.await_(self._connection.rollback)
+
+    def close(self) -> None:
+        self.await_(self._connection.close)
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._connection, name)
+        if not (name.startswith("adbc_") and callable(attribute)):
+            return attribute
+
+        @functools.wraps(attribute)
+        def call(*args: Any, **kwargs: Any) -> Any:
+            # Metadata calls (adbc_get_objects etc.) hand back a reader - read it on the worker thread too
+            def read() -> Any:
+                result = attribute(*args, **kwargs)
+                if isinstance(result, pa.RecordBatchReader):
+                    result = result.read_all().to_reader()
+                return result
+
+            return self.await_(read)
+
+        return call
+
+
+class AsyncCursorWrapper:
+    """Adapts a :class:`CursorWrapper` for asyncio.
+
+    The statement runs - and its whole result is read, as Arrow - on the worker thread, so fetching rows afterwards
+    never blocks the event loop.  Rows are only built from the Arrow result when they are fetched, a record batch
+    at a time (so a result spilled to disk is never held as Python rows all at once).
+    """
+
+    server_side = False
+
+    def __init__(self, adapt_connection: AsyncConnectionWrapper, cursor: CursorWrapper) -> None:
+        self._adapt_connection = adapt_connection
+        self._cursor = cursor
+        self._table: Optional[pa.Table] = None
+        self._batches: Optional[Iterator[pa.RecordBatch]] = None
+        # The rows of the current batch, the next of them to fetch, and the number of rows fetched in all
+        self._rows: List[tuple] = []
+        self._next_row = 0
+        self._position = 0
+        self._soft_closed = False
+        self._description = None
+
+    @property
+    def description(self):
+        return self._description if self._soft_closed else self._cursor.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def arraysize(self) -> int:
+        return self._cursor.arraysize
+
+    @arraysize.setter
+    def arraysize(self, value: int) -> None:
+        self._cursor.arraysize = value
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def apply_execution_options(self,
+                                execution_options: Mapping[str, Any],
+                                query_timings: Optional[QueryTimings] = None,
+                                parameter_types: Optional[Sequence[Any]] = None,
+                                ) -> None:
+        self._cursor.apply_execution_options(execution_options,
+                                             query_timings=query_timings,
+                                             parameter_types=parameter_types)
+
+    async def _run_in_executor(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self._adapt_connection._run(self._cursor, functools.partial(fn, *args, **kwargs))
+
+    def _await(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return self._adapt_connection._await(self._cursor, functools.partial(fn, *args, **kwargs))
+
+    def _reset(self) -> None:
+        self._soft_closed = False
+        self._table = None
+        self._batches = None
+        self._rows = []
+        self._next_row = 0
+        self._position = 0
+
+    def _execute(self, operation, parameters) -> None:
+        self._cursor.execute(operation, parameters)
+        if self._cursor.description is not None:
+            self._table = self._cursor.fetch_arrow_table()
+
+    def execute(self, operation, parameters=None) -> None:
+        self._reset()
+        self._await(self._execute, operation, parameters)
+
+    def executemany(self, operation, seq_of_parameters) -> None:
+        self._reset()
+        self._await(self._cursor.executemany, operation, seq_of_parameters)
+
+    def adbc_ingest(self, *args: Any, **kwargs: Any) -> int:
+        return self._await(self._cursor.adbc_ingest, *args, **kwargs)
+
+    def _read_next_batch(self) -> bool:
+        if self._batches is None:
+            if self._table is None:
+                return False
+            self._batches = iter(self._table.to_batches())
+        self._rows = []
+        self._next_row = 0
+        for batch in self._batches:
+            if batch.num_rows > 0:
+                self._rows = arrow_rows(batch)
+                return True
+        return False
+
+    def fetchone(self) -> Optional[tuple]:
+        if self._next_row >= len(self._rows) and not self._read_next_batch():
+            return None
+        self._next_row += 1
+        self._position += 1
+        return self._rows[self._next_row - 1]
+
+    def fetchmany(self, size: Optional[int] = None) -> List[tuple]:
+        if size is None:
+            size = self.arraysize
+        rows = []
+        while len(rows) < size:
+            if self._next_row >= len(self._rows) and not self._read_next_batch():
+                break
+            chunk = self._rows[self._next_row:self._next_row + size - len(rows)]
+            self._next_row += len(chunk)
+            rows.extend(chunk)
+        self._position += len(rows)
+        return rows
+
+    def fetchall(self) -> List[tuple]:
+        rows = self._rows[self._next_row:]
+        while self._read_next_batch():
+            rows.extend(self._rows)
+        self._rows = []
+        self._next_row = 0
+        self._position += len(rows)
+        return rows
+
+    def fetch_arrow_table(self) -> pa.Table:
+        if self._table is None:
+            return self._cursor.fetch_arrow_table()
+        table = self._table.slice(self._position)
+        self._reset()
+        return table
+
+    def fetch_record_batch(self) -> pa.RecordBatchReader:
+        return self.fetch_arrow_table().to_reader()
+
+    async def _async_soft_close(self) -> None:
+        # Called by SQLAlchemy's asyncio extension once a buffered result is handed back - the rows are already
+        # read, so the statement can go back to the connection's cache
+        if self.server_side or self._soft_closed:
+            return
+        self._description = self._cursor.description
+        self._soft_closed = True
+        await self._run_in_executor(self._cursor.close)
+
+    def close(self) -> None:
+        soft_closed = self._soft_closed
+        self._reset()
+        if not soft_closed:
+            self._await(self._cursor.close)
+
+    def __enter__(self) -> "AsyncCursorWrapper":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class AsyncStreamingCursorWrapper(AsyncCursorWrapper):
+    """Adapts a :class:`StreamingCursorWrapper` for asyncio - each record batch is read on the worker thread."""
+
+    server_side = True
+    _cursor: StreamingCursorWrapper
+
+    def execute(self, operation, parameters=None) -> None:
+        self._await(self._cursor.execute, operation, parameters)
+
+    def fetchone(self) -> Optional[tuple]:
+        # Rows of the batch already read are served without a round trip to the worker thread
+        if self._cursor.buffered_rows:
+            return self._cursor.fetchone()
+        return self._await(self._cursor.fetchone)
+
+    def fetchmany(self, size: Optional[int] = None) -> List[tuple]:
+        return self._await(self._cursor.fetchmany, size)
+
+    def fetchall(self) -> List[tuple]:
+        return self._await(self._cursor.fetchall)
+
+    def fetch_arrow_table(self) -> pa.Table:
+        return self._await(self._cursor.fetch_arrow_table)
+
+    def fetch_record_batch(self) -> pa.RecordBatchReader:
+        return self._await(self._cursor.fetch_arrow_table).to_reader()
+
+    async def record_batches(self) -> AsyncIterator[pa.RecordBatch]:
+        reader = await self._run_in_executor(self._cursor.fetch_record_batch)
+        batches = iter(reader)
+        while True:
+            # (StopIteration can't be raised through a future - so the end of the stream is signalled with None)
+            batch = await self._run_in_executor(next, batches, None)
+            if batch is None:
+                return
+            yield batch
+
+
+class TheseusAsyncDialect(TheseusDialect):
+    """The Theseus dialect for SQLAlchemy's asyncio extension (``create_async_engine("theseus+async://...")``).
+
+    The ADBC driver is blocking, so its calls run on a per-engine thread pool of ``asyncWorkers`` threads
+    (URL query parameter) - awaiting coroutines do not hold a thread, only calls in progress on the server do.
+    """
+
+    driver = "async"
+    is_async = True
+    supports_server_side_cursors = True
+    # (SQLAlchemy only trusts a dialect's statement cache if each subclass declares it)
+    supports_statement_cache = True
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.async_workers: Optional[int] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def create_connect_args(self, url):
+        async_workers = url.query.get('asyncWorkers')
+        if async_workers is not None:
+            self.async_workers = int(async_workers)
+            url = url.difference_update_query(['asyncWorkers'])
+        return super().create_connect_args(url)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._databases_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.async_workers, thread_name_prefix="theseus-adbc")
+                weakref.finalize(self, self._executor.shutdown, wait=False)
+            return self._executor
+
+    def connect(self, *args, **kwargs) -> AsyncConnectionWrapper:
+        executor = self._get_executor()
+        connect = functools.partial(super().connect, *args, **kwargs)
+        if in_greenlet():
+            connection = await_only(asyncio.wrap_future(executor.submit(connect)))
+        else:
+            connection = connect()
+        return AsyncConnectionWrapper(connection, executor)
+
+    @classmethod
+    def import_dbapi(cls):
+        return super().import_dbapi()
+
+    @classmethod
+    def get_pool_class(cls, url: URL):
+        return pool.AsyncAdaptedQueuePool
+
+    def get_driver_connection(self, connection):
+        return connection._connection
+
+
+async def stream_record_batches(connection: AsyncConnection,
+                                statement: Any,
+                                parameters: Optional[Mapping[str, Any]] = None,
+                                execution_options: Optional[Mapping[str, Any]] = None,
+                                ) -> AsyncIterator[pa.RecordBatch]:
+    """Run a statement on a ``theseus+async`` connection, and stream its result as Arrow record batches.
+
+    Usage: ``async for batch in stream_record_batches(conn, select(my_table)): ...``
+    """
+    result = await greenlet_spawn(connection.sync_connection.execute,
+                                  statement,
+                                  parameters,
+                                  execution_options={**(execution_options or {}), "stream_results": True}
+                                  )
+    try:
+        async for batch in result.cursor.record_batches():
+            yield batch
+    finally:
+        await greenlet_spawn(result.close)
@@ -0,0 +1,48 @@
+# This module holds the per-engine cache of catalog (schema/table) lookups.
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_CATALOG_CACHE_TTL = 30.0
+
+
+class CatalogCache:
+    """A TTL cache for catalog lookups (schema names, and the tables/views in a schema).
+
+    Entries are keyed by ``("schemas",)``, ``("tables", <schema name>)`` or (for an engine with a schema snapshot)
+    ``("snapshot", <schema name>)``.  A ``ttl`` of zero (or less) disables caching - every lookup then goes to the
+    server.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CATALOG_CACHE_TTL) -> None:
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+
+        value = loader()
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+        return value
+
+    def invalidate(self, schema: Optional[str] = None) -> None:
+        """Drop the cached lookups for one schema - or for every schema, if none is given."""
+        with self._lock:
+            if schema is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(("schemas",), None)
+                self._entries.pop(("tables", schema), None)
+                self._entries.pop(("snapshot", schema), None)
@@ -0,0 +1,68 @@
+# This module holds the SQL statement compiler for the Theseus dialect.
+import time
+
+from sqlalchemy import types as sqltypes
+from sqlalchemy.sql import compiler
+
+# The sampling methods Theseus implements; a tablesample() with any other (e.g. a plain percentage, which
+# SQLAlchemy turns into ``system(...)``) is rendered as given
+_SAMPLE_METHODS = frozenset(("system", "bernoulli", "reservoir"))
+
+
+class TheseusCompiler(compiler.SQLCompiler):
+    def __init__(self, *args, **kwargs) -> None:
+        started = time.perf_counter()
+        super().__init__(*args, **kwargs)
+        # Reported in the statement's query timings (compiled statements are cached, so this is paid once)
+        self.compile_seconds = time.perf_counter() - started
+        # The Arrow types executemany parameter sets are bound as - worked out by the first such execution
+        self.parameter_types = None
+
+    def visit_tablesample(self, tablesample, asfrom=False, **kw):
+        method = tablesample._get_method()
+        # Theseus only accepts constants in the sample clause - they are rendered inline at execution time
+        literal_kw = dict(kw, literal_execute=True)
+        if method.name == "sample_rows":
+            sample = "reservoir(%s ROWS)" % self.process(method.clauses, **literal_kw)
+        elif method.name.lower() in _SAMPLE_METHODS:
+            sample = "%s(%s PERCENT)" % (method.name, self.process(method.clauses, **literal_kw))
+        else:
+            sample = method._compiler_dispatch(self, **kw)
+
+        text = "%s TABLESAMPLE %s" % (self.visit_alias(tablesample, asfrom=True, **kw), sample)
+        if tablesample.seed is not None:
+            text += " REPEATABLE (%s)" % tablesample.seed._compiler_dispatch(self, **literal_kw)
+        return text
+
+    def visit_approx_percentile_func(self, fn, **kw):
+        expr, *fractions = fn.clauses.clauses
+        rendered = ", ".join(self.process(fraction, **kw) for fraction in fractions)
+        if isinstance(fn.type, sqltypes.ARRAY):
+            rendered = "[%s]" % rendered
+        return "approx_quantile(%s, %s)" % (self.process(expr, **kw), rendered)
+
+    def _compose_select_body(self, text, select, compile_state, inner_columns, froms, byfrom, toplevel, kwargs):
+        # (for an ORM statement, ``select`` is the Core statement built from it)
+        qualify = getattr(getattr(compile_state, "select_statement", select), "_qualify_criteria", ())
+        if not qualify:
+            return super()._compose_select_body(text, select, compile_state, inner_columns, froms, byfrom,
+                                                toplevel, kwargs)
+
+        # QUALIFY goes between HAVING and ORDER BY - so render everything before it, then it, then the rest
+        body = select._generate()
+        body._order_by_clauses = ()
+        body._limit_clause = body._offset_clause = body._fetch_clause = None
+        body._for_update_arg = None
+        text = super()._compose_select_body(text, body, compile_state, inner_columns, froms, byfrom, toplevel,
+                                            kwargs)
+
+        t = self._generate_delimited_and_list(qualify, **kwargs)
+        if t:
+            text += " \nQUALIFY " + t
+        if select._order_by_clauses:
+            text += self.order_by_clause(select, **kwargs)
+        if select._has_row_limiting_clause:
+            text += self._row_limit_clause(select, **kwargs)
+        if select._for_update_arg is not None:
+            text += self.for_update_clause(select, **kwargs)
+        return text
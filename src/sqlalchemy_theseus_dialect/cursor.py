@@ -0,0 +1,765 @@
+# This module holds the DB-API connection and cursor wrappers around the ADBC Flight SQL driver.
+import contextlib
+import itertools
+import threading
+import time
+import warnings
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import pyarrow as pa
+from adbc_driver_flightsql import dbapi as flight_sql, StatementOptions
+from adbc_driver_manager import AdbcStatement, AdbcStatusCode
+from adbc_driver_manager.dbapi import _RowIterator, _blocking_call
+
+from .endpoints import Endpoint
+from .instrumentation import QueryTimings
+from .parameters import parameter_table
+from .partitions import PartitionedResult
+from .result_cache import ResultCache, result_cache_key
+from .retry import Retrier, RetryPolicy, is_transient_error
+from .rows import arrow_rows
+from .spill import read_all
+from .statement_cache import PreparedStatementCache, DEFAULT_PREPARED_STATEMENT_CACHE_SIZE
+from .statements import is_idempotent_statement
+from .timeouts import WATCHDOG, Deadline, timeout_error, timeout_from
+
+# The number of record batches the driver reads ahead of a streaming (server-side) cursor
+DEFAULT_STREAM_PREFETCH_BATCHES = 2
+
+if TYPE_CHECKING:
+    from sqlalchemy.base import Connection
+
+
+class _BatchRowIterator(_RowIterator):
+    """Iterates over a result's rows - converting each record batch to rows as a whole, a column at a time."""
+
+    def __init__(self, stmt, reader: pa.RecordBatchReader) -> None:
+        super().__init__(stmt, reader)
+        self._batch: Optional[pa.RecordBatch] = None
+        self._rows: List[tuple] = []
+
+    def _read_next_batch(self) -> bool:
+        while True:
+            try:
+                batch = _blocking_call(self._reader.read_next_batch, (), {}, self._stmt.cancel)
+            except StopIteration:
+                self._finished = True
+                self._batch = None
+                self._rows = []
+                self._next_row = 0
+                return False
+            if batch.num_rows > 0:
+                break
+        self._batch = batch
+        self._rows = arrow_rows(batch)
+        self._next_row = 0
+        return True
+
+    def _take_remainder(self) -> Optional[pa.RecordBatch]:
+        # The rows of the current batch not fetched yet - handed over as Arrow, so they are not fetched as rows too
+        remainder = None
+        if self._batch is not None and self._next_row < len(self._rows):
+            remainder = self._batch.slice(self._next_row)
+        self._batch = None
+        self._rows = []
+        self._next_row = 0
+        return remainder
+
+    def unread_batches(self, reader: pa.RecordBatchReader) -> pa.RecordBatchReader:
+        """The rows not fetched yet, as a record batch stream - the rest of the current batch, then ``reader``."""
+        remainder = self._take_remainder()
+        if remainder is None:
+            return reader
+        return pa.RecordBatchReader.from_batches(reader.schema, itertools.chain([remainder], reader))
+
+    def fetch_arrow_table(self) -> pa.Table:
+        remainder = self._take_remainder()
+        table = super().fetch_arrow_table()
+        if remainder is None:
+            return table
+        return pa.Table.from_batches([remainder, *table.to_batches()], schema=table.schema)
+
+    def fetchone(self) -> Optional[tuple]:
+        if self._next_row >= len(self._rows) and (self._finished or not self._read_next_batch()):
+            return None
+        row = self._rows[self._next_row]
+        self._next_row += 1
+        self.rownumber += 1
+        return row
+
+    def fetchmany(self, size: int) -> List[tuple]:
+        rows = []
+        while len(rows) < size:
+            if self._next_row >= len(self._rows) and (self._finished or not self._read_next_batch()):
+                break
+            chunk = self._rows[self._next_row:self._next_row + size - len(rows)]
+            self._next_row += len(chunk)
+            rows.extend(chunk)
+        self.rownumber += len(rows)
+        return rows
+
+    def fetchall(self) -> List[tuple]:
+        rows = self._rows[self._next_row:]
+        while not self._finished and self._read_next_batch():
+            rows.extend(self._rows)
+        self._batch = None
+        self._rows = []
+        self._next_row = 0
+        self.rownumber += len(rows)
+        return rows
+
+
+class CursorWrapper(flight_sql.Cursor):
+    def __init__(self,
+                 *args,
+                 statement_cache: Optional[PreparedStatementCache] = None,
+                 retrier: Optional[Retrier] = None,
+                 result_cache: Optional[ResultCache] = None,
+                 endpoint: Optional[Endpoint] = None,
+                 statement_timeout: Optional[float] = None,
+                 spill_threshold: Optional[int] = None,
+                 spill_directory: Optional[str] = None,
+                 **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._statement_cache = statement_cache
+        # Whole results fetched as Arrow hold at most this many bytes in memory - the rest is spilled to disk
+        self.default_spill_threshold = spill_threshold
+        self.spill_threshold = spill_threshold
+        self.spill_directory = spill_directory
+        # The connection's default timeout, and this statement's (in seconds - None for no timeout)
+        self.statement_timeout = statement_timeout
+        self.timeout = statement_timeout
+        self.timed_out = False
+        self._deadline: Optional[Deadline] = None
+        self._statements_started = 0
+        self._deadline_lock = threading.Lock()
+        # A cancelled statement is not handed back to the statement cache
+        self._cancelled = False
+        # The gateway endpoint of the connection (on a load-balanced engine), and whether it counts a query of ours
+        self.endpoint = endpoint
+        self._query_open = False
+        self.retrier = retrier or Retrier()
+        self.result_cache = result_cache
+        # Per-statement overrides (set from execution options by the execution context)
+        self.retry_policy: Optional[RetryPolicy] = None
+        self.idempotent: Optional[bool] = None
+        self.parallel_fetch: Optional[int] = None
+        self.parallel_fetch_ordered = True
+        self.use_result_cache: Optional[bool] = None
+        self.result_cache_ttl: Optional[float] = None
+        self.query_timings: Optional[QueryTimings] = None
+        # The Arrow types of the statement's parameters (None where they are inferred from the values)
+        self.parameter_types: Optional[Sequence[Optional[pa.DataType]]] = None
+        self._partitioned_result: Optional[PartitionedResult] = None
+        # Set when the result is served from our own record batch stream, rather than the driver's
+        self._result_reader: Optional[pa.RecordBatchReader] = None
+
+    def apply_execution_options(self,
+                                execution_options: Mapping[str, Any],
+                                query_timings: Optional[QueryTimings] = None,
+                                parameter_types: Optional[Sequence[Optional[pa.DataType]]] = None,
+                                ) -> None:
+        """Pick up the per-statement settings from a statement's execution options."""
+        self.query_timings = query_timings
+        self.parameter_types = parameter_types
+        self.retry_policy = self.retrier.policy.with_execution_options(execution_options)
+        self.idempotent = execution_options.get("idempotent")
+        self.parallel_fetch = execution_options.get("parallel_fetch")
+        self.parallel_fetch_ordered = execution_options.get("parallel_fetch_ordered", True)
+        self.use_result_cache = execution_options.get("result_cache")
+        self.result_cache_ttl = execution_options.get("result_cache_ttl")
+        self.timeout = timeout_from(execution_options.get("timeout", self.statement_timeout))
+        self.spill_threshold = execution_options.get("spill_threshold", self.default_spill_threshold)
+
+    def _lease_statement(self, operation: Union[bytes, str]) -> None:
+        # Swap in a statement the connection already prepared for this SQL text (if there is one)
+        if self._statement_cache is None or not isinstance(operation, str) or operation == self._last_query:
+            return
+
+        self._release_statement()
+        statement = self._statement_cache.checkout(operation)
+        if statement is not None:
+            self._stmt.close()
+            self._stmt = statement
+            # The ADBC cursor skips the prepare step when the query text is unchanged
+            self._last_query = operation
+
+    def _release_statement(self, reopen: bool = True) -> None:
+        # Hand the prepared statement back to the connection's cache, so later cursors can re-bind it
+        if self._statement_cache is None or not isinstance(self._last_query, str):
+            return
+
+        if self._results is not None:
+            self._results.close()
+            self._results = None
+        self._statement_cache.checkin(self._last_query, self._stmt)
+        self._last_query = None
+        if reopen:
+            self._stmt = AdbcStatement(self._conn._conn)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+
+        self._disarm_timeout()
+        self._close_partitioned_result()
+        self._finish_query()
+        if self.query_timings is not None:
+            self.query_timings.complete()
+        if self._statement_cache is not None and isinstance(self._last_query, str) and not self._cancelled:
+            self._release_statement(reopen=False)
+            self._closed = True
+        else:
+            super().close()
+
+    def _discard_statement(self) -> None:
+        # Never reuse (or cache) a statement that failed - the next attempt prepares a fresh one
+        self._last_query = None
+        self._results = None
+        # (not while the watchdog may be cancelling it)
+        with self._deadline_lock:
+            try:
+                self._stmt.close()
+            except Exception:
+                # e.g. the server is unreachable, so its prepared statement can't be released - nothing more to do
+                pass
+            self._stmt = AdbcStatement(self._conn._conn)
+
+    def _execute_partitioned(self, operation: Union[bytes, str], parameters=None) -> None:
+        # Read each endpoint of the result on its own thread, rather than one after another on a single stream
+        partitions, schema = self.adbc_execute_partitions(operation, parameters)
+        self._partitioned_result = PartitionedResult(self._conn,
+                                                     partitions,
+                                                     schema if schema is not None else pa.schema([]),
+                                                     max_workers=int(self.parallel_fetch),
+                                                     ordered=self.parallel_fetch_ordered
+                                                     )
+        self._set_result_reader(self._partitioned_result.reader)
+
+    def _set_result_reader(self, reader: pa.RecordBatchReader) -> None:
+        self._result_reader = reader
+        self._results = _BatchRowIterator(self._stmt, reader)
+
+    def _close_partitioned_result(self) -> None:
+        if self._partitioned_result is not None:
+            self._partitioned_result.close()
+            self._partitioned_result = None
+
+    def _prepare_execute(self, operation, parameters=None) -> None:
+        if self.query_timings is None:
+            return super()._prepare_execute(operation, parameters)
+        started = time.perf_counter()
+        super()._prepare_execute(operation, parameters)
+        self.query_timings.prepare_seconds += time.perf_counter() - started
+
+    def _execute_once(self, operation: Union[bytes, str], parameters=None) -> None:
+        self._check_timeout()
+        if self.query_timings is not None:
+            self.query_timings.attempts += 1
+        self._close_partitioned_result()
+        self._result_reader = None
+        self._lease_statement(operation)
+        try:
+            if self.parallel_fetch:
+                self._execute_partitioned(operation, parameters)
+            else:
+                super().execute(operation=operation, parameters=parameters)
+                self._results = _BatchRowIterator(self._stmt, self._results._reader)
+        except Exception as e:
+            self._discard_statement()
+            self._check_timeout(e)
+            raise
+
+    def _executemany_once(self, operation: Union[bytes, str], seq_of_parameters) -> None:
+        self._check_timeout()
+        if self.query_timings is not None:
+            self.query_timings.attempts += 1
+        self._lease_statement(operation)
+        try:
+            super().executemany(operation=operation, seq_of_parameters=seq_of_parameters)
+        except Exception as e:
+            self._discard_statement()
+            self._check_timeout(e)
+            raise
+
+    def fetch_record_batch(self) -> pa.RecordBatchReader:
+        if self._result_reader is not None and self._results is not None:
+            reader = self._result_reader
+        else:
+            reader = super().fetch_record_batch()
+        if isinstance(self._results, _BatchRowIterator):
+            # Some rows may have been fetched already
+            return self._results.unread_batches(reader)
+        return reader
+
+    def fetch_arrow_table(self) -> pa.Table:
+        if not self.spill_threshold:
+            return super().fetch_arrow_table()
+        return read_all(self.fetch_record_batch(), self.spill_threshold, directory=self.spill_directory)
+
+    def _result_cache_key(self, operation: Union[bytes, str], parameters=None) -> Optional[Hashable]:
+        # Read-only statements are cached (if the engine has a result cache) unless they opt out - others must opt in
+        if self.result_cache is None or not self.result_cache.enabled:
+            return None
+        if not (self.use_result_cache if self.use_result_cache is not None else is_idempotent_statement(operation)):
+            return None
+        return result_cache_key(operation, parameters)
+
+    def _execute_statement(self, operation: Union[bytes, str], parameters=None) -> None:
+        cache_key = self._result_cache_key(operation, parameters)
+        if cache_key is not None:
+            table = self.result_cache.get(cache_key)
+            if table is not None:
+                self._close_partitioned_result()
+                if self._results is not None:
+                    self._results.close()
+                self._rowcount = -1
+                self._set_result_reader(table.to_reader())
+                if self.query_timings is not None:
+                    self.query_timings.cached = True
+                return
+
+        self.retrier.call(self._execute_once,
+                          operation,
+                          parameters,
+                          idempotent=self.idempotent if self.idempotent is not None
+                          else is_idempotent_statement(operation),
+                          policy=self.retry_policy
+                          )
+        if cache_key is not None and self._results is not None:
+            self._set_result_reader(self.result_cache.caching_reader(cache_key,
+                                                                     CursorWrapper.fetch_record_batch(self),
+                                                                     ttl=self.result_cache_ttl
+                                                                     ))
+
+    def _finish_query(self) -> None:
+        if self._query_open:
+            self._query_open = False
+            self.endpoint.query_finished()
+
+    @contextlib.contextmanager
+    def _endpoint_query(self) -> Iterator[None]:
+        # A query is outstanding on its endpoint from its execution until the cursor is closed (i.e. its result
+        # has been read), and a transport failure counts against the endpoint's health
+        if self.endpoint is None:
+            yield
+            return
+        if not self._query_open:
+            self._query_open = True
+            self.endpoint.query_started()
+        try:
+            yield
+        except Exception as e:
+            self._finish_query()
+            if is_transient_error(e):
+                self.endpoint.record_failure()
+            raise
+
+    @property
+    def in_flight(self) -> bool:
+        """Whether the cursor has a result which has not been read to the end - i.e. it may still hold work on
+        the server."""
+        return isinstance(self._results, _BatchRowIterator) and not self._results._finished
+
+    def cancel(self) -> None:
+        """Cancel the cursor's statement on the server - its execution, or the fetch of its result."""
+        self._cancelled = True
+        if self._partitioned_result is not None:
+            self._partitioned_result.cancel()
+        self._stmt.cancel()
+
+    def _start_statement(self) -> None:
+        if self._cancelled:
+            # A cancelled statement is not reused - the next execution prepares a fresh one
+            self._discard_statement()
+            self._cancelled = False
+        self._arm_timeout()
+
+    def _arm_timeout(self) -> None:
+        # The timeout covers the statement from its execution (including any retries) until its result has been
+        # read, or the cursor closed
+        self._disarm_timeout()
+        self.timed_out = False
+        self._statements_started += 1
+        if self.timeout:
+            self._deadline = WATCHDOG.schedule(self.timeout, CursorWrapper._on_timeout, weakref.ref(self),
+                                               self._statements_started)
+
+    def _disarm_timeout(self) -> None:
+        with self._deadline_lock:
+            if self._deadline is not None:
+                WATCHDOG.cancel(self._deadline)
+                self._deadline = None
+
+    @staticmethod
+    def _on_timeout(cursor_ref: "weakref.ref[CursorWrapper]", statement: int) -> None:
+        # (on the watchdog thread - an abandoned cursor is not kept alive just to be cancelled)
+        cursor = cursor_ref()
+        if cursor is None:
+            return
+        with cursor._deadline_lock:
+            # The cursor may have moved on to another statement (or been closed) just as the deadline passed
+            if cursor._deadline is None or cursor._statements_started != statement or cursor._closed:
+                return
+            cursor._deadline = None
+            cursor.timed_out = True
+            cursor.cancel()
+
+    def _check_timeout(self, error: Optional[BaseException] = None) -> None:
+        # Report a statement cancelled by its timeout as such - it is not a transient failure, to be retried
+        if self.timed_out:
+            raise timeout_error(self.timeout) from error
+
+    def _timeout_guarded(self, reader: pa.RecordBatchReader) -> pa.RecordBatchReader:
+        def batches() -> Iterator[pa.RecordBatch]:
+            source = iter(reader)
+            while True:
+                try:
+                    batch = next(source, None)
+                except Exception as e:
+                    self._check_timeout(e)
+                    raise
+                if batch is None:
+                    return
+                # (batches the driver read ahead are not served past the timeout either)
+                self._check_timeout()
+                yield batch
+
+        return pa.RecordBatchReader.from_batches(reader.schema, batches())
+
+    def execute(self, operation: Union[bytes, str], parameters=None) -> None:
+        self._start_statement()
+        try:
+            with self._endpoint_query():
+                self._execute_timed(operation, parameters)
+        except BaseException:
+            self._disarm_timeout()
+            raise
+        if self._deadline is not None:
+            if self._results is None:
+                self._disarm_timeout()
+            else:
+                self._set_result_reader(self._timeout_guarded(CursorWrapper.fetch_record_batch(self)))
+
+    def _execute_timed(self, operation: Union[bytes, str], parameters=None) -> None:
+        timings = self.query_timings
+        if timings is None:
+            return self._execute_statement(operation, parameters)
+
+        started = time.perf_counter()
+        self._execute_statement(operation, parameters)
+        timings.execute_seconds = time.perf_counter() - started - timings.prepare_seconds
+        if self._results is not None:
+            self._set_result_reader(timings.instrument_reader(CursorWrapper.fetch_record_batch(self)))
+        else:
+            timings.complete()
+
+    def executemany(self, operation: Union[bytes, str], seq_of_parameters) -> None:
+        # Bound parameter sets are (nearly always) writes - and may be a one-shot Arrow stream
+        started = time.perf_counter() if self.query_timings is not None else 0.0
+        if isinstance(seq_of_parameters, (list, tuple)) and seq_of_parameters and len(seq_of_parameters[0]):
+            # Bound column by column, as Arrow batches - rather than the driver inferring each column's type
+            seq_of_parameters = parameter_table(seq_of_parameters, self.parameter_types)
+        self._start_statement()
+        try:
+            with self._endpoint_query():
+                self.retrier.call(self._executemany_once,
+                                  operation,
+                                  seq_of_parameters,
+                                  idempotent=bool(self.idempotent),
+                                  policy=self.retry_policy
+                                  )
+        finally:
+            self._disarm_timeout()
+        if self.query_timings is not None:
+            self.query_timings.execute_seconds = time.perf_counter() - started - self.query_timings.prepare_seconds
+            self.query_timings.complete()
+
+
+class StreamingCursorWrapper(CursorWrapper):
+    """A server-side cursor which reads the result one record batch at a time.
+
+    Only the batch currently being consumed is held (as Python rows) on the client - it is released as soon
+    as its last row has been fetched - while the driver prefetches at most ``prefetch_batches`` further batches.
+    """
+
+    def __init__(self, *args, prefetch_batches: int = DEFAULT_STREAM_PREFETCH_BATCHES, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.prefetch_batches = prefetch_batches
+        self._reader: Optional[pa.RecordBatchReader] = None
+        self._batch: Optional[pa.RecordBatch] = None
+        self._batch_rows: List[tuple] = []
+        self._position = 0
+        self._exhausted = False
+        # Whether the result's stream was handed out (by fetch_record_batch) - it is read through that from then on
+        self._stream_handed_out = False
+
+    def _lease_statement(self, operation: Union[bytes, str]) -> None:
+        super()._lease_statement(operation)
+        self._stmt.set_options(**{StatementOptions.QUEUE_SIZE.value: str(self.prefetch_batches)})
+
+    @property
+    def buffered_rows(self) -> int:
+        """The number of rows of the current batch not fetched yet (fetching those needs no I/O)."""
+        return len(self._batch_rows) - self._position
+
+    def _release_batch(self) -> None:
+        self._batch = None
+        self._batch_rows = []
+        self._position = 0
+
+    @property
+    def in_flight(self) -> bool:
+        return (self._reader is not None or self._stream_handed_out) and not self._exhausted
+
+    def execute(self, operation: Union[bytes, str], parameters=None) -> None:
+        self._release_batch()
+        self._reader = None
+        self._exhausted = False
+        self._stream_handed_out = False
+        super().execute(operation=operation, parameters=parameters)
+        self._reader = super().fetch_record_batch()
+
+    def _read_next_batch(self) -> bool:
+        self._release_batch()
+        if self._reader is None:
+            raise flight_sql.ProgrammingError("Cannot fetch from a cursor before execute()",
+                                             status_code=AdbcStatusCode.INVALID_STATE)
+        while True:
+            try:
+                batch = self._reader.read_next_batch()
+            except StopIteration:
+                self._exhausted = True
+                return False
+            if batch.num_rows > 0:
+                break
+
+        self._batch = batch
+        self._batch_rows = arrow_rows(batch)
+        return True
+
+    def fetchone(self) -> Optional[tuple]:
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size: Optional[int] = None) -> List[tuple]:
+        if size is None:
+            size = self.arraysize
+        rows = []
+        while len(rows) < size:
+            if self._position >= len(self._batch_rows) and not self._read_next_batch():
+                break
+            chunk = self._batch_rows[self._position:self._position + size - len(rows)]
+            self._position += len(chunk)
+            rows.extend(chunk)
+        return rows
+
+    def fetchall(self) -> List[tuple]:
+        rows = self._batch_rows[self._position:]
+        while self._read_next_batch():
+            rows.extend(self._batch_rows)
+        self._release_batch()
+        return rows
+
+    def fetch_record_batch(self) -> pa.RecordBatchReader:
+        if self._reader is None:
+            raise flight_sql.ProgrammingError("Cannot fetch_record_batch() before execute()",
+                                             status_code=AdbcStatusCode.INVALID_STATE)
+        reader, self._reader = self._reader, None
+        self._stream_handed_out = True
+        batches: Iterator[pa.RecordBatch] = reader
+        if self._batch is not None and self._position < len(self._batch_rows):
+            # Hand back the rest of the batch being consumed, followed by the batches not read yet
+            batches = itertools.chain([self._batch.slice(self._position)], reader)
+        self._release_batch()
+        return pa.RecordBatchReader.from_batches(reader.schema, self._tracked_batches(batches))
+
+    def _tracked_batches(self, batches: Iterator[pa.RecordBatch]) -> Iterator[pa.RecordBatch]:
+        # The stream handed out stays in flight (so it is cancelled if it's abandoned) until it has been read to the
+        # end - unless the cursor has moved on to another statement meanwhile
+        statement = self._statements_started
+        yield from batches
+        if self._statements_started == statement:
+            self._exhausted = True
+
+    def fetch_arrow_table(self) -> pa.Table:
+        return read_all(self.fetch_record_batch(), self.spill_threshold, directory=self.spill_directory)
+
+    def close(self) -> None:
+        self._release_batch()
+        self._reader = None
+        self._stream_handed_out = False
+        super().close()
+
+
+class ConnectionWrapper:
+    __c: "Connection"
+    notices: List[str]
+    autocommit = None
+    closed = False
+
+    def __init__(self,
+                 c: flight_sql.Connection,
+                 prepared_statement_cache_size: int = DEFAULT_PREPARED_STATEMENT_CACHE_SIZE,
+                 stream_prefetch_batches: int = DEFAULT_STREAM_PREFETCH_BATCHES,
+                 retrier: Optional[Retrier] = None,
+                 result_cache: Optional[ResultCache] = None,
+                 endpoint: Optional[Endpoint] = None,
+                 statement_timeout: Optional[float] = None,
+                 spill_threshold: Optional[int] = None,
+                 spill_directory: Optional[str] = None
+                 ) -> None:
+        self.__c = c
+        self.endpoint = endpoint
+        # The endpoint's ejections so far - one more, and the connection is dropped (see endpoint_ejected)
+        self._endpoint_ejections = endpoint.ejections if endpoint is not None else 0
+        self.statement_timeout = statement_timeout
+        self.spill_threshold = spill_threshold
+        self.spill_directory = spill_directory
+        self._checked_out = False
+        self.notices = list()
+        self.stream_prefetch_batches = stream_prefetch_batches
+        self.retrier = retrier or Retrier()
+        self.result_cache = result_cache
+        self.statement_cache = PreparedStatementCache(capacity=prepared_statement_cache_size)
+        # Cursors left open (e.g. by a cancelled query) would keep the ADBC connection from closing
+        self._cursors: "weakref.WeakSet[CursorWrapper]" = weakref.WeakSet()
+        # Cached statements must be released before the ADBC connection can be closed (or garbage-collected)
+        weakref.finalize(self, self.statement_cache.close)
+
+    def cursor(self, server_side: bool = False, prefetch_batches: Optional[int] = None) -> CursorWrapper:
+        if server_side:
+            cursor = StreamingCursorWrapper(conn=self.__c,
+                                            statement_cache=self.statement_cache,
+                                            retrier=self.retrier,
+                                            result_cache=self.result_cache,
+                                            endpoint=self.endpoint,
+                                            statement_timeout=self.statement_timeout,
+                                            spill_threshold=self.spill_threshold,
+                                            spill_directory=self.spill_directory,
+                                            prefetch_batches=prefetch_batches or self.stream_prefetch_batches
+                                            )
+        else:
+            cursor = CursorWrapper(conn=self.__c,
+                                   statement_cache=self.statement_cache,
+                                   retrier=self.retrier,
+                                   result_cache=self.result_cache,
+                                   endpoint=self.endpoint,
+                                   statement_timeout=self.statement_timeout,
+                                   spill_threshold=self.spill_threshold,
+                                   spill_directory=self.spill_directory
+                                   )
+        self._cursors.add(cursor)
+        return cursor
+
+    def fetchmany(self, size: Optional[int] = None) -> List:
+        return self.__c.fetchmany(size)
+
+    @property
+    def c(self) -> "Connection":
+        warnings.warn(
+            "Directly accessing the internal connection object is deprecated (please go via the __getattr__ impl)",
+            DeprecationWarning,
+        )
+        return self.__c
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__c, name)
+
+    @property
+    def connection(self) -> "Connection":
+        return self
+
+    def ping(self) -> None:
+        """Make a round trip to the server - raising if it can't be reached."""
+        try:
+            self.__c.adbc_get_info()
+        except flight_sql.Error as e:
+            # Any other error is the server answering (if only that it doesn't support the call)
+            if is_transient_error(e):
+                raise
+
+    @property
+    def endpoint_ejected(self) -> bool:
+        """Whether the connection's endpoint has been ejected since the connection was opened - its gateway failed
+        (or couldn't be reached), so the connection most likely did too."""
+        return self.endpoint is not None and self.endpoint.ejections != self._endpoint_ejections
+
+    def set_checked_out(self, checked_out: bool) -> None:
+        """Count this connection as checked out of (or back in) the pool, on its endpoint."""
+        if self.endpoint is not None and checked_out != self._checked_out:
+            self._checked_out = checked_out
+            self.endpoint.checked_out_changed(1 if checked_out else -1)
+
+    def cancel_open_cursors(self) -> int:
+        """Cancel (on the server) the statements of this connection's cursors whose results have not been read to
+        the end - e.g. a result abandoned mid-stream when the connection went back to the pool - and close every
+        open cursor.  Returns the number of statements cancelled."""
+        cancelled = 0
+        for cursor in list(self._cursors):
+            if cursor._closed:
+                continue
+            try:
+                if cursor.in_flight:
+                    cursor.cancel()
+                    cancelled += 1
+                cursor.close()
+            except Exception:
+                # The statement may have failed, or the server gone - the cursor is done with either way
+                pass
+        return cancelled
+
+    def close(self) -> None:
+        if self.endpoint is not None:
+            self.set_checked_out(False)
+            self.endpoint.connection_closed()
+            self.endpoint = None
+        self.__c.adbc_cancel()
+        for cursor in list(self._cursors):
+            try:
+                cursor.close()
+            except Exception:
+                # The statement may be mid-cancellation, or the server gone - it is closed with the connection anyway
+                pass
+        self.statement_cache.close()
+        self.__c.close()
+
+    @property
+    def rowcount(self) -> int:
+        return self.cursor().rowcount
+
+    def executemany(
+            self,
+            statement: str,
+            parameters: Optional[List[Dict]] = None,
+            context: Optional[Any] = None,
+    ) -> None:
+        self.cursor().executemany(statement, parameters)
+
+    def execute(
+            self,
+            statement: str,
+            parameters: Optional[Tuple] = None,
+            context: Optional[Any] = None,
+    ) -> None:
+        try:
+            if statement.lower() == "commit":  # this is largely for ipython-sql
+                self.__c.commit()
+            elif statement.lower() == "register":
+                assert parameters and len(parameters) == 2, parameters
+                view_name, df = parameters
+                self.__c.register(view_name, df)
+            else:
+                with self.cursor() as cur:
+                    cur.execute(statement, parameters)
+        except RuntimeError as e:
+            if e.args[0].startswith("Not implemented Error"):
+                raise NotImplementedError(*e.args) from e
+            elif (
+                    e.args[0]
+                    == "TransactionContext Error: cannot commit - no transaction is active"
+            ):
+                return
+            else:
+                raise e
@@ -0,0 +1,48 @@
+# This module holds the ADBC database shared by all of an engine's pooled connections.
+import threading
+from typing import Dict, Optional
+
+import adbc_driver_flightsql
+from adbc_driver_flightsql import dbapi as flight_sql
+from adbc_driver_manager import AdbcConnection, AdbcDatabase
+from adbc_driver_manager.dbapi import _SharedDatabase
+
+
+class SharedDatabase:
+    """A lazily-created ADBC database, which connections are opened from.
+
+    Creating the ``AdbcDatabase`` (driver load, option parsing, TLS and auth setup) happens once - each
+    pooled connection is just a lightweight ``AdbcConnection`` on top of it.  The database is reference
+    counted: it is released once this holder and every connection opened from it have been closed.
+    """
+
+    def __init__(self, uri: str, db_kwargs: Optional[Dict[str, str]] = None) -> None:
+        self.uri = uri
+        self.db_kwargs = dict(db_kwargs or {})
+        self._database: Optional[AdbcDatabase] = None
+        self._shared: Optional[_SharedDatabase] = None
+        self._lock = threading.Lock()
+
+    def _get_database(self) -> _SharedDatabase:
+        with self._lock:
+            if self._shared is None:
+                self._database = adbc_driver_flightsql.connect(self.uri, db_kwargs=self.db_kwargs)
+                self._shared = _SharedDatabase(self._database)
+            return self._shared
+
+    def connect(self, conn_kwargs: Optional[Dict[str, str]] = None) -> flight_sql.Connection:
+        shared = self._get_database()
+        conn = AdbcConnection(self._database, **(conn_kwargs or {}))
+        try:
+            return flight_sql.Connection(shared, conn, conn_kwargs)
+        except Exception:
+            conn.close()
+            raise
+
+    def close(self) -> None:
+        """Release this holder's reference to the database (open connections keep theirs)."""
+        with self._lock:
+            if self._shared is not None:
+                self._shared.close()
+                self._shared = None
+                self._database = None
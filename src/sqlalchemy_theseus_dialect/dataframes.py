@@ -0,0 +1,122 @@
+# This module holds the pandas/polars DataFrame API for the Theseus dialect - results and loads go as Arrow.
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import pyarrow as pa
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from .ingest import DEFAULT_INGEST_BATCH_SIZE, ingest
+
+DTYPE_BACKENDS = ("pyarrow", "numpy_nullable", "numpy")
+
+# pandas' if_exists choices, as ADBC ingest modes
+_IF_EXISTS_MODES = {"fail": "create", "replace": "replace", "append": "create_append"}
+
+
+def _numpy_nullable_dtypes() -> Dict[pa.DataType, Any]:
+    import pandas as pd
+
+    return {
+        pa.int8(): pd.Int8Dtype(),
+        pa.int16(): pd.Int16Dtype(),
+        pa.int32(): pd.Int32Dtype(),
+        pa.int64(): pd.Int64Dtype(),
+        pa.uint8(): pd.UInt8Dtype(),
+        pa.uint16(): pd.UInt16Dtype(),
+        pa.uint32(): pd.UInt32Dtype(),
+        pa.uint64(): pd.UInt64Dtype(),
+        pa.bool_(): pd.BooleanDtype(),
+        pa.float32(): pd.Float32Dtype(),
+        pa.float64(): pd.Float64Dtype(),
+        pa.string(): pd.StringDtype(),
+        pa.large_string(): pd.StringDtype(),
+    }
+
+
+def arrow_to_pandas(table: pa.Table, dtype_backend: str = "pyarrow") -> Any:
+    """Convert an Arrow table to a pandas DataFrame.
+
+    With the "pyarrow" ``dtype_backend`` (the default) the columns keep their Arrow data (as
+    :class:`pandas.ArrowDtype` columns), so no values are copied or converted.  "numpy_nullable" gives pandas'
+    nullable extension dtypes, and "numpy" pandas' classic NumPy dtypes.
+    """
+    import pandas as pd
+
+    if dtype_backend == "pyarrow":
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    elif dtype_backend == "numpy_nullable":
+        return table.to_pandas(types_mapper=_numpy_nullable_dtypes().get)
+    elif dtype_backend == "numpy":
+        return table.to_pandas()
+    else:
+        raise ValueError(f"Invalid dtype_backend: {dtype_backend} - must be one of: {DTYPE_BACKENDS}")
+
+
+def arrow_to_polars(table: pa.Table) -> Any:
+    import polars as pl
+
+    return pl.from_arrow(table)
+
+
+def read_sql(sql: Any,
+             con: Union[Connection, Engine],
+             params: Optional[Dict[str, Any]] = None,
+             index_col: Optional[Union[str, Sequence[str]]] = None,
+             dtype_backend: str = "pyarrow",
+             backend: str = "pandas",
+             ) -> Any:
+    """Run a query, and return its result as a pandas (or, with ``backend="polars"``, polars) DataFrame.
+
+    Unlike :func:`pandas.read_sql`, the result goes from the server's Arrow record batches straight into the
+    DataFrame - no Python row tuples are built.  ``sql`` is a SQL string (with ``:name`` parameters, bound from
+    ``params``) or any SQLAlchemy executable, and ``dtype_backend`` is as for :func:`arrow_to_pandas`.
+    """
+    if backend not in ("pandas", "polars"):
+        raise ValueError(f"Invalid backend: {backend} - must be one of: ('pandas', 'polars')")
+    if isinstance(con, Engine):
+        with con.connect() as conn:
+            return read_sql(sql, conn, params=params, index_col=index_col, dtype_backend=dtype_backend,
+                            backend=backend)
+
+    statement = text(sql) if isinstance(sql, str) else sql
+    table = con.execute(statement, params or {}).arrow()
+    if backend == "polars":
+        return arrow_to_polars(table)
+
+    frame = arrow_to_pandas(table, dtype_backend=dtype_backend)
+    if index_col is not None:
+        frame = frame.set_index(index_col)
+    return frame
+
+
+def to_sql(frame: Any,
+           name: str,
+           con: Union[Connection, Engine],
+           schema: Optional[str] = None,
+           if_exists: str = "fail",
+           index: bool = False,
+           index_label: Optional[Union[str, List[str]]] = None,
+           batch_size: Optional[int] = DEFAULT_INGEST_BATCH_SIZE,
+           ) -> int:
+    """Write a pandas (or polars) DataFrame to a table, shipping it as Arrow.
+
+    ``if_exists`` is as for :meth:`pandas.DataFrame.to_sql`: "fail" (the table must not exist yet), "replace" or
+    "append" (creating the table if needed).  Arrow-backed pandas columns, and polars frames, are sent without
+    copying their values; NumPy-backed columns are converted to Arrow once, column by column - there is no
+    row-by-row conversion either way.  ``index`` writes a pandas frame's index as column(s) too, named
+    ``index_label`` (or after the index).
+
+    Returns the number of rows written (or -1 if the server does not report it).
+    """
+    mode = _IF_EXISTS_MODES.get(if_exists)
+    if mode is None:
+        raise ValueError(f"Invalid if_exists: {if_exists} - must be one of: {tuple(_IF_EXISTS_MODES)}")
+
+    if type(frame).__module__.partition(".")[0] == "pandas":
+        if index:
+            frame = frame.rename_axis(index_label) if index_label is not None else frame
+            frame = frame.reset_index()
+        data = pa.Table.from_pandas(frame, preserve_index=False)
+    else:
+        data = frame
+    return ingest(con, name, data, mode=mode, schema=schema, batch_size=batch_size)
@@ -0,0 +1,279 @@
+# This module holds the client-side load balancing of an engine's connections across several Theseus gateways.
+import itertools
+import random
+import socket
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_ENDPOINT_FAILURE_THRESHOLD = 1
+DEFAULT_ENDPOINT_EJECT_TIME = 30.0
+DEFAULT_HEALTH_CHECK_TIMEOUT = 2.0
+
+
+class Endpoint:
+    """One gateway (``host:port``) of a load-balanced engine - with its health, and its connection and query
+    counters.
+
+    ``failure_threshold`` consecutive transport failures (connecting, or running a statement) eject the endpoint
+    for ``eject_time`` seconds: no new connections are opened to it meanwhile.  After that it is on probation -
+    the next connection to it either re-admits it (on success), or ejects it again.
+    """
+
+    def __init__(self,
+                 host: str,
+                 port: int,
+                 failure_threshold: int = DEFAULT_ENDPOINT_FAILURE_THRESHOLD,
+                 eject_time: float = DEFAULT_ENDPOINT_EJECT_TIME,
+                 ) -> None:
+        self.host = host
+        self.port = int(port)
+        self.failure_threshold = failure_threshold
+        self.eject_time = eject_time
+        # Open connections, and how many of those are checked out of the pool
+        self.connections = 0
+        self.checked_out = 0
+        # Statements whose results are still open
+        self.outstanding_queries = 0
+        self.connects = 0
+        self.failures = 0
+        self.ejections = 0
+        self._ejected_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.address!r}, state={self.state!r})"
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._ejected_at is None:
+                return "healthy"
+            return "probation" if time.monotonic() - self._ejected_at >= self.eject_time else "ejected"
+
+    @property
+    def available(self) -> bool:
+        """Whether new connections may be opened to this endpoint (it is healthy, or on probation)."""
+        return self.state != "ejected"
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._ejected_at = None
+
+    def record_failure(self) -> bool:
+        """Record a transport failure, returning True if it (re-)ejected the endpoint."""
+        with self._lock:
+            self.failures += 1
+            on_probation = self._ejected_at is not None
+            if on_probation or (self.failure_threshold > 0 and self.failures >= self.failure_threshold):
+                self._ejected_at = time.monotonic()
+                self.ejections += 1
+                return True
+            return False
+
+    def eject(self) -> None:
+        with self._lock:
+            self._ejected_at = time.monotonic()
+            self.ejections += 1
+
+    def _count(self, counter: str, amount: int) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def connection_opened(self) -> None:
+        with self._lock:
+            self.connections += 1
+            self.connects += 1
+
+    def connection_closed(self) -> None:
+        self._count("connections", -1)
+
+    def checked_out_changed(self, amount: int) -> None:
+        self._count("checked_out", amount)
+
+    def query_started(self) -> None:
+        self._count("outstanding_queries", 1)
+
+    def query_finished(self) -> None:
+        self._count("outstanding_queries", -1)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(connections=self.connections,
+                            checked_out=self.checked_out,
+                            outstanding_queries=self.outstanding_queries,
+                            connects=self.connects,
+                            failures=self.failures,
+                            ejections=self.ejections)
+        return dict(address=self.address, state=self.state, **counters)
+
+
+class LoadBalancingPolicy:
+    """Picks the endpoint a new connection goes to - subclass this (implementing :meth:`choose`) for other
+    policies, and set it as the engine's ``dialect.load_balancer.policy``."""
+
+    def choose(self, endpoints: Sequence[Endpoint]) -> Endpoint:
+        """Pick one of ``endpoints`` (the available ones - never empty)."""
+        raise NotImplementedError()
+
+
+class RoundRobinPolicy(LoadBalancingPolicy):
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+
+    def choose(self, endpoints: Sequence[Endpoint]) -> Endpoint:
+        return endpoints[next(self._counter) % len(endpoints)]
+
+
+class LeastOutstandingQueriesPolicy(LoadBalancingPolicy):
+    """Picks the endpoint with the fewest open queries (then the fewest connections) - ties go round-robin."""
+
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+
+    def choose(self, endpoints: Sequence[Endpoint]) -> Endpoint:
+        offset = next(self._counter)
+        rotated = [endpoints[(offset + i) % len(endpoints)] for i in range(len(endpoints))]
+        return min(rotated, key=lambda endpoint: (endpoint.outstanding_queries, endpoint.connections))
+
+
+class RandomPolicy(LoadBalancingPolicy):
+    def choose(self, endpoints: Sequence[Endpoint]) -> Endpoint:
+        return random.choice(endpoints)
+
+
+# The ``loadBalancing`` URL query parameter's values
+LOAD_BALANCING_POLICIES: Dict[str, Callable[[], LoadBalancingPolicy]] = {
+    "round_robin": RoundRobinPolicy,
+    "least_outstanding": LeastOutstandingQueriesPolicy,
+    "random": RandomPolicy,
+}
+
+
+def parse_endpoints(hosts: Iterable[str], default_port: Optional[int]) -> List[Tuple[str, int]]:
+    """Parse ``host[:port]`` strings (each possibly a comma-separated list) into ``(host, port)`` pairs."""
+    endpoints = []
+    for entry in hosts:
+        for address in filter(None, (part.strip() for part in entry.split(","))):
+            host, _, port = address.rpartition(":") if ":" in address else (address, "", "")
+            if not port and default_port is None:
+                raise ValueError(f"No port given for endpoint: {address}")
+            endpoints.append((host, int(port) if port else default_port))
+    return endpoints
+
+
+class LoadBalancer:
+    """Spreads an engine's new connections across several gateway endpoints.
+
+    Each connection goes to the endpoint picked by ``policy`` (round-robin by default) from the available ones;
+    if it can't be reached, the next available endpoint is tried, and so on - and if every endpoint is ejected,
+    they are all tried anyway (rather than failing without trying).  Unreachable endpoints are ejected (see
+    :class:`Endpoint`).  With a ``health_check_interval``, a background thread also probes every endpoint that
+    often (a TCP connect, of at most ``health_check_timeout`` seconds) - ejecting unreachable ones before a
+    connection has to fail on them, and re-admitting recovered ones without waiting out their ejection.
+    """
+
+    def __init__(self,
+                 endpoints: Sequence[Tuple[str, int]],
+                 policy: Optional[LoadBalancingPolicy] = None,
+                 failure_threshold: int = DEFAULT_ENDPOINT_FAILURE_THRESHOLD,
+                 eject_time: float = DEFAULT_ENDPOINT_EJECT_TIME,
+                 health_check_interval: float = 0.0,
+                 health_check_timeout: float = DEFAULT_HEALTH_CHECK_TIMEOUT,
+                 ) -> None:
+        if not endpoints:
+            raise ValueError("A load balancer needs at least one endpoint")
+        self.endpoints = [Endpoint(host, port, failure_threshold=failure_threshold, eject_time=eject_time)
+                          for host, port in endpoints]
+        self.policy = policy or RoundRobinPolicy()
+        self.health_check_timeout = health_check_timeout
+        self._stop_health_checks = threading.Event()
+        if health_check_interval > 0:
+            thread = threading.Thread(target=LoadBalancer._run_health_checks,
+                                      args=(weakref.ref(self), health_check_interval, self._stop_health_checks),
+                                      name="theseus-health-check",
+                                      daemon=True)
+            thread.start()
+            weakref.finalize(self, self._stop_health_checks.set)
+
+    @classmethod
+    def from_url_query(cls, endpoints: Sequence[Tuple[str, int]], query: Dict[str, str]
+                       ) -> Optional["LoadBalancer"]:
+        """Build a load balancer from (and pop its settings out of) a URL query dictionary - or None if there is
+        only one endpoint to connect to."""
+        policy_name = query.pop("loadBalancing", "round_robin")
+        if policy_name not in LOAD_BALANCING_POLICIES:
+            raise ValueError(f"Invalid loadBalancing: {policy_name} - must be one of: "
+                             f"{tuple(LOAD_BALANCING_POLICIES)}")
+        settings = dict(failure_threshold=int(query.pop("endpointFailureThreshold",
+                                                        DEFAULT_ENDPOINT_FAILURE_THRESHOLD)),
+                        eject_time=float(query.pop("endpointEjectTime", DEFAULT_ENDPOINT_EJECT_TIME)),
+                        health_check_interval=float(query.pop("endpointHealthCheckInterval", 0.0)),
+                        health_check_timeout=float(query.pop("endpointHealthCheckTimeout",
+                                                             DEFAULT_HEALTH_CHECK_TIMEOUT)),
+                        )
+        if len(endpoints) < 2:
+            return None
+        return cls(endpoints, policy=LOAD_BALANCING_POLICIES[policy_name](), **settings)
+
+    def candidates(self) -> List[Endpoint]:
+        """The endpoints to try for a new connection, in order."""
+        available = [endpoint for endpoint in self.endpoints if endpoint.available] or list(self.endpoints)
+        first = self.policy.choose(available)
+        return [first] + [endpoint for endpoint in available if endpoint is not first]
+
+    def connect(self,
+                open_connection: Callable[[Endpoint], T],
+                is_transient_error: Callable[[BaseException], bool],
+                ) -> Tuple[Endpoint, T]:
+        """Open a connection with ``open_connection(endpoint)`` - failing over to the next candidate endpoint on
+        transient errors."""
+        error: Optional[BaseException] = None
+        for endpoint in self.candidates():
+            try:
+                connection = open_connection(endpoint)
+            except Exception as e:
+                if not is_transient_error(e):
+                    raise
+                endpoint.record_failure()
+                error = e
+                continue
+            endpoint.record_success()
+            endpoint.connection_opened()
+            return endpoint, connection
+        raise error
+
+    def check_health(self) -> None:
+        """Probe every endpoint now - ejecting unreachable ones, and re-admitting recovered ones."""
+        for endpoint in self.endpoints:
+            try:
+                socket.create_connection((endpoint.host, endpoint.port), timeout=self.health_check_timeout).close()
+            except OSError:
+                # An unreachable gateway is ejected straight away - it would only fail connections
+                if endpoint.state == "healthy":
+                    endpoint.eject()
+            else:
+                if endpoint.state != "healthy":
+                    endpoint.record_success()
+
+    @staticmethod
+    def _run_health_checks(balancer_ref: "weakref.ref[LoadBalancer]", interval: float,
+                           stop: threading.Event) -> None:
+        # Holds the load balancer only while checking - so it (and its engine) can still be garbage-collected
+        while not stop.wait(interval):
+            balancer = balancer_ref()
+            if balancer is None:
+                return
+            balancer.check_health()
+            del balancer
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [endpoint.as_dict() for endpoint in self.endpoints]
@@ -0,0 +1,75 @@
+# This module holds the execution context used for every statement run through the Theseus dialect.
+from typing import Any, List, Optional
+
+from sqlalchemy.engine.cursor import CursorFetchStrategy, CursorResult
+from sqlalchemy.engine.default import CACHE_HIT, DefaultExecutionContext
+from sqlalchemy.engine.interfaces import ExecuteStyle
+from sqlalchemy.sql.sqltypes import NULLTYPE
+
+from .instrumentation import QueryTimings
+from .result import TheseusCursorResult
+from .statements import is_ddl_statement, is_idempotent_statement
+
+# Streaming cursors buffer (exactly one record batch) themselves, so rows are fetched straight from the cursor
+# rather than through SQLAlchemy's default row buffer for server-side cursors
+_STREAMING_FETCH = CursorFetchStrategy()
+
+
+class TheseusExecutionContext(DefaultExecutionContext):
+    # Set when the engine's instrumentation is enabled (readable from e.g. an ``after_cursor_execute`` listener)
+    query_timings: Optional[QueryTimings] = None
+
+    def create_cursor(self):
+        cursor = super().create_cursor()
+        if self.dialect.instrumentation.enabled:
+            self.query_timings = self.dialect.instrumentation.new_timings(getattr(self, "unicode_statement", ""),
+                                                                          compile_seconds=self._compile_seconds())
+        apply_execution_options = getattr(cursor, "apply_execution_options", None)
+        if apply_execution_options is not None:
+            apply_execution_options(self.execution_options,
+                                    query_timings=self.query_timings,
+                                    parameter_types=self._parameter_types())
+        return cursor
+
+    def _parameter_types(self) -> Optional[List[Any]]:
+        # The Arrow types executemany parameter sets are bound as - worked out once per compiled statement
+        compiled = self.compiled
+        if self.execute_style is not ExecuteStyle.EXECUTEMANY or compiled is None or compiled.positiontup is None:
+            return None
+        if getattr(compiled, "parameter_types", None) is None:
+            from .parameters import parameter_types
+            bind_types = {name: bind.type for bind, name in compiled.bind_names.items()}
+            compiled.parameter_types = parameter_types([bind_types.get(name, NULLTYPE)
+                                                        for name in compiled.positiontup],
+                                                       self.dialect)
+        return compiled.parameter_types
+
+    def _compile_seconds(self) -> float:
+        # Statements served from SQLAlchemy's compiled cache took no compiling
+        if self.compiled is None or self.cache_hit == CACHE_HIT:
+            return 0.0
+        return getattr(self.compiled, "compile_seconds", 0.0)
+
+    def create_server_side_cursor(self):
+        self.cursor_fetch_strategy = _STREAMING_FETCH
+        return self._dbapi_connection.cursor(server_side=True,
+                                             prefetch_batches=self.execution_options.get("prefetch_batches")
+                                             )
+
+    def post_exec(self):
+        # Cached schema/table lookups are stale once DDL has run through this engine
+        if self.isddl or (self.is_text and is_ddl_statement(self.statement)):
+            self.dialect.catalog_cache.invalidate()
+        # ... and cached query results once anything may have been written (a statement opted in to the result
+        # cache is taken to be read-only - it would otherwise clear its own result)
+        if self.isinsert or self.isupdate or self.isdelete or self.isddl or \
+                (self.is_text and not is_idempotent_statement(self.statement)
+                 and self.execution_options.get("result_cache") is not True):
+            self.dialect.result_cache.invalidate()
+
+    def _setup_result_proxy(self):
+        result = super()._setup_result_proxy()
+        # Hand back our Arrow-aware result class - it adds methods only, so the (plain) CursorResult can be re-classed
+        if type(result) is CursorResult:
+            result.__class__ = TheseusCursorResult
+        return result
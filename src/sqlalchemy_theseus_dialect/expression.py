@@ -0,0 +1,89 @@
+# This module holds the Theseus-specific SQL constructs - sampling, approximate aggregates and QUALIFY.
+from typing import Any, Sequence, Tuple, Union
+
+from sqlalchemy import exc, literal
+from sqlalchemy import types as sqltypes
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import coercions, roles
+from sqlalchemy.sql.base import _generative
+from sqlalchemy.sql.functions import GenericFunction
+from sqlalchemy.sql.selectable import Select
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from .compiler import TheseusCompiler
+
+
+class TheseusSelect(Select):
+    """A :class:`~sqlalchemy.sql.expression.Select` which can also filter on window functions with
+    :meth:`qualify` - build it with this module's :func:`select`."""
+
+    inherit_cache = True
+
+    _qualify_criteria: Tuple[Any, ...] = ()
+
+    _traverse_internals = Select._traverse_internals + [
+        ("_qualify_criteria", InternalTraversal.dp_clauseelement_tuple),
+    ]
+    _cache_key_traversal = _traverse_internals + [
+        ("_compile_options", InternalTraversal.dp_has_cache_key),
+    ]
+
+    @_generative
+    def qualify(self, *criteria: Any) -> "TheseusSelect":
+        """Add a ``QUALIFY`` criterion - a filter on the window functions of the select list, applied after
+        ``HAVING`` (e.g. ``func.row_number().over(partition_by=..., order_by=...) == 1`` for the first row of
+        each partition), without wrapping the statement in a subquery."""
+        self._qualify_criteria += tuple(coercions.expect(roles.WhereHavingRole, criterion)
+                                        for criterion in criteria)
+        return self
+
+
+@compiles(TheseusSelect)
+def _compile_theseus_select(element: TheseusSelect, compiler: Any, **kw: Any) -> str:
+    if element._qualify_criteria and not isinstance(compiler, TheseusCompiler):
+        raise exc.CompileError(f"QUALIFY is not supported by the {compiler.dialect.name} dialect")
+    return compiler.visit_select(element, **kw)
+
+
+def select(*entities: Any) -> TheseusSelect:
+    """Like :func:`sqlalchemy.select`, with :meth:`TheseusSelect.qualify` available."""
+    return TheseusSelect(*entities)
+
+
+class approx_count_distinct(GenericFunction):
+    """The approximate number of distinct values of an expression (a HyperLogLog sketch, rather than an exact
+    ``count(DISTINCT ...)``)."""
+
+    type = sqltypes.BigInteger()
+    package = "theseus"
+    inherit_cache = True
+
+
+class approx_percentile(GenericFunction):
+    """The approximate percentile(s) of an expression - ``percentile`` is a fraction (``0.5`` for the median), or
+    a sequence of them for an array of percentiles.  Rendered as Theseus' ``approx_quantile()``."""
+
+    package = "theseus"
+    inherit_cache = True
+
+    def __init__(self, expr: Any, percentile: Union[float, Sequence[float]], **kwargs: Any) -> None:
+        expr = coercions.expect(roles.ExpressionElementRole, expr)
+        fractions = [percentile] if isinstance(percentile, (int, float)) else list(percentile)
+        if not fractions or not all(0 <= fraction <= 1 for fraction in fractions):
+            raise exc.ArgumentError(f"percentile must be between 0 and 1, got: {percentile!r}")
+        # Theseus only accepts constant fractions - rendered inline at execution time, so the compiled form is
+        # still cached
+        args = [literal(float(fraction), sqltypes.Float(), literal_execute=True) for fraction in fractions]
+        kwargs.setdefault("type_", expr.type if isinstance(percentile, (int, float)) else sqltypes.ARRAY(expr.type))
+        super().__init__(expr, *args, **kwargs)
+
+
+class sample_rows(GenericFunction):
+    """A fixed-size sample for :func:`sqlalchemy.tablesample` - ``tablesample(table, sample_rows(10000))``
+    samples ten thousand rows (a reservoir sample), where ``tablesample(table, 1)`` samples one percent."""
+
+    package = "theseus"
+    inherit_cache = True
+
+    def __init__(self, rows: int, **kwargs: Any) -> None:
+        super().__init__(literal(int(rows), sqltypes.Integer(), literal_execute=True), **kwargs)
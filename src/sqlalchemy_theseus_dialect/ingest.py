@@ -0,0 +1,144 @@
+# This module holds the bulk-load (Arrow ingest) API for the Theseus dialect.
+from typing import Any, Iterable, Iterator, List, Optional, Union
+
+import pyarrow as pa
+from adbc_driver_flightsql import dbapi as flight_sql
+from sqlalchemy import Column, MetaData, Table
+from sqlalchemy import types as sqltypes
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateTable, DropTable
+
+DEFAULT_INGEST_BATCH_SIZE = 65_536
+INGEST_MODES = ("append", "create", "create_append", "replace")
+
+
+def to_record_batch_reader(data: Any, batch_size: Optional[int] = DEFAULT_INGEST_BATCH_SIZE) -> pa.RecordBatchReader:
+    """Turn a pyarrow Table/RecordBatch/RecordBatchReader or a pandas/polars DataFrame into a record batch stream.
+
+    Batches are sliced to at most ``batch_size`` rows each (if given), so large inputs are sent to the
+    server in bounded chunks.
+    """
+    if isinstance(data, pa.RecordBatchReader):
+        reader = data
+    elif isinstance(data, pa.Table):
+        return data.to_reader(max_chunksize=batch_size)
+    elif isinstance(data, pa.RecordBatch):
+        return pa.Table.from_batches([data]).to_reader(max_chunksize=batch_size)
+    elif hasattr(data, "to_arrow"):
+        # polars DataFrame
+        return to_record_batch_reader(data.to_arrow(), batch_size=batch_size)
+    elif type(data).__module__.partition(".")[0] == "pandas":
+        return to_record_batch_reader(pa.Table.from_pandas(data, preserve_index=False), batch_size=batch_size)
+    elif hasattr(data, "__arrow_c_stream__"):
+        reader = pa.RecordBatchReader.from_stream(data)
+    else:
+        raise TypeError(f"Cannot ingest data of type: {type(data).__name__}")
+
+    if batch_size is None:
+        return reader
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        for batch in reader:
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+
+    return pa.RecordBatchReader.from_batches(reader.schema, batches())
+
+
+def arrow_type_to_sqltype(data_type: pa.DataType) -> sqltypes.TypeEngine:
+    if pa.types.is_dictionary(data_type):
+        return arrow_type_to_sqltype(data_type.value_type)
+    elif pa.types.is_boolean(data_type):
+        return sqltypes.Boolean()
+    elif pa.types.is_int8(data_type) or pa.types.is_int16(data_type) or pa.types.is_uint8(data_type):
+        return sqltypes.SmallInteger()
+    elif pa.types.is_int32(data_type) or pa.types.is_uint16(data_type):
+        return sqltypes.Integer()
+    elif pa.types.is_integer(data_type):
+        return sqltypes.BigInteger()
+    elif pa.types.is_float16(data_type) or pa.types.is_float32(data_type):
+        return sqltypes.Float()
+    elif pa.types.is_float64(data_type):
+        return sqltypes.Double()
+    elif pa.types.is_decimal(data_type):
+        return sqltypes.Numeric(precision=data_type.precision, scale=data_type.scale)
+    elif pa.types.is_string(data_type) or pa.types.is_large_string(data_type):
+        return sqltypes.String()
+    elif pa.types.is_binary(data_type) or pa.types.is_large_binary(data_type):
+        return sqltypes.LargeBinary()
+    elif pa.types.is_date(data_type):
+        return sqltypes.Date()
+    elif pa.types.is_timestamp(data_type):
+        return sqltypes.TIMESTAMP(timezone=data_type.tz is not None)
+    elif pa.types.is_time(data_type):
+        return sqltypes.Time()
+    else:
+        raise ValueError(f"Unsupported Arrow type for ingest: {data_type}")
+
+
+def ingest(connection: Union[Connection, Engine],
+           table_name: str,
+           data: Any,
+           mode: str = "create",
+           schema: Optional[str] = None,
+           batch_size: Optional[int] = DEFAULT_INGEST_BATCH_SIZE,
+           ) -> int:
+    """Bulk-load Arrow data (or a pandas/polars DataFrame) into a table.
+
+    ``mode`` is one of: "append", "create", "create_append" or "replace" (see ADBC's ``adbc_ingest``).
+
+    The data is streamed to the server with ADBC bulk ingestion.  If the driver/server does not support
+    that, the table is created with SQLAlchemy DDL (as needed) and the record batches are bound - as a
+    whole Arrow stream - to a single prepared INSERT statement instead.
+
+    Returns the number of rows loaded (or -1 if the server does not report it).
+    """
+    if isinstance(connection, Engine):
+        with connection.begin() as conn:
+            return ingest(conn, table_name, data, mode=mode, schema=schema, batch_size=batch_size)
+
+    if mode not in INGEST_MODES:
+        raise ValueError(f"Invalid ingest mode: {mode} - must be one of: {INGEST_MODES}")
+
+    reader = to_record_batch_reader(data, batch_size=batch_size)
+    dbapi_connection = connection.connection.dbapi_connection
+    with dbapi_connection.cursor() as cur:
+        try:
+            row_count = cur.adbc_ingest(table_name, reader, mode=mode, db_schema_name=schema)
+            if mode != "append":
+                connection.dialect.catalog_cache.invalidate(schema)
+            connection.dialect.result_cache.invalidate()
+            return row_count
+        except flight_sql.NotSupportedError:
+            # Older Flight SQL drivers/servers have no bulk ingestion - the options fail before any data is read
+            pass
+
+    table = Table(table_name,
+                  MetaData(),
+                  *[Column(field.name, arrow_type_to_sqltype(field.type), nullable=field.nullable)
+                    for field in reader.schema],
+                  schema=schema
+                  )
+    if mode == "replace":
+        connection.execute(DropTable(table, if_exists=True))
+    if mode != "append":
+        connection.execute(CreateTable(table, if_not_exists=(mode == "create_append")))
+
+    insert_statement = str(table.insert().compile(dialect=connection.dialect))
+    with dbapi_connection.cursor() as cur:
+        cur.executemany(insert_statement, reader)
+        connection.dialect.result_cache.invalidate()
+        return cur.rowcount
+
+
+def pandas_to_sql(pd_table: Any, conn: Connection, keys: List[str], data_iter: Iterable[tuple]) -> int:
+    """An insert ``method`` for :meth:`pandas.DataFrame.to_sql` that ships each chunk as Arrow.
+
+    Usage: ``df.to_sql("my_table", engine, if_exists="append", index=False, method=pandas_to_sql)``
+    """
+    columns = list(zip(*data_iter))
+    if not columns:
+        return 0
+
+    data = pa.table([pa.array(column) for column in columns], names=[str(key) for key in keys])
+    return ingest(conn, pd_table.name, data, mode="append", schema=pd_table.schema)
@@ -0,0 +1,196 @@
+# This module holds the per-query timing records and the per-engine metrics sinks.
+import bisect
+import dataclasses
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Histogram bucket upper bounds (seconds) - from sub-millisecond client overheads up to minutes-long extracts
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+                   60.0, 300.0)
+
+
+@dataclasses.dataclass
+class QueryTimings:
+    """Where the time went for one statement execution.
+
+    ``compile_seconds`` is zero when SQLAlchemy's compiled cache was hit.  ``execute_seconds`` excludes
+    ``prepare_seconds`` (preparing the statement and binding its parameters), but includes any retries.
+    ``first_batch_seconds`` and ``fetch_seconds`` are measured from the end of the execution, and
+    ``transfer_seconds`` is the part of ``fetch_seconds`` spent waiting for record batches - the rest went to
+    building Python rows, and to the application itself.  The fetch fields fill in as the result is read;
+    ``completed`` is set once it has been read to the end (or closed).
+    """
+
+    statement: str = ""
+    compile_seconds: float = 0.0
+    prepare_seconds: float = 0.0
+    execute_seconds: float = 0.0
+    first_batch_seconds: Optional[float] = None
+    transfer_seconds: float = 0.0
+    fetch_seconds: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+    batches: int = 0
+    attempts: int = 0
+    cached: bool = False
+    completed: bool = False
+    on_complete: Optional[Callable[["QueryTimings"], None]] = dataclasses.field(default=None, repr=False,
+                                                                                compare=False)
+
+    @property
+    def retries(self) -> int:
+        return max(0, self.attempts - 1)
+
+    def complete(self) -> None:
+        if self.completed:
+            return
+        self.completed = True
+        if self.on_complete is not None:
+            self.on_complete(self)
+
+    def instrument_reader(self, reader: "pa.RecordBatchReader") -> "pa.RecordBatchReader":
+        """Pass a result stream through, recording its batch/row/byte counts and fetch timings."""
+        import pyarrow as pa
+
+        started = time.perf_counter()
+
+        def batches() -> Iterator["pa.RecordBatch"]:
+            try:
+                source = iter(reader)
+                while True:
+                    before = time.perf_counter()
+                    batch = next(source, None)
+                    after = time.perf_counter()
+                    self.transfer_seconds += after - before
+                    if batch is None:
+                        return
+                    if self.first_batch_seconds is None:
+                        self.first_batch_seconds = after - started
+                    self.batches += 1
+                    self.rows += batch.num_rows
+                    self.bytes += batch.nbytes
+                    yield batch
+            finally:
+                self.fetch_seconds = time.perf_counter() - started
+                self.complete()
+
+        return pa.RecordBatchReader.from_batches(reader.schema, batches())
+
+
+class MetricsSink:
+    """Receives the timings of every statement (and connect) of an engine - subclass this to export them."""
+
+    def observe_query(self, timings: QueryTimings) -> None:
+        pass
+
+    def observe_connect(self, seconds: float) -> None:
+        pass
+
+
+class _Histogram:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class PrometheusMetricsSink(MetricsSink):
+    """Aggregates statement timings into Prometheus-style counters and histograms.
+
+    :meth:`render` returns them in the Prometheus text exposition format (e.g. to serve from a ``/metrics``
+    endpoint), and :meth:`as_dict` as plain numbers.
+    """
+
+    _COUNTERS = ("queries", "query_retries", "result_cache_hits", "result_rows", "result_bytes", "result_batches",
+                 "connects")
+    _HISTOGRAMS = ("compile", "prepare", "execute", "first_batch", "transfer", "fetch", "connect")
+
+    def __init__(self, prefix: str = "theseus", buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = dict.fromkeys(self._COUNTERS, 0)
+        self._histograms: Dict[str, _Histogram] = {name: _Histogram(buckets) for name in self._HISTOGRAMS}
+
+    def observe_query(self, timings: QueryTimings) -> None:
+        with self._lock:
+            self._counters["queries"] += 1
+            self._counters["query_retries"] += timings.retries
+            self._counters["result_cache_hits"] += int(timings.cached)
+            self._counters["result_rows"] += timings.rows
+            self._counters["result_bytes"] += timings.bytes
+            self._counters["result_batches"] += timings.batches
+            if not timings.cached:
+                self._histograms["compile"].observe(timings.compile_seconds)
+                self._histograms["prepare"].observe(timings.prepare_seconds)
+                self._histograms["execute"].observe(timings.execute_seconds)
+            if timings.first_batch_seconds is not None:
+                self._histograms["first_batch"].observe(timings.first_batch_seconds)
+                self._histograms["transfer"].observe(timings.transfer_seconds)
+                self._histograms["fetch"].observe(timings.fetch_seconds)
+
+    def observe_connect(self, seconds: float) -> None:
+        with self._lock:
+            self._counters["connects"] += 1
+            self._histograms["connect"].observe(seconds)
+
+    def as_dict(self) -> Dict[str, object]:
+        with self._lock:
+            metrics: Dict[str, object] = {f"{name}_total": value for name, value in self._counters.items()}
+            for name, histogram in self._histograms.items():
+                metrics[f"{name}_seconds"] = dict(count=histogram.count, sum=histogram.sum)
+            return metrics
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, value in self._counters.items():
+                metric = f"{self.prefix}_{name}_total"
+                lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+            for name, histogram in self._histograms.items():
+                metric = f"{self.prefix}_{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+                lines += [f"{metric}_sum {histogram.sum}", f"{metric}_count {histogram.count}"]
+        return "\n".join(lines) + "\n"
+
+
+class Instrumentation:
+    """The per-engine switch for query timings, and the metrics sinks they are reported to.
+
+    Disabled (the default) it costs one attribute check per statement.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.sinks: List[MetricsSink] = []
+
+    def add_sink(self, sink: MetricsSink) -> MetricsSink:
+        """Report to ``sink`` from now on (this enables the instrumentation)."""
+        self.sinks.append(sink)
+        self.enabled = True
+        return sink
+
+    def new_timings(self, statement: str, compile_seconds: float = 0.0) -> QueryTimings:
+        return QueryTimings(statement=statement, compile_seconds=compile_seconds, on_complete=self._report_query)
+
+    def _report_query(self, timings: QueryTimings) -> None:
+        for sink in self.sinks:
+            sink.observe_query(timings)
+
+    def report_connect(self, seconds: float) -> None:
+        for sink in self.sinks:
+            sink.observe_connect(seconds)
@@ -0,0 +1,106 @@
+# This module holds the concurrent multi-query API - independent statements run side by side on pooled connections.
+import dataclasses
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import pool, text
+from sqlalchemy.engine import Engine
+
+RESULT_FORMATS = ("rows", "arrow")
+
+# A statement - SQL text or any SQLAlchemy executable - optionally with its parameters
+Query = Union[Any, Tuple[Any, Optional[Mapping[str, Any]]]]
+
+
+@dataclasses.dataclass
+class QueryOutcome:
+    """How one statement of :func:`execute_concurrently` fared.
+
+    ``result`` is the statement's rows (a list of :class:`~sqlalchemy.engine.Row`), its Arrow table, or - for a
+    statement which returns no rows - its row count.  If the statement failed, ``error`` is the exception instead.
+    """
+
+    statement: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        """The result - or raise the statement's error."""
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _pool_capacity(engine_pool: pool.Pool) -> Optional[int]:
+    # How many connections the pool hands out without making a checkout wait - None if it is unbounded
+    if not isinstance(engine_pool, pool.QueuePool):
+        return None
+    max_overflow = engine_pool._max_overflow
+    return None if max_overflow < 0 else engine_pool.size() + max_overflow
+
+
+def _run_query(engine: Engine,
+               query: Query,
+               result_format: str,
+               execution_options: Dict[str, Any],
+               ) -> QueryOutcome:
+    statement, parameters = query if isinstance(query, tuple) else (query, None)
+    outcome = QueryOutcome(statement=statement)
+    started = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(**execution_options).execute(
+                text(statement) if isinstance(statement, str) else statement, parameters or {}
+            )
+            if not result.returns_rows:
+                outcome.result = result.rowcount
+            elif result_format == "arrow":
+                outcome.result = result.arrow()
+            else:
+                outcome.result = result.all()
+    except Exception as e:
+        outcome.error = e
+    outcome.seconds = time.perf_counter() - started
+    return outcome
+
+
+def execute_concurrently(engine: Engine,
+                         queries: Sequence[Query],
+                         max_concurrency: Optional[int] = None,
+                         timeout: Optional[float] = None,
+                         result_format: str = "rows",
+                         execution_options: Optional[Mapping[str, Any]] = None,
+                         ) -> List[QueryOutcome]:
+    """Run independent statements at the same time, each on its own pooled connection of ``engine``.
+
+    ``queries`` are SQL strings (with ``:name`` parameters) or SQLAlchemy executables - each optionally as a
+    ``(statement, parameters)`` tuple.  At most ``max_concurrency`` of them run at once (by default, as many as
+    the engine's pool hands out connections without waiting).  ``timeout`` is each statement's timeout, in
+    seconds, and ``execution_options`` apply to every statement.  With ``result_format="arrow"`` results are
+    fetched as :class:`pyarrow.Table` rather than rows.
+
+    Returns a :class:`QueryOutcome` per statement, in the order of ``queries`` - a failed statement has its
+    error there, and does not affect the others.
+    """
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(f"Invalid result_format: {result_format} - must be one of: {RESULT_FORMATS}")
+    if not queries:
+        return []
+
+    options = dict(execution_options or {})
+    if timeout is not None:
+        options["timeout"] = timeout
+    workers = max_concurrency or _pool_capacity(engine.pool) or len(queries)
+    workers = max(1, min(workers, len(queries)))
+    if workers == 1:
+        return [_run_query(engine, query, result_format, options) for query in queries]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="theseus-query") as executor:
+        futures = [executor.submit(_run_query, engine, query, result_format, options) for query in queries]
+        return [future.result() for future in futures]
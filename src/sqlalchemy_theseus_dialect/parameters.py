@@ -0,0 +1,75 @@
+# This module holds the binding of executemany parameter sets as columnar Arrow record batches.
+from typing import Any, List, Optional, Sequence
+
+import pyarrow as pa
+from sqlalchemy import types as sqltypes
+from sqlalchemy.engine import Dialect
+
+# The largest executemany parameter batch sent in one go - bigger parameter sets are bound as a stream of batches
+DEFAULT_PARAMETER_BATCH_SIZE = 65_536
+
+
+def sqltype_to_arrow_type(type_: sqltypes.TypeEngine, dialect: Dialect) -> Optional[pa.DataType]:
+    """The Arrow type a bound parameter of ``type_`` is sent as - or None to infer it from the values."""
+    # Values come through bind processors already - so they are of the (dialect-level) implementation type
+    type_ = type_._unwrapped_dialect_impl(dialect)
+    if isinstance(type_, sqltypes.Boolean):
+        return pa.bool_()
+    elif isinstance(type_, sqltypes.SmallInteger):
+        return pa.int16()
+    elif isinstance(type_, sqltypes.BigInteger):
+        return pa.int64()
+    elif isinstance(type_, sqltypes.Integer):
+        return pa.int32()
+    elif isinstance(type_, sqltypes.Float):
+        return pa.float64()
+    elif isinstance(type_, sqltypes.Numeric):
+        if type_.asdecimal and type_.precision is not None:
+            return pa.decimal128(type_.precision, type_.scale or 0)
+        return None
+    elif isinstance(type_, (sqltypes.Enum, sqltypes.String)):
+        return pa.string()
+    elif isinstance(type_, sqltypes.DateTime):
+        return pa.timestamp("us", tz="UTC" if type_.timezone else None)
+    elif isinstance(type_, sqltypes.Date):
+        return pa.date32()
+    elif isinstance(type_, sqltypes.Time):
+        return pa.time64("us")
+    elif isinstance(type_, sqltypes.Interval):
+        return pa.duration("us")
+    elif isinstance(type_, sqltypes._Binary):
+        return pa.binary()
+    return None
+
+
+def parameter_types(types: Sequence[sqltypes.TypeEngine], dialect: Dialect) -> List[Optional[pa.DataType]]:
+    return [sqltype_to_arrow_type(type_, dialect) for type_ in types]
+
+
+def _column(values: List[Any], data_type: Optional[pa.DataType]) -> pa.Array:
+    if data_type is not None:
+        try:
+            return pa.array(values, type=data_type)
+        except (pa.ArrowException, TypeError, ValueError, OverflowError):
+            # e.g. a value of another type than its column's - let Arrow (and the server) make what it can of it
+            pass
+    return pa.array(values)
+
+
+def parameter_table(seq_of_parameters: Sequence[Sequence[Any]],
+                    types: Optional[Sequence[Optional[pa.DataType]]] = None,
+                    batch_size: int = DEFAULT_PARAMETER_BATCH_SIZE,
+                    ) -> pa.Table:
+    """Turn executemany parameter sets (one positional sequence per row) into a table of columnar record batches.
+
+    Each column is converted as a whole - as its ``types`` entry (where given), so e.g. a column of nothing but
+    NULLs is still sent as its real type.  Each batch holds at most ``batch_size`` parameter sets, so large
+    parameter sets go to the server in bounded messages.
+    """
+    width = len(seq_of_parameters[0])
+    if types is None or len(types) != width:
+        types = [None] * width
+    columns = [_column(list(values), data_type) for values, data_type in zip(zip(*seq_of_parameters), types)]
+    table = pa.Table.from_arrays(columns, names=[str(index) for index in range(width)])
+    # (a table, rather than a one-shot stream - so a retried statement can bind it again)
+    return pa.Table.from_batches(table.to_batches(max_chunksize=batch_size), schema=table.schema)
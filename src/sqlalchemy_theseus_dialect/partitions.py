@@ -0,0 +1,135 @@
+# This module holds the concurrent reader for partitioned (multi-endpoint) query results.
+import queue
+import threading
+from typing import Iterator, List, Set
+
+import pyarrow as pa
+from adbc_driver_flightsql import dbapi as flight_sql
+from adbc_driver_manager import AdbcConnection, AdbcStatusCode
+
+# The number of record batches each partition reader may get ahead of the consumer
+_BATCHES_AHEAD = 4
+
+_PARTITION_DONE = object()
+
+
+class PartitionedResult:
+    """Reads the partitions of a result concurrently - on ``max_workers`` threads - as one record batch stream.
+
+    A Flight SQL connection can only stream one partition at a time, so each worker reads its partitions on its
+    own ADBC connection (opened from the same database as ``connection``).  Nothing is read until the first batch
+    is asked for from :attr:`reader`.
+
+    With ``ordered``, batches come back in partition order - partitions being read ahead of the one being consumed
+    wait once they have a few batches buffered.  Otherwise batches come back in the order they arrive.
+    """
+
+    def __init__(self,
+                 connection: flight_sql.Connection,
+                 partitions: List[bytes],
+                 schema: pa.Schema,
+                 max_workers: int,
+                 ordered: bool = True,
+                 ) -> None:
+        self._connection = connection
+        self._partitions = partitions
+        self._max_workers = max(1, max_workers)
+        self._ordered = ordered
+        self._stopped = threading.Event()
+        self._cancelled = False
+        # The workers' connections - so their reads can be cancelled
+        self._worker_connections: Set[AdbcConnection] = set()
+        self._unclaimed = iter(enumerate(partitions))
+        self._claim_lock = threading.Lock()
+        if ordered:
+            self._queues = [queue.Queue(maxsize=_BATCHES_AHEAD) for _ in partitions]
+        else:
+            shared_queue = queue.Queue(maxsize=self._max_workers * _BATCHES_AHEAD)
+            self._queues = [shared_queue] * len(partitions)
+        self.reader = pa.RecordBatchReader.from_batches(schema, self._batches())
+
+    def close(self) -> None:
+        """Stop reading - the workers wind down, and close their connections, in the background."""
+        self._stopped.set()
+
+    def cancel(self) -> None:
+        """Stop reading, cancelling the partition reads in progress - the consumer gets a cancellation error."""
+        with self._claim_lock:
+            self._cancelled = True
+            self._stopped.set()
+            for worker_connection in self._worker_connections:
+                try:
+                    worker_connection.cancel()
+                except Exception:
+                    pass
+
+    def _put(self, index: int, item) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._queues[index].put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _work(self) -> None:
+        worker_connection = None
+        try:
+            while not self._stopped.is_set():
+                with self._claim_lock:
+                    index, partition = next(self._unclaimed, (None, None))
+                if index is None:
+                    return
+                try:
+                    if worker_connection is None:
+                        worker_connection = AdbcConnection(self._connection._db._db,
+                                                           **(self._connection._conn_kwargs or {}))
+                        with self._claim_lock:
+                            self._worker_connections.add(worker_connection)
+                    handle = worker_connection.read_partition(partition)
+                    reader = pa.RecordBatchReader._import_from_c(handle.address)
+                    try:
+                        for batch in reader:
+                            if not self._put(index, batch):
+                                return
+                    finally:
+                        reader.close()
+                except BaseException as e:
+                    self._put(index, e)
+                    return
+                self._put(index, _PARTITION_DONE)
+        finally:
+            if worker_connection is not None:
+                with self._claim_lock:
+                    self._worker_connections.discard(worker_connection)
+                worker_connection.close()
+
+    def _next_item(self, index: int):
+        while True:
+            try:
+                return self._queues[index].get(timeout=0.1)
+            except queue.Empty:
+                # A cancelled worker may never hand anything over
+                if self._cancelled:
+                    raise flight_sql.OperationalError("The partitioned result was cancelled",
+                                                      status_code=AdbcStatusCode.CANCELLED) from None
+
+    def _batches(self) -> Iterator[pa.RecordBatch]:
+        for _ in range(min(self._max_workers, len(self._partitions))):
+            threading.Thread(target=self._work, name="theseus-partition", daemon=True).start()
+
+        try:
+            # In order, each partition's queue is drained in turn - otherwise they all share one queue
+            remaining = len(self._partitions)
+            index = 0
+            while remaining:
+                item = self._next_item(index)
+                if item is _PARTITION_DONE:
+                    remaining -= 1
+                    index = index + 1 if self._ordered else 0
+                elif isinstance(item, BaseException):
+                    raise item
+                else:
+                    yield item
+        finally:
+            self.close()
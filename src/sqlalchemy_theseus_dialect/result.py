@@ -0,0 +1,133 @@
+# This module holds the Arrow-native result API for the Theseus dialect.
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Sequence
+
+from sqlalchemy import exc
+from sqlalchemy.engine.cursor import BufferedRowCursorFetchStrategy, CursorFetchStrategy, CursorResult
+from sqlalchemy.engine.result import IteratorResult, ScalarResult
+
+from .instrumentation import QueryTimings
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+class TheseusCursorResult(CursorResult):
+    """A :class:`CursorResult` which can also hand back its rows as Arrow data.
+
+    :meth:`arrow`, :meth:`pandas`, :meth:`polars` and :meth:`record_batches` read straight from the ADBC
+    cursor, so no Python row tuples are built (and SQLAlchemy's result type processing is skipped).
+    Any of them has to be called before any rows are fetched from the result.
+
+    :meth:`columns` and :meth:`scalars` read the selected columns straight from the record batches too - the
+    other columns of the result are never converted to Python values.
+    """
+
+    __slots__ = ()
+
+    @property
+    def query_timings(self) -> Optional[QueryTimings]:
+        """Where the time went executing (and, so far, fetching) this result - None unless the engine's
+        instrumentation is enabled."""
+        return self.context.query_timings
+
+    def _arrow_cursor(self):
+        if not self.returns_rows:
+            raise exc.ResourceClosedError("This result object does not return rows.")
+        if self._soft_closed:
+            raise exc.ResourceClosedError("This result object is closed.")
+        return self.cursor
+
+    def arrow(self) -> "pa.Table":
+        """Fetch the (remaining) result as a :class:`pyarrow.Table`, and close the result."""
+        cursor = self._arrow_cursor()
+        try:
+            return cursor.fetch_arrow_table()
+        finally:
+            self._soft_close()
+
+    def pandas(self, dtype_backend: str = "pyarrow") -> Any:
+        """Fetch the (remaining) result as a pandas DataFrame - by default with Arrow-backed columns, so the
+        record batches are not copied (see :func:`~sqlalchemy_theseus_dialect.dataframes.arrow_to_pandas`) -
+        and close the result."""
+        from .dataframes import arrow_to_pandas
+
+        return arrow_to_pandas(self.arrow(), dtype_backend=dtype_backend)
+
+    def polars(self) -> Any:
+        """Fetch the (remaining) result as a polars DataFrame, and close the result."""
+        from .dataframes import arrow_to_polars
+
+        return arrow_to_polars(self.arrow())
+
+    def record_batches(self) -> "pa.RecordBatchReader":
+        """Stream the (remaining) result as a :class:`pyarrow.RecordBatchReader`.
+
+        The result is closed once the reader has been exhausted.
+        """
+        import pyarrow as pa
+
+        reader = self._arrow_cursor().fetch_record_batch()
+
+        def batches() -> Iterator["pa.RecordBatch"]:
+            try:
+                yield from reader
+            finally:
+                self._soft_close()
+
+        return pa.RecordBatchReader.from_batches(reader.schema, batches())
+
+    def _reads_columns(self) -> bool:
+        # Whether this result can be read as Arrow columns: it is a plain (unfiltered, not logged) result of one of
+        # our cursors - possibly with rows buffered by SQLAlchemy (the rest are still in the cursor)
+        strategy = self.cursor_strategy
+        return ((type(strategy) is CursorFetchStrategy or type(strategy) is BufferedRowCursorFetchStrategy)
+                and not self._soft_closed
+                and self._unique_filter_state is None
+                and self._row_logging_fn is None
+                and self._metadata._tuplefilter is None
+                and hasattr(self.cursor, "fetch_record_batch"))
+
+    def _column_rows(self, indexes: Sequence[int]) -> Iterator[tuple]:
+        from .rows import column_converter
+
+        buffered: List[tuple] = []
+        if isinstance(self.cursor_strategy, BufferedRowCursorFetchStrategy):
+            buffered = list(self.cursor_strategy._rowbuffer)
+            self.cursor_strategy._rowbuffer.clear()
+        try:
+            for row in buffered:
+                yield tuple(row[index] for index in indexes)
+            for batch in self.cursor.fetch_record_batch():
+                yield from zip(*(column_converter(batch.schema.field(index).type)(batch.column(index))
+                                 for index in indexes))
+        finally:
+            self._soft_close()
+
+    def columns(self, *col_expressions: Any) -> Any:
+        """Like :meth:`CursorResult.columns`, but only the given columns are read from the result's record
+        batches (one batch at a time) and converted to Python values."""
+        if not (col_expressions and self._reads_columns()):
+            return super().columns(*col_expressions)
+
+        metadata = self._metadata._reduce(col_expressions)
+        indexes = metadata._translated_indexes
+        # The reduced metadata picks its columns out of full rows - these rows have only those columns
+        metadata = metadata._make_new_metadata(unpickled=metadata._unpickled,
+                                               processors=[self._metadata._processors[index] for index in indexes],
+                                               keys=metadata._keys,
+                                               keymap=metadata._keymap,
+                                               tuplefilter=None,
+                                               translated_indexes=None,
+                                               safe_for_cache=metadata._safe_for_cache,
+                                               keymap_by_result_column_idx=None
+                                               )
+        result = IteratorResult(metadata, self._column_rows(indexes), raw=self)
+        if self._yield_per:
+            result = result.yield_per(self._yield_per)
+        return result
+
+    def scalars(self, index: Any = 0) -> ScalarResult:
+        """Like :meth:`CursorResult.scalars` - reading only that column of the result's record batches."""
+        if not self._reads_columns():
+            return super().scalars(index)
+        return self.columns(index).scalars()
@@ -0,0 +1,200 @@
+# This module holds the per-engine client-side cache of query results (as Arrow tables).
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Iterator, Optional
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+DEFAULT_RESULT_CACHE_TTL = 60.0
+DEFAULT_RESULT_CACHE_DISK_SIZE = 1 << 30
+
+
+class _Entry:
+    __slots__ = ("expires_at", "nbytes", "table", "path")
+
+    def __init__(self, expires_at: float, nbytes: int, table: Optional["pa.Table"] = None,
+                 path: Optional[str] = None):
+        self.expires_at = expires_at
+        self.nbytes = nbytes
+        self.table = table
+        self.path = path
+
+
+def result_cache_key(operation: Any, parameters: Any) -> Optional[Hashable]:
+    """The cache key for a statement and its bound parameters - or None if they can't be keyed (e.g. Arrow data)."""
+    if not isinstance(operation, str):
+        return None
+    key = (operation, tuple(parameters) if isinstance(parameters, (list, tuple)) else parameters)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class ResultCache:
+    """An LRU cache of query results, held as Arrow tables, bounded by a byte budget.
+
+    Entries expire ``ttl`` seconds after they were stored.  If a ``directory`` is given, results evicted from
+    memory - and results too big for memory - are written to Arrow IPC files there (up to ``max_disk_bytes``),
+    and cache hits on those are served zero-copy from a memory map.  A ``max_bytes`` of zero disables the cache.
+    """
+
+    def __init__(self,
+                 max_bytes: int = 0,
+                 ttl: float = DEFAULT_RESULT_CACHE_TTL,
+                 directory: Optional[str] = None,
+                 max_disk_bytes: int = DEFAULT_RESULT_CACHE_DISK_SIZE,
+                 ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_disk_bytes = max_disk_bytes if directory is not None else 0
+        self._memory: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._disk: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Bumped by invalidate(), so results read before an invalidation are not stored after it
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._directory: Optional[str] = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._directory = tempfile.mkdtemp(prefix="theseus-result-cache-", dir=directory)
+            weakref.finalize(self, shutil.rmtree, self._directory, ignore_errors=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def max_entry_bytes(self) -> int:
+        return max(self.max_bytes, self.max_disk_bytes)
+
+    def __len__(self) -> int:
+        return len(self._memory) + len(self._disk)
+
+    def get(self, key: Hashable) -> Optional["pa.Table"]:
+        import pyarrow as pa
+
+        now = time.monotonic()
+        with self._lock:
+            for tier in (self._memory, self._disk):
+                entry = tier.get(key)
+                if entry is None:
+                    continue
+                if entry.expires_at <= now:
+                    self._remove(tier, key)
+                    continue
+                tier.move_to_end(key)
+                self.hits += 1
+                if entry.table is not None:
+                    return entry.table
+                return pa.ipc.open_file(pa.memory_map(entry.path)).read_all()
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, table: "pa.Table", ttl: Optional[float] = None, generation: Optional[int] = None
+            ) -> None:
+        nbytes = table.nbytes
+        if not self.enabled or nbytes > self.max_entry_bytes:
+            return
+
+        entry = _Entry(time.monotonic() + (self.ttl if ttl is None else ttl), nbytes, table=table)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._remove(self._memory, key)
+            self._remove(self._disk, key)
+            if nbytes <= self.max_bytes:
+                self._memory[key] = entry
+                self.memory_bytes += nbytes
+                while self.memory_bytes > self.max_bytes:
+                    evicted_key, evicted = self._memory.popitem(last=False)
+                    self.memory_bytes -= evicted.nbytes
+                    self._spill(evicted_key, evicted)
+            else:
+                self._spill(key, entry)
+
+    def _spill(self, key: Hashable, entry: _Entry) -> None:
+        # Move an entry out of memory to an Arrow IPC file (or drop it, if there is no disk tier / it doesn't fit)
+        if self._directory is None or entry.nbytes > self.max_disk_bytes or entry.expires_at <= time.monotonic():
+            return
+
+        import pyarrow as pa
+
+        path = os.path.join(self._directory, hashlib.sha256(repr(key).encode()).hexdigest() + ".arrow")
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, entry.table.schema) as writer:
+            writer.write_table(entry.table)
+        entry.table = None
+        entry.path = path
+        self._disk[key] = entry
+        self.disk_bytes += entry.nbytes
+        while self.disk_bytes > self.max_disk_bytes:
+            evicted_key, _ = next(iter(self._disk.items()))
+            self._remove(self._disk, evicted_key)
+
+    def _remove(self, tier: "OrderedDict[Hashable, _Entry]", key: Hashable) -> None:
+        entry = tier.pop(key, None)
+        if entry is None:
+            return
+        if tier is self._memory:
+            self.memory_bytes -= entry.nbytes
+        else:
+            self.disk_bytes -= entry.nbytes
+            try:
+                os.remove(entry.path)
+            except OSError:
+                # e.g. still memory-mapped by a result in use, on Windows - it goes with the cache directory
+                pass
+
+    def caching_reader(self, key: Hashable, reader: "pa.RecordBatchReader", ttl: Optional[float] = None
+                       ) -> "pa.RecordBatchReader":
+        """Pass a result stream through - storing it in the cache once it has been read to the end.
+
+        Results bigger than the cache can hold stop being collected as soon as they outgrow it.
+        """
+        import pyarrow as pa
+
+        generation = self._generation
+
+        def batches() -> Iterator["pa.RecordBatch"]:
+            collected = []
+            nbytes = 0
+            for batch in reader:
+                if collected is not None:
+                    nbytes += batch.nbytes
+                    if nbytes <= self.max_entry_bytes:
+                        collected.append(batch)
+                    else:
+                        collected = None
+                yield batch
+            if collected is not None:
+                self.put(key, pa.Table.from_batches(collected, schema=reader.schema), ttl=ttl, generation=generation)
+
+        return pa.RecordBatchReader.from_batches(reader.schema, batches())
+
+    def invalidate(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._generation += 1
+            for tier in (self._memory, self._disk):
+                for key in list(tier):
+                    self._remove(tier, key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(hits=self.hits,
+                        misses=self.misses,
+                        entries=len(self._memory) + len(self._disk),
+                        memory_bytes=self.memory_bytes,
+                        disk_bytes=self.disk_bytes,
+                        )
@@ -0,0 +1,228 @@
+# This module holds the retry policy, circuit breaker and retry counters used by the dialect's cursors.
+import dataclasses
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, TypeVar
+
+from adbc_driver_manager import AdbcStatusCode
+from adbc_driver_flightsql import dbapi as flight_sql
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, stop_before_delay, wait_exponential, \
+    wait_random
+
+T = TypeVar("T")
+
+# Only transport-level failures are worth retrying - SQL, permission and data errors fail the same way every time
+TRANSIENT_STATUS_CODES = frozenset({AdbcStatusCode.IO})
+
+# URL query parameter name -> RetryPolicy field
+_URL_QUERY_FIELDS = {
+    "retryMaxAttempts": "max_attempts",
+    "retryInitialWait": "initial_wait",
+    "retryMaxWait": "max_wait",
+    "retryJitter": "jitter",
+    "retryDeadline": "deadline",
+    "retryNonIdempotent": "retry_non_idempotent",
+}
+
+
+class CircuitOpenError(flight_sql.OperationalError):
+    """Raised (without contacting the server) while the engine's circuit breaker is open."""
+
+
+def is_transient_error(error: BaseException) -> bool:
+    return (isinstance(error, flight_sql.Error)
+            and not isinstance(error, CircuitOpenError)
+            and getattr(error, "status_code", None) in TRANSIENT_STATUS_CODES)
+
+
+def _parse_bool(value: Any) -> bool:
+    return value if isinstance(value, bool) else str(value).lower() == "true"
+
+
+@dataclasses.dataclass(frozen=True)
+class RetryPolicy:
+    """How (and how long) transient failures are retried.
+
+    ``max_attempts`` includes the first attempt, waits grow exponentially from ``initial_wait`` up to
+    ``max_wait`` (plus up to ``jitter`` seconds of random jitter), and no new attempt is started once
+    ``deadline`` seconds have passed since the first one.  Statements which may write are only retried
+    if ``retry_non_idempotent`` is set.
+    """
+
+    max_attempts: int = 4
+    initial_wait: float = 0.25
+    max_wait: float = 4.0
+    jitter: float = 0.25
+    deadline: float = 15.0
+    retry_non_idempotent: bool = False
+
+    def __post_init__(self) -> None:
+        # Settings may come from URL query strings - so coerce them to the type of their defaults
+        for field in dataclasses.fields(self):
+            value = getattr(self, field.name)
+            value = _parse_bool(value) if isinstance(field.default, bool) else type(field.default)(value)
+            object.__setattr__(self, field.name, value)
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+    def replace(self, **changes: Any) -> "RetryPolicy":
+        return dataclasses.replace(self, **changes)
+
+    @classmethod
+    def from_url_query(cls, query: Dict[str, str]) -> "RetryPolicy":
+        """Build a policy from (and pop its settings out of) a URL query dictionary."""
+        return cls(**{field: query.pop(key) for key, field in _URL_QUERY_FIELDS.items() if key in query})
+
+    def with_execution_options(self, execution_options: Mapping[str, Any]) -> "RetryPolicy":
+        """Apply per-statement overrides: a ``retry_policy`` option, and/or ``retry_<field>`` options."""
+        policy = execution_options.get("retry_policy", self)
+        changes = {field.name: execution_options[f"retry_{field.name}"]
+                   for field in dataclasses.fields(policy)
+                   if f"retry_{field.name}" in execution_options}
+        return policy.replace(**changes) if changes else policy
+
+
+class CircuitBreaker:
+    """Sheds load while the server is unreachable.
+
+    After ``failure_threshold`` consecutive transient failures the circuit opens, and calls fail immediately
+    with :class:`CircuitOpenError` for ``reset_timeout`` seconds.  After that a single trial call is let through
+    (half-open) - its success closes the circuit again, its failure re-opens it.
+    A ``failure_threshold`` of zero disables the breaker.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self._opened_at >= self.reset_timeout else "open"
+
+    def before_call(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at >= self.reset_timeout and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        raise CircuitOpenError("Circuit breaker is open - the Theseus server was unreachable, failing fast",
+                               status_code=AdbcStatusCode.IO)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Record a transient failure, returning True if it opened the circuit."""
+        with self._lock:
+            self._failures += 1
+            reopened = self._trial_in_flight
+            self._trial_in_flight = False
+            if reopened or (self.failure_threshold > 0 and self._failures >= self.failure_threshold):
+                was_closed = self._opened_at is None
+                self._opened_at = time.monotonic()
+                return was_closed or reopened
+            return False
+
+
+class RetryStats:
+    """Thread-safe counters of how statements fared under the retry policy."""
+
+    _COUNTERS = ("calls", "retries", "transient_failures", "permanent_failures", "circuit_rejections",
+                 "circuit_opens")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self._COUNTERS, 0)
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[counter] += amount
+
+    def __getattr__(self, name: str) -> int:
+        if name in self._COUNTERS:
+            return self._counts[name]
+        raise AttributeError(name)
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = dict.fromkeys(self._COUNTERS, 0)
+
+
+class Retrier:
+    """The per-engine retry machinery: a default policy, a circuit breaker and the retry counters."""
+
+    def __init__(self,
+                 policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 ) -> None:
+        self.policy = policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.stats = RetryStats()
+
+    @classmethod
+    def from_url_query(cls, query: Dict[str, str]) -> "Retrier":
+        """Build a retrier from (and pop its settings out of) a URL query dictionary."""
+        circuit_breaker = CircuitBreaker(failure_threshold=int(query.pop("circuitBreakerThreshold", 5)),
+                                         reset_timeout=float(query.pop("circuitBreakerResetTimeout", 30.0))
+                                         )
+        return cls(policy=RetryPolicy.from_url_query(query), circuit_breaker=circuit_breaker)
+
+    def call(self,
+             fn: Callable[..., T],
+             *args: Any,
+             idempotent: bool = True,
+             policy: Optional[RetryPolicy] = None,
+             **kwargs: Any,
+             ) -> T:
+        policy = policy or self.policy
+        max_attempts = policy.max_attempts if (idempotent or policy.retry_non_idempotent) else 1
+
+        def attempt() -> T:
+            self.stats.increment("calls")
+            try:
+                self.circuit_breaker.before_call()
+            except CircuitOpenError:
+                self.stats.increment("circuit_rejections")
+                raise
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if is_transient_error(e):
+                    self.stats.increment("transient_failures")
+                    if self.circuit_breaker.record_failure():
+                        self.stats.increment("circuit_opens")
+                else:
+                    # The server answered - so it is up, even if the statement failed
+                    self.stats.increment("permanent_failures")
+                    self.circuit_breaker.record_success()
+                raise
+            self.circuit_breaker.record_success()
+            return result
+
+        retrying = Retrying(stop=stop_after_attempt(max_attempts) | stop_before_delay(policy.deadline),
+                            wait=(wait_exponential(multiplier=policy.initial_wait,
+                                                   min=policy.initial_wait,
+                                                   max=policy.max_wait)
+                                  + wait_random(0, policy.jitter)),
+                            retry=retry_if_exception(is_transient_error),
+                            before_sleep=lambda retry_state: self.stats.increment("retries"),
+                            reraise=True,
+                            )
+        return retrying(attempt)
@@ -0,0 +1,119 @@
+# This module holds the conversion of Arrow results to Python rows.
+import datetime
+import decimal
+import functools
+import itertools
+from typing import Any, Callable, List, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Each column is converted as a whole (mostly in C, via NumPy) and the rows zipped together afterwards - rather than
+# converting value by value.
+
+
+def _patch_nulls(values: List[Any], array: pa.Array) -> List[Any]:
+    for index in np.flatnonzero(array.is_null().to_numpy(zero_copy_only=False)).tolist():
+        values[index] = None
+    return values
+
+
+def _convert_numeric(array: pa.Array) -> List[Any]:
+    # NumPy would turn nulls into NaN (and integers into floats) - so nulls are filled in, and put back afterwards
+    if array.null_count == 0:
+        return array.to_numpy(zero_copy_only=False).tolist()
+    return _patch_nulls(pc.fill_null(array, False if pa.types.is_boolean(array.type) else 0)
+                        .to_numpy(zero_copy_only=False).tolist(),
+                        array)
+
+
+def _convert_half_float(array: pa.Array) -> List[Any]:
+    # Arrow can't fill a half float's nulls in (it takes no Python scalar) - so it's widened first
+    return _convert_numeric(array.cast(pa.float32()))
+
+
+def _convert_object(array: pa.Array) -> List[Any]:
+    # Strings, dates and (micro-/milli-)second timestamps - NumPy hands these back as Python objects, nulls as None
+    return array.to_numpy(zero_copy_only=False).tolist()
+
+
+def _convert_pylist(array: pa.Array) -> List[Any]:
+    return array.to_pylist()
+
+
+def _timestamp_tz_converter(data_type: pa.TimestampType) -> Callable[[pa.Array], List[Any]]:
+    if data_type.unit == "ns":
+        return _convert_pylist
+    tz = pa.lib.string_to_tzinfo(data_type.tz)
+    naive_type = pa.timestamp(data_type.unit)
+    utc = datetime.timezone.utc
+
+    def convert(array: pa.Array) -> List[Any]:
+        # Converted as naive UTC datetimes, then moved to the column's time zone
+        return [None if value is None else value.replace(tzinfo=utc).astimezone(tz)
+                for value in array.cast(naive_type).to_numpy(zero_copy_only=False).tolist()]
+
+    return convert
+
+
+def _decimal_converter(data_type: pa.Decimal128Type) -> Callable[[pa.Array], List[Any]]:
+    if not isinstance(data_type, pa.Decimal128Type) or data_type.precision > 18:
+        return _convert_pylist
+    exponent = -data_type.scale
+
+    def convert(array: pa.Array) -> List[Any]:
+        # Up to 18 digits the unscaled value fits the low (little-endian) 64 bits of each 128-bit value
+        unscaled = np.frombuffer(array.buffers()[1], dtype="<i8")[2 * array.offset:2 * (array.offset + len(array)):2]
+        values = [decimal.Decimal(value).scaleb(exponent) for value in unscaled.tolist()]
+        return _patch_nulls(values, array) if array.null_count else values
+
+    return convert
+
+
+def _dictionary_converter(data_type: pa.DictionaryType) -> Callable[[pa.Array], List[Any]]:
+    convert_values = column_converter(data_type.value_type)
+
+    def convert(array: pa.Array) -> List[Any]:
+        # Each distinct value is converted once
+        values = convert_values(array.dictionary)
+        indices = array.indices
+        if indices.null_count == 0:
+            return [values[index] for index in indices.to_numpy().tolist()]
+        return [None if index is None else values[index] for index in indices.to_pylist()]
+
+    return convert
+
+
+@functools.lru_cache(maxsize=None)
+def column_converter(data_type: pa.DataType) -> Callable[[pa.Array], List[Any]]:
+    """The function converting an Arrow array of ``data_type`` to a list of Python values."""
+    if pa.types.is_float16(data_type):
+        return _convert_half_float
+    if pa.types.is_integer(data_type) or pa.types.is_floating(data_type) or pa.types.is_boolean(data_type):
+        return _convert_numeric
+    if pa.types.is_string(data_type) or pa.types.is_large_string(data_type) or pa.types.is_date32(data_type):
+        return _convert_object
+    if pa.types.is_timestamp(data_type):
+        if data_type.tz is not None:
+            return _timestamp_tz_converter(data_type)
+        return _convert_object if data_type.unit != "ns" else _convert_pylist
+    if pa.types.is_decimal(data_type):
+        return _decimal_converter(data_type)
+    if pa.types.is_dictionary(data_type):
+        return _dictionary_converter(data_type)
+    return _convert_pylist
+
+
+def _convert_column(column: Union[pa.Array, pa.ChunkedArray]) -> List[Any]:
+    convert = column_converter(column.type)
+    if isinstance(column, pa.ChunkedArray):
+        return list(itertools.chain.from_iterable(convert(chunk) for chunk in column.chunks))
+    return convert(column)
+
+
+def arrow_rows(data: Union[pa.RecordBatch, pa.Table]) -> List[tuple]:
+    """Convert a record batch (or table) to a list of row tuples, a column at a time."""
+    if data.num_columns == 0:
+        return [()] * data.num_rows
+    return list(zip(*[_convert_column(column) for column in data.columns]))
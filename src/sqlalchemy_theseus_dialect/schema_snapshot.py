@@ -0,0 +1,149 @@
+# This module holds the on-disk snapshot of reflected schemas - so a new process needn't reflect them again.
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Bumped whenever the layout of the snapshot file changes - files of any other version are ignored
+SNAPSHOT_FORMAT_VERSION = 1
+
+# A column as the catalog reports it: (column_name, data_type, is_nullable, column_default)
+RawColumn = Tuple[str, str, str, Optional[str]]
+
+
+class SnapshotTable:
+    __slots__ = ("table_type", "fingerprint", "columns")
+
+    def __init__(self, table_type: str, fingerprint: str, columns: List[RawColumn]) -> None:
+        self.table_type = table_type
+        self.fingerprint = fingerprint
+        self.columns = columns
+
+    def as_json(self) -> Dict[str, Any]:
+        return dict(type=self.table_type,
+                    fingerprint=self.fingerprint,
+                    columns=[list(column) for column in self.columns])
+
+    @classmethod
+    def from_json(cls, entry: Dict[str, Any]) -> "SnapshotTable":
+        return cls(entry["type"], entry["fingerprint"], [tuple(column) for column in entry["columns"]])
+
+
+class SchemaSnapshot:
+    """The tables and views of each reflected schema, with their columns - kept in a local JSON file at ``path``.
+
+    The file is read on first use.  Each schema is then checked against the server's fingerprints of its tables
+    (one catalog query): only the tables which are new, or whose fingerprint changed, have their columns fetched
+    again, and dropped tables are dropped from the snapshot (which :meth:`save` then writes back).  A file of
+    another format version, or taken from another server, is ignored (and replaced).  Without a ``path`` there
+    is no snapshot.
+    """
+
+    def __init__(self, path: Optional[str] = None, server: str = "") -> None:
+        self.path = path
+        self.server = server
+        self._schemas: Optional[Dict[str, Dict[str, SnapshotTable]]] = None
+        # Whether the snapshot in memory has changed since it was read (or saved)
+        self._dirty = False
+        self.tables_loaded = 0
+        self.tables_refreshed = 0
+        self.tables_dropped = 0
+        self.saves = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def _load(self) -> Dict[str, Dict[str, SnapshotTable]]:
+        if self._schemas is None:
+            self._schemas = {}
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    content = json.load(f)
+            except (OSError, ValueError):
+                # No snapshot yet (or an unreadable one) - it is rebuilt from the server
+                return self._schemas
+            if isinstance(content, dict) and content.get("version") == SNAPSHOT_FORMAT_VERSION \
+                    and content.get("server") == self.server:
+                try:
+                    self._schemas = {schema: {name: SnapshotTable.from_json(entry) for name, entry in tables.items()}
+                                     for schema, tables in content.get("schemas", {}).items()}
+                except (AttributeError, KeyError, TypeError):
+                    pass
+        return self._schemas
+
+    def refresh(self,
+                schema: str,
+                fingerprints: Iterable[Tuple[str, str, str]],
+                load_columns: Callable[[List[str]], Dict[str, List[RawColumn]]],
+                ) -> Dict[str, SnapshotTable]:
+        """Bring a schema's snapshot up to date with the server.
+
+        ``fingerprints`` are the server's ``(table_name, table_type, fingerprint)`` of every table (and view) in
+        the schema; ``load_columns(table_names)`` fetches the columns of the given tables.  Returns the schema's
+        tables.
+        """
+        with self._lock:
+            snapshot = self._load()
+            tables = dict(snapshot.get(schema, {}))
+            current = {name: (table_type, fingerprint) for name, table_type, fingerprint in fingerprints}
+
+            dropped = [name for name in tables if name not in current]
+            for name in dropped:
+                del tables[name]
+            stale = [name for name, (table_type, fingerprint) in current.items()
+                     if name not in tables
+                     or tables[name].fingerprint != fingerprint
+                     or tables[name].table_type != table_type]
+            if stale:
+                columns = load_columns(stale)
+                for name in stale:
+                    table_type, fingerprint = current[name]
+                    tables[name] = SnapshotTable(table_type, fingerprint, columns.get(name, []))
+
+            self.tables_loaded += len(current) - len(stale)
+            self.tables_refreshed += len(stale)
+            self.tables_dropped += len(dropped)
+            snapshot[schema] = tables
+            self._dirty = self._dirty or bool(stale or dropped)
+            return tables
+
+    def save(self) -> None:
+        """Write the snapshot to its file, if it changed - raising :class:`OSError` if it couldn't be."""
+        with self._lock:
+            if not self._dirty:
+                return
+            content = dict(version=SNAPSHOT_FORMAT_VERSION,
+                           server=self.server,
+                           schemas={schema: {name: table.as_json() for name, table in tables.items()}
+                                    for schema, tables in self._schemas.items()})
+            self._write(content)
+            self._dirty = False
+            self.saves += 1
+
+    def _write(self, content: Dict[str, Any]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # Written aside and renamed into place - so other processes never read a half-written snapshot
+        descriptor, temporary_path = tempfile.mkstemp(prefix=".theseus-schema-", suffix=".json", dir=directory)
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+                json.dump(content, f)
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(tables=sum(len(tables) for tables in (self._schemas or {}).values()),
+                        tables_loaded=self.tables_loaded,
+                        tables_refreshed=self.tables_refreshed,
+                        tables_dropped=self.tables_dropped,
+                        saves=self.saves,
+                        )
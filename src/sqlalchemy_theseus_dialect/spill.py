@@ -0,0 +1,58 @@
+# This module holds the spilling of oversized results to memory-mapped Arrow IPC files.
+import os
+import tempfile
+import weakref
+from typing import Optional
+
+import pyarrow as pa
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def read_all(reader: pa.RecordBatchReader, spill_threshold: Optional[int] = None,
+             directory: Optional[str] = None) -> pa.Table:
+    """Read a record batch stream into a table - holding at most ``spill_threshold`` bytes of it in memory.
+
+    Once the batches read outgrow the threshold, the rest of the stream is written to a temporary Arrow IPC file
+    (in ``directory`` - by default, the system's temporary directory) and served from a memory map of it: its
+    pages are backed by the file, so the OS can drop them from memory rather than the process running out of it.
+    The file is deleted as soon as it is mapped, so its disk space is freed along with the table (POSIX) - or
+    it is deleted once the table is garbage-collected.  Without a threshold, the whole stream is read into memory.
+    """
+    if not spill_threshold:
+        return reader.read_all()
+
+    batches = []
+    nbytes = 0
+    for batch in reader:
+        batches.append(batch)
+        nbytes += batch.nbytes
+        if nbytes > spill_threshold:
+            break
+    else:
+        return pa.Table.from_batches(batches, schema=reader.schema)
+
+    descriptor, path = tempfile.mkstemp(prefix="theseus-spill-", suffix=".arrow", dir=directory)
+    os.close(descriptor)
+    try:
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+        spilled = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    except BaseException:
+        _remove(path)
+        raise
+
+    table = pa.Table.from_batches(batches + spilled.to_batches(), schema=reader.schema)
+    try:
+        # The mapping outlives the file's directory entry
+        os.remove(path)
+    except OSError:
+        # e.g. a mapped file can't be deleted on Windows - so it goes once the table does
+        weakref.finalize(table, _remove, path)
+    return table
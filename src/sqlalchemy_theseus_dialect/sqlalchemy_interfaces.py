@@ -1,13 +1,11 @@
 # This module is used to bridge the gap between the different versions of SQLAlchemy.
-import importlib_metadata
+from enum import Flag, auto
 from typing import TypedDict, Optional, Any, Dict, List
+from sqlalchemy import __version__ as package_version
 from sqlalchemy.sql.type_api import TypeEngine
 
-# Get the version of the package
-package_name = "sqlalchemy"
-package_version = importlib_metadata.version(package_name)
-
-# Split the version into major, minor, and patch components
+# Split the version into major, minor, and patch components (the version comes from the SQLAlchemy package itself,
+# rather than a package metadata lookup - which is slow, at import time)
 major, minor, patch = map(int, package_version.split('.')[:3])
 
 
@@ -16,7 +14,31 @@ if major > 1:
     from sqlalchemy.engine.interfaces import ReflectedColumn, ReflectedPrimaryKeyConstraint, \
         ReflectedForeignKeyConstraint, \
         ReflectedCheckConstraint
+    from sqlalchemy.engine.reflection import ObjectKind, ObjectScope
 else:
+    class ObjectKind(Flag):
+        """Enumerator that indicates which kind of object to return when calling
+        the ``get_multi`` methods.
+        """
+
+        TABLE = auto()
+        VIEW = auto()
+        MATERIALIZED_VIEW = auto()
+
+        ANY_VIEW = VIEW | MATERIALIZED_VIEW
+        ANY = TABLE | VIEW | MATERIALIZED_VIEW
+
+
+    class ObjectScope(Flag):
+        """Enumerator that indicates which scope to use when calling
+        the ``get_multi`` methods.
+        """
+
+        DEFAULT = auto()
+        TEMPORARY = auto()
+        ANY = DEFAULT | TEMPORARY
+
+
     class ReflectedComputed(TypedDict):
         """Represent the reflected elements of a computed column, corresponding
         to the :class:`_schema.Computed` construct.
@@ -0,0 +1,63 @@
+# This module holds the per-connection cache of server-side prepared statements.
+from collections import OrderedDict
+from typing import Optional
+
+from adbc_driver_manager import AdbcStatement
+
+DEFAULT_PREPARED_STATEMENT_CACHE_SIZE = 100
+
+
+class PreparedStatementCache:
+    """An LRU of prepared ADBC statements for one connection, keyed by SQL text.
+
+    Statements are leased out to a cursor with :meth:`checkout` and handed back with
+    :meth:`checkin` once the cursor is done with them, so a statement is never shared
+    by two open cursors.  Statements evicted from the cache are closed, which releases
+    the prepared statement on the server.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_PREPARED_STATEMENT_CACHE_SIZE) -> None:
+        self.capacity = capacity
+        self._statements: "OrderedDict[str, AdbcStatement]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def __contains__(self, operation: str) -> bool:
+        return operation in self._statements
+
+    def checkout(self, operation: str) -> Optional[AdbcStatement]:
+        statement = self._statements.pop(operation, None)
+        if statement is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return statement
+
+    def checkin(self, operation: str, statement: AdbcStatement) -> None:
+        if self.capacity <= 0:
+            statement.close()
+            return
+
+        previous = self._statements.pop(operation, None)
+        if previous is not None:
+            previous.close()
+        self._statements[operation] = statement
+
+        while len(self._statements) > self.capacity:
+            _, evicted = self._statements.popitem(last=False)
+            evicted.close()
+
+    def clear(self) -> None:
+        while self._statements:
+            _, statement = self._statements.popitem(last=False)
+            try:
+                statement.close()
+            except Exception:
+                # The connection may already be gone - there is nothing left to release
+                pass
+
+    def close(self) -> None:
+        self.clear()
@@ -0,0 +1,17 @@
+# This module holds the (driver-independent) classification of SQL statement text.
+import re
+from typing import Any
+
+# Statements that only read, and so are always safe to run again
+_IDEMPOTENT_STATEMENT = re.compile(r"^\s*\(?\s*(SELECT|WITH|SHOW|DESCRIBE|EXPLAIN|VALUES)\b", re.IGNORECASE)
+
+# Textual statements which (may) change the catalog
+_DDL_STATEMENT = re.compile(r"^\s*(CREATE|DROP|ALTER|RENAME)\b", re.IGNORECASE)
+
+
+def is_idempotent_statement(operation: Any) -> bool:
+    return isinstance(operation, str) and _IDEMPOTENT_STATEMENT.match(operation) is not None
+
+
+def is_ddl_statement(operation: Any) -> bool:
+    return isinstance(operation, str) and _DDL_STATEMENT.match(operation) is not None
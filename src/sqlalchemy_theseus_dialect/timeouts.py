@@ -0,0 +1,101 @@
+# This module holds the statement timeouts - one watchdog thread cancels every statement which overruns its timeout.
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from adbc_driver_flightsql import dbapi as flight_sql
+from adbc_driver_manager import AdbcStatusCode
+
+# Cancelled deadlines are only dropped from the watchdog's heap when they come due - unless they pile up past this
+_COMPACT_THRESHOLD = 1024
+
+
+class StatementTimeoutError(flight_sql.OperationalError):
+    """Raised when a statement - its execution, or the fetch of its result - ran past its timeout, and was
+    cancelled on the server."""
+
+
+class Deadline:
+    __slots__ = ("when", "callback", "args", "cancelled")
+
+    def __init__(self, when: float, callback: Callable[..., Any], args: Tuple[Any, ...]) -> None:
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+
+class Watchdog:
+    """Calls callbacks once their deadlines pass - all on one daemon thread (started on first use), rather than
+    a timer thread per statement."""
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, Deadline]] = []
+        self._sequence = itertools.count()
+        self._cancelled = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> Deadline:
+        """Call ``callback(*args)`` in ``delay`` seconds (unless the returned deadline is cancelled first)."""
+        deadline = Deadline(time.monotonic() + delay, callback, args)
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="theseus-watchdog", daemon=True)
+                self._thread.start()
+            heapq.heappush(self._heap, (deadline.when, next(self._sequence), deadline))
+            # Only the earliest deadline changes how long the watchdog sleeps
+            if self._heap[0][2] is deadline:
+                self._condition.notify()
+        return deadline
+
+    def cancel(self, deadline: Deadline) -> None:
+        with self._condition:
+            if deadline.cancelled:
+                return
+            deadline.cancelled = True
+            self._cancelled += 1
+            if self._cancelled > _COMPACT_THRESHOLD and self._cancelled * 2 > len(self._heap):
+                self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    while self._heap and self._heap[0][2].cancelled:
+                        heapq.heappop(self._heap)
+                        self._cancelled -= 1
+                    if self._heap and self._heap[0][0] <= time.monotonic():
+                        _, _, deadline = heapq.heappop(self._heap)
+                        # (so a late cancel() doesn't count it as a cancelled entry still on the heap)
+                        deadline.cancelled = True
+                        break
+                    self._condition.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+            try:
+                deadline.callback(*deadline.args)
+            except Exception:
+                # e.g. the statement finished (and was closed) just as it was cancelled - nothing more to do
+                pass
+
+
+# The watchdog shared by every engine's statements
+WATCHDOG = Watchdog()
+
+
+def timeout_from(value: Any) -> Optional[float]:
+    """Parse a timeout setting (in seconds) - None, or zero, meaning no timeout."""
+    if value is None:
+        return None
+    value = float(value)
+    if value < 0:
+        raise ValueError(f"Invalid timeout: {value} - must be zero (no timeout) or more")
+    return value or None
+
+
+def timeout_error(timeout: float) -> StatementTimeoutError:
+    return StatementTimeoutError(f"Statement cancelled - it ran past its timeout of {timeout:g} seconds",
+                                 status_code=AdbcStatusCode.CANCELLED)
@@ -0,0 +1,176 @@
+# This module holds the gRPC/Flight transport settings of an engine's connections, and the keepalive of idle ones.
+import dataclasses
+import threading
+import time
+import weakref
+from typing import Any, Dict, Hashable, Set
+
+# URL query parameter name -> TransportOptions field
+_URL_QUERY_FIELDS = {
+    "useEncryption": "use_encryption",
+    "disableCertificateVerification": "disable_certificate_verification",
+    "maxMessageSize": "max_message_size",
+    "connectTimeout": "connect_timeout",
+    "queryTimeout": "query_timeout",
+    "fetchTimeout": "fetch_timeout",
+    "updateTimeout": "update_timeout",
+    "keepaliveInterval": "keepalive_interval",
+}
+
+_BOOLEAN_VALUES = {"true": True, "false": False, "1": True, "0": False, "yes": True, "no": False}
+
+# (not in the driver's DatabaseOptions enum - but the driver takes it)
+_CONNECT_TIMEOUT_OPTION = "adbc.flight.sql.rpc.timeout_seconds.connect"
+
+
+def _parse_bool(name: str, value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    parsed = _BOOLEAN_VALUES.get(str(value).strip().lower())
+    if parsed is None:
+        raise ValueError(f"Invalid {name}: {value} - must be True or False")
+    return parsed
+
+
+@dataclasses.dataclass(frozen=True)
+class TransportOptions:
+    """How an engine's connections talk to the gateway - set with URL query parameters, and passed to the Flight
+    SQL driver as database options.
+
+    ``max_message_size`` (bytes) is the largest gRPC message sent or received - e.g. a record batch.  The
+    ``*_timeout`` settings (seconds) bound each RPC of connecting, executing a query, fetching a result stream,
+    and executing an update.  With a ``keepalive_interval`` (seconds), pooled connections left idle that long are
+    pinged - so load balancers and NATs don't drop them silently - and a connection which fails its ping is
+    replaced on its next checkout.  Zero means the driver's default (no limit, no timeout, no keepalive).
+    """
+
+    use_encryption: bool = False
+    disable_certificate_verification: bool = False
+    max_message_size: int = 0
+    connect_timeout: float = 0.0
+    query_timeout: float = 0.0
+    fetch_timeout: float = 0.0
+    update_timeout: float = 0.0
+    keepalive_interval: float = 0.0
+
+    def __post_init__(self) -> None:
+        # Settings may come from URL query strings - so coerce them to the type of their defaults
+        for field in dataclasses.fields(self):
+            value = getattr(self, field.name)
+            if isinstance(field.default, bool):
+                value = _parse_bool(field.name, value)
+            else:
+                try:
+                    value = type(field.default)(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Invalid {field.name}: {value} - must be a number") from None
+                if value < 0:
+                    raise ValueError(f"Invalid {field.name}: {value} - must be zero (the default) or more")
+            object.__setattr__(self, field.name, value)
+
+    @classmethod
+    def from_url_query(cls, query: Dict[str, str]) -> "TransportOptions":
+        """Build the options from (and pop them out of) a URL query dictionary - so they are not sent as RPC call
+        headers."""
+        return cls(**{field: query.pop(key) for key, field in _URL_QUERY_FIELDS.items() if key in query})
+
+    @property
+    def protocol(self) -> str:
+        return "grpc+tls" if self.use_encryption else "grpc"
+
+    def database_options(self) -> Dict[str, str]:
+        from adbc_driver_flightsql import DatabaseOptions
+
+        options = {DatabaseOptions.TLS_SKIP_VERIFY.value: str(self.disable_certificate_verification).lower()}
+        if self.max_message_size:
+            options[DatabaseOptions.WITH_MAX_MSG_SIZE.value] = str(self.max_message_size)
+        for option, timeout in ((_CONNECT_TIMEOUT_OPTION, self.connect_timeout),
+                                (DatabaseOptions.TIMEOUT_QUERY.value, self.query_timeout),
+                                (DatabaseOptions.TIMEOUT_FETCH.value, self.fetch_timeout),
+                                (DatabaseOptions.TIMEOUT_UPDATE.value, self.update_timeout)):
+            if timeout:
+                options[option] = str(timeout)
+        return options
+
+
+class ConnectionKeepalive:
+    """Pings an engine's pooled connections once they have been idle (checked in) for ``interval`` seconds - and
+    every ``interval`` seconds after that, while they stay idle - from one background thread.
+
+    The pool reports its checkins, checkouts and closes; a connection is never handed out (or closed) while its
+    ping is in flight.  Connections only need a ``ping()`` method.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        # Idle connections -> when they were last used (or pinged)
+        self._idle: "weakref.WeakKeyDictionary[Any, float]" = weakref.WeakKeyDictionary()
+        self._pinging: Set[Hashable] = set()
+        self._failed: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self._condition = threading.Condition()
+        self.pings = 0
+        self.failures = 0
+        self._stop = threading.Event()
+        thread = threading.Thread(target=ConnectionKeepalive._run,
+                                  args=(weakref.ref(self), interval, self._stop),
+                                  name="theseus-keepalive",
+                                  daemon=True)
+        thread.start()
+        weakref.finalize(self, self._stop.set)
+
+    def checked_in(self, connection: Any) -> None:
+        with self._condition:
+            self._idle[connection] = time.monotonic()
+
+    def checked_out(self, connection: Any) -> bool:
+        """Take a connection out of the idle ones - returning False if it failed its last ping."""
+        with self._condition:
+            while connection in self._pinging:
+                self._condition.wait()
+            self._idle.pop(connection, None)
+            failed = connection in self._failed
+            self._failed.discard(connection)
+            return not failed
+
+    def closed(self, connection: Any) -> None:
+        self.checked_out(connection)
+
+    def ping_idle(self) -> None:
+        """Ping every connection which has been idle for the interval (or more)."""
+        now = time.monotonic()
+        with self._condition:
+            due = [connection for connection, since in self._idle.items() if now - since >= self.interval]
+            for connection in due:
+                del self._idle[connection]
+                self._pinging.add(connection)
+
+        for connection in due:
+            try:
+                connection.ping()
+                alive = True
+            except Exception:
+                alive = False
+            with self._condition:
+                self._pinging.discard(connection)
+                self.pings += 1
+                if alive:
+                    self._idle[connection] = time.monotonic()
+                else:
+                    self.failures += 1
+                    self._failed.add(connection)
+                self._condition.notify_all()
+
+    @staticmethod
+    def _run(keepalive_ref: "weakref.ref[ConnectionKeepalive]", interval: float, stop: threading.Event) -> None:
+        # Holds the keepalive only while pinging - so it (and its engine) can still be garbage-collected.  Waking up
+        # twice an interval, no connection stays idle much longer than the interval without a ping.
+        while not stop.wait(interval / 2):
+            keepalive = keepalive_ref()
+            if keepalive is None:
+                return
+            keepalive.ping_idle()
+            del keepalive
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return dict(idle_connections=len(self._idle), pings=self.pings, failures=self.failures)
@@ -0,0 +1,71 @@
+# This module holds the Theseus type system - the SQLAlchemy types of reflected columns.
+import functools
+import re
+from typing import Any, Dict, Tuple, Type
+
+from sqlalchemy import types as sqltypes
+from sqlalchemy.types import TypeEngine
+
+# A reflected data type: its name (e.g. "DECIMAL", "TIMESTAMP WITH TIME ZONE") and optional parameters ("18, 2")
+_DATA_TYPE = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_ ]*?)\s*(?:\(\s*([^)]*?)\s*\))?\s*$")
+
+# The SQLAlchemy type (and any fixed keyword arguments) for each data type name Theseus reports
+_REFLECTED_TYPES: Dict[str, Tuple[Type[TypeEngine], Dict[str, Any]]] = {
+    "VARCHAR": (sqltypes.String, {}),
+    "CHAR": (sqltypes.CHAR, {}),
+    "TEXT": (sqltypes.Text, {}),
+    "INTEGER": (sqltypes.Integer, {}),
+    "INT": (sqltypes.Integer, {}),
+    "BIGINT": (sqltypes.BigInteger, {}),
+    "SMALLINT": (sqltypes.SmallInteger, {}),
+    "TINYINT": (sqltypes.SmallInteger, {}),
+    "DATE": (sqltypes.Date, {}),
+    "DATETIME": (sqltypes.DateTime, {}),
+    "TIMESTAMP": (sqltypes.TIMESTAMP, {}),
+    "TIMESTAMP WITH TIME ZONE": (sqltypes.TIMESTAMP, dict(timezone=True)),
+    "TIMESTAMPTZ": (sqltypes.TIMESTAMP, dict(timezone=True)),
+    "TIME": (sqltypes.TIME, {}),
+    "DECIMAL": (sqltypes.Numeric, {}),
+    "NUMERIC": (sqltypes.Numeric, {}),
+    "DOUBLE": (sqltypes.Float, {}),
+    "REAL": (sqltypes.REAL, {}),
+    "FLOAT": (sqltypes.Float, {}),
+    "BOOLEAN": (sqltypes.Boolean, {}),
+    "BLOB": (sqltypes.LargeBinary, {}),
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_data_type(data_type: str) -> Tuple[Type[TypeEngine], Tuple[int, ...], Tuple[Tuple[str, Any], ...]]:
+    match = _DATA_TYPE.match(data_type)
+    if match is None:
+        raise ValueError(f"Unsupported column type: {data_type}")
+    name = " ".join(match.group(1).upper().split())
+    args = tuple(int(arg) for arg in match.group(2).split(",")) if match.group(2) else ()
+
+    type_class, kwargs = _REFLECTED_TYPES.get(name, (None, {}))
+    if type_class is None:
+        # Try a catch-all for any other data types
+        type_class = getattr(sqltypes, name, None)
+        if not (isinstance(type_class, type) and issubclass(type_class, TypeEngine)):
+            raise ValueError(f"Unsupported column type: {data_type}")
+    return type_class, args[:_positional_arguments(type_class)], tuple(kwargs.items())
+
+
+def _positional_arguments(type_class: Type[TypeEngine]) -> int:
+    # How many of a data type's arguments its SQLAlchemy type takes positionally - a length, or a precision (and
+    # scale).  The others are dropped: e.g. TIMESTAMP(3)'s fractional seconds precision isn't TIMESTAMP's timezone
+    if issubclass(type_class, sqltypes.Float):
+        return 1
+    if issubclass(type_class, sqltypes.Numeric):
+        return 2
+    if issubclass(type_class, (sqltypes.String, sqltypes._Binary)):
+        return 1
+    return 0
+
+
+def reflected_type(data_type: str) -> TypeEngine:
+    """The SQLAlchemy type for a data type as reported by the catalog - keeping e.g. ``DECIMAL(18, 2)``'s precision
+    and scale, and ``VARCHAR(10)``'s length."""
+    type_class, args, kwargs = _parse_data_type(data_type)
+    return type_class(*args, **dict(kwargs))
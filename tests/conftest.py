@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import registry
+
+from flight_sql_server import serve
+
+# (so the tests run against the source tree, installed or not)
+registry.register("theseus", "sqlalchemy_theseus_dialect", "TheseusDialect")
+registry.register("theseus.async", "sqlalchemy_theseus_dialect.aio", "TheseusAsyncDialect")
+
+
+@pytest.fixture
+def server():
+    """An in-process Flight SQL stand-in server, with a 1,000-row ``session.fake`` table - which interrupts the
+    queries its clients cancel."""
+    server = serve(batch_size=100, interrupt_cancelled=True)
+    server.db.execute("CREATE TABLE session.fake AS "
+                      "SELECT range::INTEGER AS id, 'n' || range AS name, range * 1.5 AS val FROM range(1000)")
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def url(server) -> str:
+    return f"localhost:{server.port}/?useEncryption=False&disableCertificateVerification=False"
+
+
+@pytest.fixture
+def engine(url):
+    engine = create_engine(f"theseus://{url}")
+    yield engine
+    engine.dispose()
@@ -0,0 +1,59 @@
+import asyncio
+import time
+import warnings
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+
+def test_async_engine(url):
+    async def run():
+        engine = create_async_engine(f"theseus+async://{url}")
+        try:
+            async with engine.connect() as conn:
+                assert await conn.scalar(text("SELECT count(*) FROM session.fake")) == 1000
+                result = await conn.stream(text("SELECT id FROM session.fake ORDER BY id"))
+                assert [row[0] async for row in result] == list(range(1000))
+        finally:
+            await engine.dispose()
+
+    with warnings.catch_warnings():
+        # (e.g. the statement cache being disabled, or the DBAPI loaded the deprecated way)
+        warnings.simplefilter("error", exc.SAWarning)
+        warnings.simplefilter("error", exc.SADeprecationWarning)
+        asyncio.run(run())
+
+
+def test_cancelled_coroutine_cancels_statement(server, url):
+    server.query_latency = 3.0
+
+    async def run():
+        engine = create_async_engine(f"theseus+async://{url}")
+        try:
+            async def query() -> None:
+                async with engine.connect() as conn:
+                    await conn.scalar(text("SELECT 1"))
+
+            task = asyncio.ensure_future(query())
+            await asyncio.sleep(0.3)
+            started = time.monotonic()
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            # The statement is cancelled on the server - the coroutine doesn't wait for it to finish
+            assert time.monotonic() - started < 1.5
+            # (the server notes the cancellation once its handler unwinds - which may be just after we return)
+            deadline = time.monotonic() + 5.0
+            while server.calls.get("Cancelled", 0) == 0 and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+            assert server.calls.get("Cancelled", 0) == 1
+
+            server.query_latency = 0.0
+            async with engine.connect() as conn:
+                assert await conn.scalar(text("SELECT 2")) == 2
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,28 @@
+from sqlalchemy import create_engine, exc, text
+
+from flight_sql_server import serve
+
+
+def test_pooled_connections_to_ejected_gateway_are_replaced(server, url):
+    other = serve()
+    engine = create_engine(f"theseus://{url}&host=localhost:{other.port}&retryInitialWait=0.01", pool_size=6)
+    try:
+        connections = [engine.connect() for _ in range(6)]
+        for connection in connections:
+            connection.close()
+        other.shutdown()
+
+        failures = 0
+        for _ in range(6):
+            with engine.connect() as conn:
+                try:
+                    conn.execute(text("SELECT 1")).scalar()
+                except exc.DBAPIError:
+                    failures += 1
+        # Only the request which found the gateway gone fails - the pool's other connections to it are replaced
+        assert failures == 1
+        healthy, ejected = engine.dialect.endpoint_stats
+        assert ejected["state"] == "ejected" and ejected["connections"] == 0
+        assert healthy["connections"] == 5
+    finally:
+        engine.dispose()
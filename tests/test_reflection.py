@@ -0,0 +1,29 @@
+from sqlalchemy import MetaData, create_engine, inspect
+
+from sqlalchemy_theseus_dialect import TheseusDialect
+
+
+def test_schema_snapshot_is_checked_once_per_reflection(server, url, tmp_path, monkeypatch):
+    server.db.execute("CREATE VIEW session.fake_view AS SELECT id FROM session.fake")
+    engine = create_engine(f"theseus://{url}&catalogCacheTtl=0&schemaSnapshot={tmp_path}/schema.json")
+    checks = []
+    get_schema_fingerprints = TheseusDialect._get_schema_fingerprints
+
+    def counted(self, connection, schema):
+        checks.append(schema)
+        return get_schema_fingerprints(self, connection, schema)
+
+    monkeypatch.setattr(TheseusDialect, "_get_schema_fingerprints", counted)
+    try:
+        metadata = MetaData()
+        metadata.reflect(bind=engine, schema="session", views=True)
+        assert sorted(metadata.tables) == ["session.fake", "session.fake_view"]
+        assert [column.name for column in metadata.tables["session.fake"].columns] == ["id", "name", "val"]
+        assert checks == ["session"]
+
+        # A new reflection pass checks again - and sees the schema's changes
+        server.db.execute("CREATE TABLE session.added (a INTEGER)")
+        assert sorted(inspect(engine).get_table_names(schema="session")) == ["added", "fake"]
+        assert checks == ["session", "session"]
+    finally:
+        engine.dispose()
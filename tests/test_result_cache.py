@@ -0,0 +1,196 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+FAKE_ROWS = text("SELECT * FROM session.fake")
+LOW_IDS = text("SELECT * FROM session.fake WHERE id < 500")
+HIGH_IDS = text("SELECT * FROM session.fake WHERE id >= 500")
+
+
+@pytest.fixture
+def cache_engine(url):
+    def make(**settings: str):
+        query = "&".join(f"{key}={value}" for key, value in dict(dict(resultCacheSize=str(1 << 20)),
+                                                                  **settings).items())
+        engine = create_engine(f"theseus://{url}&{query}")
+        engines.append(engine)
+        return engine
+
+    engines = []
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+
+def queries_run(server) -> int:
+    return server.calls.get("CommandStatementQuery", 0) + server.calls.get("CommandPreparedStatementQuery", 0)
+
+
+def fetch(engine, statement, **execution_options):
+    with engine.connect() as conn:
+        return conn.execute(statement, execution_options=execution_options).fetchall()
+
+
+def test_repeated_query_is_served_from_cache(server, cache_engine):
+    engine = cache_engine()
+    rows = fetch(engine, FAKE_ROWS)
+    queries = queries_run(server)
+
+    assert fetch(engine, FAKE_ROWS) == rows
+    assert len(rows) == 1000
+    assert queries_run(server) == queries
+    assert engine.dialect.result_cache_stats["hits"] == 1
+
+
+def test_bound_parameters_are_part_of_the_key(server, cache_engine):
+    engine = cache_engine()
+    statement = text("SELECT * FROM session.fake WHERE id < :n")
+    assert len(fetch(engine, statement.bindparams(n=10))) == 10
+    assert len(fetch(engine, statement.bindparams(n=20))) == 20
+    assert engine.dialect.result_cache_stats["hits"] == 0
+
+
+def test_cache_is_off_by_default(server, engine):
+    fetch(engine, FAKE_ROWS)
+    queries = queries_run(server)
+    fetch(engine, FAKE_ROWS)
+    assert queries_run(server) == queries + 1
+
+
+@pytest.mark.parametrize("statement", [
+    "INSERT INTO session.fake VALUES (1000, 'new', 1500.0)",
+    "UPDATE session.fake SET val = 0 WHERE id = 0",
+    "DELETE FROM session.fake WHERE id = 999",
+    "CREATE TABLE session.other (id INTEGER)",
+])
+def test_writes_and_ddl_invalidate_cache(server, cache_engine, statement):
+    engine = cache_engine()
+    fetch(engine, FAKE_ROWS)
+    assert engine.dialect.result_cache_stats["entries"] == 1
+
+    with engine.connect() as conn:
+        conn.execute(text(statement))
+
+    assert engine.dialect.result_cache_stats["entries"] == 0
+    queries = queries_run(server)
+    fetch(engine, FAKE_ROWS)
+    assert queries_run(server) == queries + 1
+
+
+def test_write_returns_fresh_rows(server, cache_engine):
+    engine = cache_engine()
+    assert fetch(engine, text("SELECT val FROM session.fake WHERE id = 0")) == [(0.0,)]
+    with engine.connect() as conn:
+        conn.execute(text("UPDATE session.fake SET val = 42 WHERE id = 0"))
+    assert fetch(engine, text("SELECT val FROM session.fake WHERE id = 0")) == [(42.0,)]
+
+
+def test_out_of_band_change_needs_explicit_invalidation(server, cache_engine):
+    engine = cache_engine()
+    statement = text("SELECT val FROM session.fake WHERE id = 0")
+    fetch(engine, statement)
+    server.db.execute("UPDATE session.fake SET val = 42 WHERE id = 0")
+
+    assert fetch(engine, statement) == [(0.0,)]
+    engine.dialect.invalidate_result_cache()
+    assert fetch(engine, statement) == [(42.0,)]
+
+
+def test_result_cache_option_opts_out(server, cache_engine):
+    engine = cache_engine()
+    fetch(engine, FAKE_ROWS, result_cache=False)
+    queries = queries_run(server)
+    fetch(engine, FAKE_ROWS, result_cache=False)
+
+    assert queries_run(server) == queries + 1
+    assert engine.dialect.result_cache_stats["entries"] == 0
+
+
+def test_result_cache_option_opts_in(server, cache_engine):
+    engine = cache_engine()
+    # (not recognisably read-only - so cached only on request)
+    statement = text("/* all rows */ SELECT * FROM session.fake")
+    fetch(engine, statement)
+    assert engine.dialect.result_cache_stats["entries"] == 0
+
+    fetch(engine, statement, result_cache=True)
+    queries = queries_run(server)
+    fetch(engine, statement, result_cache=True)
+    assert queries_run(server) == queries
+
+
+def test_result_cache_ttl_option(server, cache_engine):
+    engine = cache_engine(resultCacheTtl="60")
+    fetch(engine, FAKE_ROWS, result_cache_ttl=0.2)
+    fetch(engine, LOW_IDS)
+    time.sleep(0.3)
+
+    queries = queries_run(server)
+    fetch(engine, FAKE_ROWS)
+    fetch(engine, LOW_IDS)
+    assert queries_run(server) == queries + 1
+    assert engine.dialect.result_cache_stats["hits"] == 1
+
+
+def test_entries_expire_after_ttl(server, cache_engine):
+    engine = cache_engine(resultCacheTtl="0.2")
+    fetch(engine, FAKE_ROWS)
+    time.sleep(0.3)
+
+    queries = queries_run(server)
+    fetch(engine, FAKE_ROWS)
+    assert queries_run(server) == queries + 1
+
+
+def test_least_recently_used_result_is_evicted(server, cache_engine):
+    # Sized (from a first engine) to hold both halves of the table, but not a third result as well
+    probe = cache_engine()
+    fetch(probe, LOW_IDS)
+    half = probe.dialect.result_cache_stats["memory_bytes"]
+
+    engine = cache_engine(resultCacheSize=str(half * 5 // 2))
+    fetch(engine, LOW_IDS)
+    fetch(engine, HIGH_IDS)
+    fetch(engine, LOW_IDS)
+    fetch(engine, text("SELECT * FROM session.fake WHERE id >= 1 AND id < 501"))
+    stats = engine.dialect.result_cache_stats
+    assert stats["entries"] == 2
+    assert stats["memory_bytes"] <= half * 5 // 2
+
+    queries = queries_run(server)
+    fetch(engine, LOW_IDS)
+    assert queries_run(server) == queries
+    fetch(engine, HIGH_IDS)
+    assert queries_run(server) == queries + 1
+
+
+def test_result_bigger_than_budget_is_not_cached(server, cache_engine):
+    engine = cache_engine(resultCacheSize="1024")
+    fetch(engine, FAKE_ROWS)
+    assert engine.dialect.result_cache_stats["entries"] == 0
+
+
+def test_evicted_result_is_served_from_disk(server, cache_engine, tmp_path):
+    engine = cache_engine(resultCacheSize="1024", resultCacheDirectory=str(tmp_path))
+    rows = fetch(engine, FAKE_ROWS)
+    assert engine.dialect.result_cache_stats["disk_bytes"] > 0
+
+    queries = queries_run(server)
+    assert fetch(engine, FAKE_ROWS) == rows
+    assert queries_run(server) == queries
+
+
+def test_partially_read_result_is_not_cached(server, cache_engine):
+    engine = cache_engine()
+    with engine.connect() as conn:
+        result = conn.execute(FAKE_ROWS, execution_options=dict(stream_results=True))
+        # (a few batches in - but not to the end)
+        assert len(result.fetchmany(250)) == 250
+        result.close()
+    assert engine.dialect.result_cache_stats["entries"] == 0
+
+    queries = queries_run(server)
+    assert len(fetch(engine, FAKE_ROWS)) == 1000
+    assert queries_run(server) == queries + 1
+    assert engine.dialect.result_cache_stats["entries"] == 1
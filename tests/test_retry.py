@@ -0,0 +1,157 @@
+import time
+
+import pytest
+from adbc_driver_manager import AdbcStatusCode
+from adbc_driver_flightsql import dbapi as flight_sql
+from sqlalchemy import create_engine, exc, text
+
+from sqlalchemy_theseus_dialect import CircuitOpenError
+from sqlalchemy_theseus_dialect.retry import is_transient_error
+
+# (retries without waiting - and the circuit breaker off, unless a test turns it on)
+FAST_RETRIES = dict(retryInitialWait="0.001", retryMaxWait="0.001", retryJitter="0", circuitBreakerThreshold="0")
+
+
+@pytest.fixture
+def retry_engine(url):
+    def make(**settings: str):
+        query = "&".join(f"{key}={value}" for key, value in dict(FAST_RETRIES, **settings).items())
+        engine = create_engine(f"theseus://{url}&{query}")
+        # (connected up front - so the failures a test injects hit its own statements)
+        engine.connect().close()
+        engines.append(engine)
+        return engine
+
+    engines = []
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+
+def count_rows(engine, table_name: str) -> int:
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT count(*) FROM session.{table_name}")).scalar()
+
+
+@pytest.mark.parametrize("error, transient", [
+    (flight_sql.OperationalError("unreachable", status_code=AdbcStatusCode.IO), True),
+    (flight_sql.ProgrammingError("syntax error", status_code=AdbcStatusCode.INVALID_ARGUMENT), False),
+    (flight_sql.OperationalError("denied", status_code=AdbcStatusCode.UNAUTHORIZED), False),
+    (CircuitOpenError("open", status_code=AdbcStatusCode.IO), False),
+    (OSError("not a driver error"), False),
+])
+def test_is_transient_error(error, transient):
+    assert is_transient_error(error) is transient
+
+
+def test_transient_failure_is_retried(server, retry_engine):
+    engine = retry_engine()
+    server.fail_next_requests(2)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM session.fake")).scalar() == 1000
+    stats = engine.dialect.retry_stats
+    assert stats["retries"] == 2 and stats["transient_failures"] == 2
+
+
+def test_retries_give_up_after_max_attempts(server, retry_engine):
+    engine = retry_engine(retryMaxAttempts="3")
+    server.fail_next_requests(5)
+    with engine.connect() as conn, pytest.raises(exc.OperationalError) as raised:
+        conn.execute(text("SELECT 1"))
+    assert is_transient_error(raised.value.orig)
+    assert engine.dialect.retry_stats["retries"] == 2
+
+
+def test_no_retry_past_deadline(server, retry_engine):
+    # The first wait (0.5 seconds) would already end past the deadline - so there is no retry at all
+    engine = retry_engine(retryInitialWait="0.5", retryMaxWait="0.5", retryDeadline="0.1")
+    server.fail_next_requests(5)
+    started = time.monotonic()
+    with engine.connect() as conn, pytest.raises(exc.OperationalError):
+        conn.execute(text("SELECT 1"))
+    assert time.monotonic() - started < 0.5
+    assert engine.dialect.retry_stats["retries"] == 0
+
+
+@pytest.mark.parametrize("query", ["SELECT 1 +", "SELECT * FROM session.no_such_table"])
+def test_sql_error_is_not_retried(retry_engine, query):
+    # (queries which read only - so it is their error that keeps them from being retried)
+    engine = retry_engine()
+    with engine.connect() as conn, pytest.raises(exc.DBAPIError):
+        conn.execute(text(query))
+    stats = engine.dialect.retry_stats
+    assert stats["retries"] == 0 and stats["permanent_failures"] == 1
+
+
+def test_insert_is_not_retried(server, retry_engine):
+    engine = retry_engine()
+    server.db.execute("CREATE TABLE session.written (a INTEGER)")
+    server.fail_next_requests(1)
+    with engine.connect() as conn, pytest.raises(exc.OperationalError):
+        conn.execute(text("INSERT INTO session.written VALUES (1)"))
+    assert engine.dialect.retry_stats["retries"] == 0
+    assert count_rows(engine, "written") == 0
+
+
+@pytest.mark.parametrize("settings, execution_options", [
+    (dict(retryNonIdempotent="True"), {}),
+    ({}, {"idempotent": True}),
+    ({}, {"retry_retry_non_idempotent": True}),
+])
+def test_insert_retry_opt_in(server, retry_engine, settings, execution_options):
+    engine = retry_engine(**settings)
+    server.db.execute("CREATE TABLE session.written (a INTEGER)")
+    server.fail_next_requests(1)
+    with engine.connect() as conn:
+        conn.execute(text("INSERT INTO session.written VALUES (1)"), execution_options=execution_options)
+    assert engine.dialect.retry_stats["retries"] == 1
+    assert count_rows(engine, "written") == 1
+
+
+def test_idempotent_false_is_not_retried(server, retry_engine):
+    engine = retry_engine()
+    server.fail_next_requests(1)
+    with engine.connect() as conn, pytest.raises(exc.OperationalError):
+        conn.execute(text("SELECT 1"), execution_options=dict(idempotent=False))
+    assert engine.dialect.retry_stats["retries"] == 0
+
+
+def test_circuit_breaker(server, retry_engine):
+    engine = retry_engine(retryMaxAttempts="1", circuitBreakerThreshold="2", circuitBreakerResetTimeout="0.3")
+    breaker = engine.dialect.retrier.circuit_breaker
+    server.fail_next_requests(2)
+    with engine.connect() as conn:
+        for _ in range(2):
+            with pytest.raises(exc.OperationalError):
+                conn.execute(text("SELECT 1"))
+        assert breaker.state == "open"
+
+        # While open, statements fail without contacting the server
+        queries = server.calls.get("CommandStatementQuery", 0) + server.calls.get("CommandPreparedStatementQuery", 0)
+        with pytest.raises(exc.OperationalError) as raised:
+            conn.execute(text("SELECT 1"))
+        assert isinstance(raised.value.orig, CircuitOpenError)
+        assert server.calls.get("CommandStatementQuery", 0) + server.calls.get("CommandPreparedStatementQuery", 0) \
+            == queries
+
+        # After the reset timeout a trial statement goes through - and its success closes the circuit
+        time.sleep(0.35)
+        assert breaker.state == "half-open"
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+        assert breaker.state == "closed"
+    stats = engine.dialect.retry_stats
+    assert stats["circuit_opens"] == 1 and stats["circuit_rejections"] == 1
+
+
+def test_circuit_reopens_when_trial_fails(server, retry_engine):
+    engine = retry_engine(retryMaxAttempts="1", circuitBreakerThreshold="1", circuitBreakerResetTimeout="0.2")
+    breaker = engine.dialect.retrier.circuit_breaker
+    server.fail_next_requests(2)
+    with engine.connect() as conn:
+        with pytest.raises(exc.OperationalError):
+            conn.execute(text("SELECT 1"))
+        time.sleep(0.25)
+        with pytest.raises(exc.OperationalError) as raised:
+            conn.execute(text("SELECT 1"))
+        assert not isinstance(raised.value.orig, CircuitOpenError)
+        assert breaker.state == "open"
@@ -0,0 +1,29 @@
+import datetime
+import decimal
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from sqlalchemy_theseus_dialect.rows import arrow_rows, column_converter
+
+
+@pytest.mark.parametrize("array, expected", [
+    (pa.array([1, None, 3], pa.int64()), [1, None, 3]),
+    (pa.array([1.5, None], pa.float64()), [1.5, None]),
+    (pa.array([True, None, False]), [True, None, False]),
+    (pa.array(np.array([1.5, 2], dtype=np.float16), pa.float16()), [1.5, 2.0]),
+    (pa.array([np.float16(1.5), None], pa.float16()), [1.5, None]),
+    (pa.array(["a", None]), ["a", None]),
+    (pa.array([decimal.Decimal("1.25"), None], pa.decimal128(5, 2)), [decimal.Decimal("1.25"), None]),
+    (pa.array([datetime.date(2024, 1, 2), None], pa.date32()), [datetime.date(2024, 1, 2), None]),
+])
+def test_column_converter_keeps_nulls(array, expected):
+    values = column_converter(array.type)(array)
+    assert values == expected
+    assert [type(value) for value in values] == [type(value) for value in expected]
+
+
+def test_arrow_rows():
+    batch = pa.record_batch([pa.array([1, None]), pa.array(["a", "b"])], names=["id", "name"])
+    assert arrow_rows(batch) == [(1, "a"), (None, "b")]
@@ -0,0 +1,159 @@
+import threading
+import time
+import weakref
+
+import pytest
+from sqlalchemy import exc, text
+
+from sqlalchemy_theseus_dialect import StatementTimeoutError
+from sqlalchemy_theseus_dialect.cursor import CursorWrapper
+
+SLOW_QUERY = text("SELECT count(*) FROM range(100000000000) t(x) WHERE x % 7 = 3")
+FAKE_ROWS = text("SELECT * FROM session.fake")
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_timeout_cancels_statement(server, engine):
+    with engine.connect() as conn:
+        started = time.monotonic()
+        with pytest.raises(exc.OperationalError) as raised:
+            conn.execute(SLOW_QUERY, execution_options=dict(timeout=0.5)).all()
+        assert isinstance(raised.value.orig, StatementTimeoutError)
+        assert time.monotonic() - started < 5
+        assert wait_for(lambda: server.calls.get("Cancelled", 0) == 1)
+        # (the connection stays usable)
+        assert conn.execute(text("SELECT count(*) FROM session.fake")).scalar() == 1000
+
+
+@pytest.mark.parametrize("stream_results", [False, True])
+def test_timeout_mid_stream(engine, stream_results):
+    with engine.connect() as conn:
+        result = conn.execute(FAKE_ROWS, execution_options=dict(timeout=0.3, stream_results=stream_results))
+        assert result.fetchmany(150)[-1][0] == 149
+        time.sleep(0.5)
+        with pytest.raises(exc.OperationalError) as raised:
+            result.fetchall()
+        assert isinstance(raised.value.orig, StatementTimeoutError)
+        # (the next statement - on a fresh prepared statement - is unaffected)
+        assert len(conn.execute(FAKE_ROWS, execution_options=dict(timeout=5)).all()) == 1000
+
+
+def test_results_read_within_timeout(engine):
+    with engine.connect() as conn:
+        for _ in range(3):
+            assert len(conn.execute(FAKE_ROWS, execution_options=dict(timeout=5)).all()) == 1000
+        assert conn.execute(FAKE_ROWS, execution_options=dict(timeout=5)).arrow().num_rows == 1000
+
+
+def test_cancel_at_checkin(engine):
+    conn = engine.connect()
+    result = conn.execute(FAKE_ROWS, execution_options=dict(stream_results=True))
+    result.fetchmany(10)
+    cursor = result.cursor
+    assert cursor.in_flight
+    conn.close()
+    assert cursor._cancelled and cursor._closed
+    # Results read to the end are not cancelled - their statement goes back to the connection's cache
+    with engine.connect() as conn:
+        result = conn.execute(FAKE_ROWS, execution_options=dict(stream_results=True))
+        cursor = result.cursor
+        result.all()
+        assert not cursor._cancelled
+        assert conn.connection.dbapi_connection.cancel_open_cursors() == 0
+
+
+def test_cancel_at_checkin_of_half_read_arrow_stream(engine):
+    conn = engine.connect()
+    result = conn.execute(FAKE_ROWS, execution_options=dict(stream_results=True))
+    cursor = result.cursor
+    batches = iter(result.record_batches())
+    assert next(batches).num_rows == 100
+    # (the stream has been handed out - but not read to the end)
+    assert cursor.in_flight
+    conn.close()
+    assert cursor._cancelled and cursor._closed
+    # A stream read to the end is done with - there is nothing to cancel
+    with engine.connect() as conn:
+        result = conn.execute(FAKE_ROWS, execution_options=dict(stream_results=True))
+        cursor = result.cursor
+        reader = result.record_batches()
+        assert sum(batch.num_rows for batch in reader) == 1000
+        assert not cursor.in_flight
+        assert conn.connection.dbapi_connection.cancel_open_cursors() == 0
+
+
+def test_timeout_racing_statement_end(engine):
+    # The watchdog's cancel lands as statements fail, finish or are closed - it must never act on a closed
+    # statement (the connection, and the process, carry on either way)
+    queries = [FAKE_ROWS, text("SELECT * FROM no_such_table")]
+    with engine.connect() as conn:
+        for i in range(100):
+            try:
+                conn.execute(queries[i % 2], execution_options=dict(timeout=0.001 * (i % 10 + 1))).all()
+            except exc.DBAPIError:
+                pass
+        assert conn.execute(text("SELECT count(*) FROM session.fake")).scalar() == 1000
+
+
+class _RecordingStatement:
+    """Stands in for a cursor's ADBC statement - recording whether it was ever cancelled while being closed."""
+
+    def __init__(self, statement) -> None:
+        self._statement = statement
+        self._busy = threading.Lock()
+        self.overlapped = False
+
+    def _call(self, method: str) -> None:
+        if not self._busy.acquire(blocking=False):
+            self.overlapped = True
+            self._busy.acquire()
+        try:
+            # (long enough for an unserialized call from the other thread to land meanwhile)
+            time.sleep(0.002)
+            getattr(self._statement, method)()
+        finally:
+            self._busy.release()
+
+    def cancel(self) -> None:
+        self._call("cancel")
+
+    def close(self) -> None:
+        self._call("close")
+
+
+def test_cancel_racing_close(engine):
+    raw = engine.raw_connection()
+    try:
+        for _ in range(20):
+            cursor = raw.cursor()
+            cursor.execute("SELECT * FROM session.fake")
+            cursor.timeout = 60.0
+            cursor._arm_timeout()
+            statement = cursor._stmt = _RecordingStatement(cursor._stmt)
+            barrier = threading.Barrier(2)
+
+            def fire() -> None:
+                barrier.wait()
+                CursorWrapper._on_timeout(weakref.ref(cursor), cursor._statements_started)
+
+            watchdog = threading.Thread(target=fire)
+            watchdog.start()
+            barrier.wait()
+            # A failed statement is discarded while the watchdog cancels it - the two must take turns
+            cursor._discard_statement()
+            watchdog.join()
+            cursor.close()
+            assert not statement.overlapped
+        cursor = raw.cursor()
+        cursor.execute("SELECT count(*) FROM session.fake")
+        assert cursor.fetchone() == (1000,)
+    finally:
+        raw.close()
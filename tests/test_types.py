@@ -0,0 +1,23 @@
+import pytest
+from sqlalchemy import types as sqltypes
+
+from sqlalchemy_theseus_dialect.types import reflected_type
+
+
+@pytest.mark.parametrize("data_type, expected", [
+    ("VARCHAR(10)", sqltypes.String(10)),
+    ("DECIMAL(18, 2)", sqltypes.Numeric(18, 2)),
+    ("FLOAT(24)", sqltypes.Float(24)),
+    ("TIMESTAMP(3)", sqltypes.TIMESTAMP()),
+    ("TIMESTAMP WITH TIME ZONE", sqltypes.TIMESTAMP(timezone=True)),
+    ("TIME(6)", sqltypes.TIME()),
+    ("DATETIME(6)", sqltypes.DateTime()),
+    ("INTEGER", sqltypes.Integer()),
+])
+def test_reflected_type(data_type, expected):
+    assert repr(reflected_type(data_type)) == repr(expected)
+
+
+def test_unsupported_type():
+    with pytest.raises(ValueError):
+        reflected_type("NO_SUCH_TYPE")